@@ -0,0 +1,47 @@
+# app/auth/identity.py
+"""
+사용자 식별 정보 캐시
+
+인증 경로에서 필요한 사용자 정보(id, username, email, is_active, created_at)만 조회해 짧은 TTL 동안 캐시합니다.
+전체 User 행을 읽지 않으며, 조회는 비동기 세션으로 하므로 이벤트 루프를 막지 않습니다.
+
+미들웨어의 토큰 갱신, 인증 의존성(get_current_user 등), 게임 생성 라우터가 함께 사용하며
+사용자 정보를 바꾸는 쪽은 invalidate_identity() 로 항목을 제거합니다.
+"""
+import os
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..cache import cached
+
+# 식별 정보 캐시 TTL(초)
+USER_IDENTITY_TTL = float(os.getenv("USER_IDENTITY_TTL", "30"))
+
+class UserIdentity(NamedTuple):
+    id: int
+    username: Optional[str]
+    email: Optional[str]
+    is_active: bool
+    created_at: Optional[datetime]
+
+@cached("user_identity", ttl=USER_IDENTITY_TTL, key=lambda user_id: user_id, max_entries=10000)
+async def get_identity_async(db: AsyncSession, user_id: int) -> Optional[UserIdentity]:
+    """
+    사용자 식별 정보를 조회합니다. 사용자가 없으면 None
+    """
+    User = models.User
+    result = await db.execute(
+        select(User.id, User.username, User.email, User.is_active, User.created_at).where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return UserIdentity(row.id, row.username, row.email, row.is_active is not False, row.created_at)
+
+def invalidate_identity(user_id: int):
+    """사용자 정보가 바뀌었을 때 캐시 항목을 제거합니다."""
+    get_identity_async.cache.invalidate(lambda key: key == user_id)
@@ -0,0 +1,165 @@
+# app/auth/kakao_client.py
+"""
+카카오 OAuth 용 애플리케이션 범위 HTTP 클라이언트
+
+로그인마다 httpx.AsyncClient 를 새로 만들면 토큰 요청/사용자 정보 요청마다 TCP + TLS 핸드셰이크가 발생합니다.
+서버 시작 시 클라이언트를 하나 만들어 커넥션을 재사용(keep-alive)하고, 종료 시 닫습니다.
+
+- 타임아웃: 연결 KAKAO_HTTP_CONNECT_TIMEOUT, 전체 KAKAO_HTTP_TIMEOUT (초)
+- 재시도: 연결 실패는 항상, 5xx/읽기 타임아웃은 멱등 요청(GET)만 KAKAO_HTTP_RETRIES 회까지 지수 백오프로 재시도
+  (토큰 요청의 인가 코드는 한 번만 쓸 수 있으므로 서버에 도달했을 수 있는 POST 는 재시도하지 않음)
+- 서킷 브레이커: 연속 KAKAO_CIRCUIT_FAILURES 회 실패하면 KAKAO_CIRCUIT_RESET_SECONDS 동안
+  요청을 보내지 않고 바로 503 을 반환, 이후 요청 하나로 복구 여부를 확인
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from fastapi import HTTPException, status
+
+from .. import metrics, startup
+
+logger = logging.getLogger(__name__)
+
+KAKAO_HTTP_TIMEOUT = float(os.getenv("KAKAO_HTTP_TIMEOUT", "5"))
+KAKAO_HTTP_CONNECT_TIMEOUT = float(os.getenv("KAKAO_HTTP_CONNECT_TIMEOUT", "3"))
+KAKAO_HTTP_MAX_CONNECTIONS = int(os.getenv("KAKAO_HTTP_MAX_CONNECTIONS", "20"))
+# 유휴 커넥션 유지 시간(초)
+KAKAO_HTTP_KEEPALIVE_SECONDS = float(os.getenv("KAKAO_HTTP_KEEPALIVE_SECONDS", "30"))
+KAKAO_HTTP_RETRIES = int(os.getenv("KAKAO_HTTP_RETRIES", "2"))
+# 첫 재시도 대기 시간(초), 재시도마다 두 배
+KAKAO_HTTP_BACKOFF_SECONDS = float(os.getenv("KAKAO_HTTP_BACKOFF_SECONDS", "0.2"))
+KAKAO_CIRCUIT_FAILURES = int(os.getenv("KAKAO_CIRCUIT_FAILURES", "5"))
+KAKAO_CIRCUIT_RESET_SECONDS = float(os.getenv("KAKAO_CIRCUIT_RESET_SECONDS", "30"))
+
+# 서버에 요청이 전달되지 않았음이 확실한 오류 (POST 도 재시도 가능)
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커 (closed -> open -> half_open -> closed)
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opened_count = 0
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 확인합니다. half_open 에서는 시험 요청 하나만 허용합니다."""
+        if self.state == self.CLOSED:
+            return True
+        # 시험 요청이 끝나지 않은 채 reset_seconds 가 지나면 다시 허용
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = self.HALF_OPEN
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opened_count += 1
+                logger.warning(f"카카오 API 서킷 브레이커 열림 (연속 실패 {self.failures}회)")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+class KakaoHTTPClient:
+    """
+    커넥션 풀을 공유하는 카카오 API 클라이언트
+    """
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self.breaker = CircuitBreaker(KAKAO_CIRCUIT_FAILURES, KAKAO_CIRCUIT_RESET_SECONDS)
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "rejected": 0}
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(KAKAO_HTTP_TIMEOUT, connect=KAKAO_HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=KAKAO_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=KAKAO_HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry=KAKAO_HTTP_KEEPALIVE_SECONDS,
+                ),
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        요청을 보내고 응답을 반환합니다. 4xx 응답은 그대로 반환하며 호출한 쪽에서 처리합니다.
+
+        Raises:
+            HTTPException: 서킷이 열려 있으면 503, 재시도 후에도 실패하면 502
+        """
+        if not self.breaker.allow():
+            self.stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="카카오 로그인 서버에 일시적으로 연결할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(int(KAKAO_CIRCUIT_RESET_SECONDS))},
+            )
+        if self._client is None:
+            # lifespan 밖(스크립트 등)에서 호출된 경우
+            await self.start()
+
+        idempotent = method.upper() == "GET"
+        error: Any = None
+        for attempt in range(KAKAO_HTTP_RETRIES + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                delay = KAKAO_HTTP_BACKOFF_SECONDS * (2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            self.stats["requests"] += 1
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except _NOT_SENT_ERRORS as e:
+                error = e
+                continue
+            except httpx.TransportError as e:
+                error = e
+                if idempotent:
+                    continue
+                break
+            if response.status_code < 500:
+                self.breaker.record_success()
+                return response
+            error = f"HTTP {response.status_code}"
+            if not idempotent:
+                break
+
+        self.stats["failures"] += 1
+        self.breaker.record_failure()
+        logger.error(f"카카오 API 요청 실패 ({method} {url}): {error}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="카카오 서버 요청에 실패했습니다. 잠시 후 다시 시도해주세요.",
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(self.stats, circuit=self.breaker.state, circuit_opened=self.breaker.opened_count)
+
+kakao_http = KakaoHTTPClient()
+
+startup.register_startup(kakao_http.start)
+startup.register_shutdown(kakao_http.close)
+metrics.register("kakao_http", kakao_http.snapshot)
@@ -1,23 +1,22 @@
-import httpx
 import json
 from fastapi import HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, UTC
 import os
 from typing import Dict, Any, Optional
 
 from .. import models, schemas, crud
-from ..database import get_db
 from ..auth.utils import create_access_token, create_refresh_token
+from .kakao_client import kakao_http
 
 # 카카오 OAuth 설정
 KAKAO_CLIENT_ID = os.getenv("KAKAO_CLIENT_ID", "")
 KAKAO_CLIENT_SECRET = os.getenv("KAKAO_CLIENT_SECRET", "")
 KAKAO_REDIRECT_URI = os.getenv("KAKAO_REDIRECT_URI", "")
 
-# 카카오 API 엔드포인트
-KAKAO_TOKEN_URL = "https://kauth.kakao.com/oauth/token"
-KAKAO_USER_INFO_URL = "https://kapi.kakao.com/v2/user/me"
+# 카카오 API 엔드포인트 (로컬 대역 서버로 바꿀 수 있음)
+KAKAO_TOKEN_URL = os.getenv("KAKAO_TOKEN_URL", "https://kauth.kakao.com/oauth/token")
+KAKAO_USER_INFO_URL = os.getenv("KAKAO_USER_INFO_URL", "https://kapi.kakao.com/v2/user/me")
 
 async def get_kakao_token(code: str) -> Dict[str, Any]:
     """
@@ -45,16 +44,16 @@ async def get_kakao_token(code: str) -> Dict[str, Any]:
     if KAKAO_CLIENT_SECRET:
         data["client_secret"] = KAKAO_CLIENT_SECRET
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(KAKAO_TOKEN_URL, data=data)
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=400,
-                detail=f"카카오 토큰 요청 실패: {response.text}"
-            )
-        
-        return response.json()
+    # 애플리케이션 범위 클라이언트 사용 (커넥션 재사용, 타임아웃/재시도/서킷 브레이커)
+    response = await kakao_http.request("POST", KAKAO_TOKEN_URL, data=data)
+    
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=400,
+            detail=f"카카오 토큰 요청 실패: {response.text}"
+        )
+    
+    return response.json()
 
 async def get_kakao_user_info(access_token: str) -> Dict[str, Any]:
     """
@@ -71,24 +70,23 @@ async def get_kakao_user_info(access_token: str) -> Dict[str, Any]:
         "Content-Type": "application/x-www-form-urlencoded;charset=utf-8"
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(KAKAO_USER_INFO_URL, headers=headers)
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=400,
-                detail=f"카카오 사용자 정보 요청 실패: {response.text}"
-            )
-        
-        return response.json()
+    response = await kakao_http.request("GET", KAKAO_USER_INFO_URL, headers=headers)
+    
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=400,
+            detail=f"카카오 사용자 정보 요청 실패: {response.text}"
+        )
+    
+    return response.json()
 
-async def process_kakao_login(code: str, db: Session) -> schemas.LoginResponse:
+async def process_kakao_login(code: str, db: AsyncSession) -> schemas.LoginResponse:
     """
     카카오 로그인 처리를 수행합니다.
     
     Args:
         code: 카카오 인증 코드
-        db: 데이터베이스 세션
+        db: 비동기 데이터베이스 세션
     
     Returns:
         로그인 응답 객체
@@ -122,29 +120,17 @@ async def process_kakao_login(code: str, db: Session) -> schemas.LoginResponse:
         # 닉네임이 없는 경우 기본값 설정
         nickname = f"User_{kakao_id}"
     
-    # 이미 가입된 사용자인지 확인
-    user = crud.get_user_by_social_id(db, social_id=kakao_id, social_type="kakao")
-    
-    if not user:
-        # 이메일로 사용자 확인 (이미 일반 계정으로 가입한 경우)
-        existing_user = crud.get_user_by_email(db, email=email)
-        
-        if existing_user:
-            # 기존 계정에 소셜 정보 연결
-            existing_user.social_id = kakao_id
-            existing_user.social_type = "kakao"
-            db.commit()
-            db.refresh(existing_user)
-            user = existing_user
-        else:
-            # 새 사용자 생성
-            social_user = schemas.SocialUserCreate(
-                email=email,
-                username=nickname,
-                social_id=kakao_id,
-                social_type="kakao"
-            )
-            user = crud.create_social_user(db, user=social_user)
+    # 가입된 사용자 조회, 없으면 생성 (재로그인은 조회 한 번으로 끝남)
+    # 같은 이메일의 기존 계정은 카카오가 확인한 이메일일 때만 연결
+    social_user = schemas.SocialUserCreate(
+        email=email,
+        username=nickname,
+        social_id=kakao_id,
+        social_type="kakao"
+    )
+    user = await crud.upsert_social_user_async(
+        db, user=social_user, email_verified=bool(kakao_account.get("is_email_verified"))
+    )
     
     # JWT 토큰 생성
     access_token = create_access_token(data={"sub": user.email, "id": user.id})
@@ -0,0 +1,137 @@
+# app/auth/passwords.py
+"""
+비밀번호 해싱 전용 실행기
+
+bcrypt 해싱/검증은 한 번에 수백 ms 의 CPU 를 쓰므로 이벤트 루프에서 직접 호출하면
+로그인이 몰릴 때 같은 워커의 게임 요청이 모두 멈춥니다.
+
+- 해싱/검증은 전용 스레드풀(PASSWORD_HASH_WORKERS)에서 실행 (bcrypt 는 계산 중 GIL 을 놓음)
+  기본 스레드풀(to_thread, 동기 엔드포인트)과 분리되어 다른 작업의 스레드를 뺏지 않음
+- 대기 중인 작업이 PASSWORD_HASH_MAX_PENDING 개를 넘으면 큐에 쌓지 않고 503 으로 거절
+- 서버 시작 시 해싱 시간을 측정해 PASSWORD_HASH_TARGET_MS 에 가장 가까운 cost(rounds)로 조정
+  (PASSWORD_HASH_MIN_ROUNDS 보다 낮추지 않음, PASSWORD_HASH_ROUNDS 를 지정하면 측정하지 않음)
+  기존 해시는 자신의 cost 가 저장되어 있으므로 그대로 검증됩니다.
+"""
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from .. import metrics, startup
+
+logger = logging.getLogger(__name__)
+
+# 비밀번호 해싱 도구
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# 동시에 해싱/검증할 최대 작업 수 (스레드 수)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or min(4, os.cpu_count() or 1))
+# 실행을 기다릴 수 있는 최대 작업 수, 넘으면 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+# 해싱 1회 목표 시간(ms)과 cost 범위
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", "250"))
+PASSWORD_HASH_MIN_ROUNDS = int(os.getenv("PASSWORD_HASH_MIN_ROUNDS", "12"))
+PASSWORD_HASH_MAX_ROUNDS = 16
+# 고정 cost (지정하면 시작 시 측정하지 않음)
+PASSWORD_HASH_ROUNDS = os.getenv("PASSWORD_HASH_ROUNDS")
+
+# 작업 시간 버킷 (ms)
+HASH_TIME_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000]
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_lock = threading.Lock()
+_stats = {"queued": 0, "running": 0, "max_queued": 0, "completed": 0, "rejected": 0, "rounds": None}
+_queue_wait_ms = metrics.Histogram(HASH_TIME_BUCKETS_MS)
+_run_time_ms = metrics.Histogram(HASH_TIME_BUCKETS_MS)
+
+def _run(fn: Callable, args: tuple, submitted: float):
+    """실행기 스레드에서 실행: 대기/실행 시간을 기록합니다."""
+    started = time.perf_counter()
+    with _lock:
+        _stats["queued"] -= 1
+        _stats["running"] += 1
+    _queue_wait_ms.observe((started - submitted) * 1000)
+    try:
+        return fn(*args)
+    finally:
+        _run_time_ms.observe((time.perf_counter() - started) * 1000)
+        with _lock:
+            _stats["running"] -= 1
+            _stats["completed"] += 1
+
+async def _submit(fn: Callable, *args) -> Any:
+    with _lock:
+        if _stats["queued"] >= PASSWORD_HASH_MAX_PENDING:
+            _stats["rejected"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "1"},
+            )
+        _stats["queued"] += 1
+        _stats["max_queued"] = max(_stats["max_queued"], _stats["queued"])
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, _run, fn, args, time.perf_counter())
+
+async def hash_password_async(password: str) -> str:
+    """비밀번호를 전용 실행기에서 해싱합니다."""
+    return await _submit(pwd_context.hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """비밀번호를 전용 실행기에서 검증합니다."""
+    return await _submit(pwd_context.verify, plain_password, hashed_password)
+
+def calibrate_rounds(target_ms: float, probe_rounds: int = 10) -> int:
+    """
+    probe_rounds 로 해싱 시간을 측정해 목표 시간에 가장 가까운 cost 를 계산합니다.
+    bcrypt 는 cost 가 1 오를 때마다 시간이 두 배가 됩니다.
+    """
+    probe = pwd_context.copy(bcrypt__rounds=probe_rounds)
+    probe.hash("calibration")  # 첫 호출의 백엔드 로딩 비용 제외
+    start = time.perf_counter()
+    probe.hash("calibration")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    rounds = probe_rounds + round(math.log2(target_ms / max(elapsed_ms, 0.001)))
+    return max(PASSWORD_HASH_MIN_ROUNDS, min(PASSWORD_HASH_MAX_ROUNDS, rounds))
+
+def set_rounds(rounds: int):
+    pwd_context.update(bcrypt__rounds=rounds)
+    _stats["rounds"] = rounds
+
+async def calibrate():
+    """
+    서버 시작 시 해싱 cost 를 정합니다. (실행기에서 측정하므로 시작을 막지 않음)
+    """
+    if PASSWORD_HASH_ROUNDS:
+        set_rounds(int(PASSWORD_HASH_ROUNDS))
+        return
+    try:
+        loop = asyncio.get_running_loop()
+        rounds = await loop.run_in_executor(_executor, calibrate_rounds, PASSWORD_HASH_TARGET_MS)
+    except Exception as e:
+        logger.error(f"비밀번호 해싱 cost 측정 실패: {str(e)}")
+        return
+    set_rounds(rounds)
+    logger.info(f"비밀번호 해싱 cost: {rounds} (목표 {PASSWORD_HASH_TARGET_MS:.0f}ms)")
+
+startup.register_background(calibrate)
+
+def pool_snapshot() -> Dict[str, Any]:
+    with _lock:
+        snapshot = dict(_stats)
+    return dict(
+        snapshot,
+        workers=PASSWORD_HASH_WORKERS,
+        max_pending=PASSWORD_HASH_MAX_PENDING,
+        queue_wait_ms=_queue_wait_ms.snapshot(),
+        run_time_ms=_run_time_ms.snapshot(),
+    )
+
+metrics.register("password_hashing", pool_snapshot)
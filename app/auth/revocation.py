@@ -0,0 +1,222 @@
+# app/auth/revocation.py
+"""
+JWT 폐기 목록
+
+로그아웃 등으로 만료 전에 무효화한 토큰의 jti 를 revoked_tokens 테이블에 저장하고,
+각 워커는 이를 메모리(블룸 필터 + 정확한 집합)에 올려 요청마다 DB 조회 없이 확인합니다.
+
+- 확인 순서: jti 없음 -> 통과, 블룸 필터 음성 -> 통과(대부분의 요청), 양성이면 집합으로 확정
+- 폐기한 워커는 즉시 메모리에 반영, 다른 워커는 REVOCATION_REFRESH_SECONDS 마다 새로 추가된 행을 읽어 반영
+- 블룸 필터는 항목을 뺄 수 없으므로 REVOCATION_REBUILD_SECONDS 마다 만료된 행을 지우고 다시 만듦
+- jti 가 없는 토큰(이 기능 이전에 발급)은 폐기할 수 없으며 원래 만료 시각까지 유효
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import time
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import metrics, models, startup
+from ..database import AsyncSessionLocal, utcnow
+
+logger = logging.getLogger(__name__)
+
+# 다른 워커에서 폐기한 토큰을 읽어오는 주기(초), 0 이면 시작 시 한 번만 적재
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "10"))
+# 만료된 행을 지우고 블룸 필터를 다시 만드는 주기(초)
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+# 블룸 필터 크기 기준 항목 수와 목표 오탐률 (넘으면 다음 재구성 때 크기를 늘림)
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_FP_RATE = float(os.getenv("REVOCATION_BLOOM_FP_RATE", "0.001"))
+
+# 증분 적재 시 revoked_at 기준을 이만큼 앞당겨 커밋 순서가 뒤바뀐 행도 읽음 (중복은 무시)
+_REFRESH_OVERLAP = timedelta(seconds=5)
+
+class BloomFilter:
+    """
+    비트 배열 블룸 필터
+
+    blake2b 해시 하나를 둘로 나눠 k 개의 위치를 만듭니다. (h1 + i * h2)
+    """
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        for _ in range(self.hashes):
+            yield h1 % size
+            h1 += h2
+
+    def add(self, item: str):
+        bits = self.bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        # 음성은 보통 첫 위치에서 확정되므로 위치를 하나씩 만들며 확인
+        bits = self.bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+class RevocationList:
+    """
+    폐기된 jti 의 메모리 사본
+
+    블룸 필터로 대부분의 요청을 걸러내고, 양성일 때만 jti -> 만료 시각 집합으로 확정합니다.
+    """
+    def __init__(self, capacity: int, fp_rate: float):
+        self.fp_rate = fp_rate
+        self.bloom = BloomFilter(capacity, fp_rate)
+        self.capacity = capacity
+        self.revoked: Dict[str, datetime] = {}
+        # 마지막으로 읽은 행의 revoked_at (증분 적재 기준)
+        self.watermark: Optional[datetime] = None
+        self.loaded = False
+        self.stats = {"checks": 0, "bloom_positives": 0, "revoked_hits": 0, "refreshes": 0, "rebuilds": 0}
+
+    def add(self, jti: str, expires_at: datetime):
+        if jti not in self.revoked:
+            self.bloom.add(jti)
+        self.revoked[jti] = expires_at
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """jti 가 폐기되었는지 확인합니다. (DB 조회 없음)"""
+        self.stats["checks"] += 1
+        if not jti or jti not in self.bloom:
+            return False
+        self.stats["bloom_positives"] += 1
+        if jti in self.revoked:
+            self.stats["revoked_hits"] += 1
+            return True
+        return False
+
+    def replace(self, rows, watermark: Optional[datetime]):
+        """전체 적재 결과로 교체합니다. 항목 수가 기준을 넘으면 필터를 키웁니다."""
+        capacity = max(self.capacity, len(rows) * 2)
+        bloom = BloomFilter(capacity, self.fp_rate)
+        revoked = {}
+        for jti, expires_at in rows:
+            bloom.add(jti)
+            revoked[jti] = expires_at
+        # 적재 중 이 워커에서 폐기한 항목 유지
+        for jti, expires_at in self.revoked.items():
+            if jti not in revoked and expires_at > utcnow():
+                bloom.add(jti)
+                revoked[jti] = expires_at
+        self.bloom, self.capacity, self.revoked = bloom, capacity, revoked
+        self.watermark = watermark
+        self.loaded = True
+        self.stats["rebuilds"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            loaded=self.loaded,
+            revoked=len(self.revoked),
+            bloom_bits=self.bloom.size,
+            bloom_hashes=self.bloom.hashes,
+        )
+
+revocation_list = RevocationList(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_FP_RATE)
+metrics.register("token_revocation", revocation_list.snapshot)
+
+def is_revoked(payload: Dict[str, Any]) -> bool:
+    """디코딩한 토큰 클레임이 폐기된 토큰인지 확인합니다."""
+    return revocation_list.is_revoked(payload.get("jti"))
+
+def _insert_revoked(db: AsyncSession):
+    """dialect 에 맞는 revoked_tokens INSERT ... ON CONFLICT 구문"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(models.RevokedToken)
+    return sqlite.insert(models.RevokedToken)
+
+async def revoke_async(db: AsyncSession, payload: Optional[Dict[str, Any]]) -> bool:
+    """
+    토큰을 폐기합니다. 이 워커에는 즉시, 다른 워커에는 다음 갱신 때 반영됩니다.
+
+    Args:
+        payload: 검증된 토큰 클레임 (jti, exp 필요)
+
+    Returns:
+        폐기했으면 True, jti/exp 가 없거나 이미 만료된 토큰이면 False
+    """
+    if not payload or not payload.get("jti") or not payload.get("exp"):
+        return False
+    expires_at = datetime.fromtimestamp(payload["exp"], UTC).replace(tzinfo=None)
+    if expires_at <= utcnow():
+        return False
+    await db.execute(
+        _insert_revoked(db)
+        .values(jti=payload["jti"], expires_at=expires_at, revoked_at=utcnow())
+        .on_conflict_do_nothing(index_elements=["jti"])
+    )
+    await db.commit()
+    revocation_list.add(payload["jti"], expires_at)
+    return True
+
+async def load():
+    """
+    만료된 행을 지우고 남은 폐기 목록 전체를 다시 적재합니다.
+    """
+    Revoked = models.RevokedToken
+    async with AsyncSessionLocal() as db:
+        now = utcnow()
+        await db.execute(delete(Revoked).where(Revoked.expires_at <= now))
+        await db.commit()
+        result = await db.execute(select(Revoked.jti, Revoked.expires_at, Revoked.revoked_at))
+        rows = result.all()
+    watermark = max((row.revoked_at for row in rows), default=now)
+    revocation_list.replace([(row.jti, row.expires_at) for row in rows], watermark)
+    logger.info(f"토큰 폐기 목록 적재 완료: {len(rows)}건")
+
+async def refresh():
+    """
+    마지막 적재 이후 추가된 행만 읽어 반영합니다.
+    """
+    Revoked = models.RevokedToken
+    since = revocation_list.watermark - _REFRESH_OVERLAP
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Revoked.jti, Revoked.expires_at, Revoked.revoked_at)
+            .where(Revoked.revoked_at >= since, Revoked.expires_at > utcnow())
+        )
+        rows = result.all()
+    for row in rows:
+        revocation_list.add(row.jti, row.expires_at)
+        revocation_list.watermark = max(revocation_list.watermark, row.revoked_at)
+    revocation_list.stats["refreshes"] += 1
+
+async def refresh_loop():
+    """
+    시작 시 전체 적재 후 주기적으로 증분 갱신하고, 재구성 주기마다 다시 전체 적재합니다.
+    """
+    last_rebuild = None
+    while True:
+        try:
+            if last_rebuild is None or time.monotonic() - last_rebuild >= REVOCATION_REBUILD_SECONDS:
+                await load()
+                last_rebuild = time.monotonic()
+            else:
+                await refresh()
+        except Exception as e:
+            logger.error(f"토큰 폐기 목록 갱신 실패: {str(e)}")
+        if REVOCATION_REFRESH_SECONDS <= 0:
+            return
+        await asyncio.sleep(REVOCATION_REFRESH_SECONDS)
+
+startup.register_background(refresh_loop)
@@ -0,0 +1,108 @@
+# app/auth/token_cache.py
+"""
+검증된 JWT 캐시
+
+같은 클라이언트는 만료 전까지 같은 액세스 토큰을 반복해서 보내므로,
+한 번 서명 검증에 성공한 토큰의 클레임을 exp 까지 저장해 두고 이후 요청은 검증을 건너뜁니다.
+
+- 키는 토큰 원문이 아닌 SHA-256 해시 (메모리에 토큰을 남기지 않음)
+- 항목은 exp 와 TOKEN_CACHE_MAX_TTL 중 이른 시각까지 유효
+- 검증 실패(만료, 서명 오류)는 캐시하지 않으므로 예외는 jwt.decode 와 같음
+- 최대 TOKEN_CACHE_MAX_ENTRIES 개, 초과 시 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from jose import jwt
+
+from .. import metrics
+from .utils import SECRET_KEY, ALGORITHM
+
+# 캐시할 최대 토큰 수
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+# exp 와 별개로 한 항목을 보관할 최대 시간(초), 0 이면 캐시하지 않음
+TOKEN_CACHE_MAX_TTL = float(os.getenv("TOKEN_CACHE_MAX_TTL", "300"))
+
+class TokenCache:
+    """
+    토큰 해시 -> (만료 시각, 클레임) LRU 캐시
+
+    Args:
+        max_entries: 최대 항목 수
+        max_ttl: 한 항목을 보관할 최대 시간(초)
+    """
+    def __init__(self, max_entries: int, max_ttl: float):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        토큰의 클레임을 반환합니다. 캐시에 없으면 jwt.decode 로 검증한 뒤 저장합니다.
+
+        Raises:
+            ExpiredSignatureError, JWTError: jwt.decode 와 동일
+        """
+        if self.max_ttl <= 0:
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+
+        # 만료된 토큰도 여기서 다시 검증해 ExpiredSignatureError 를 그대로 발생시킴
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        expires_at = now + self.max_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        if expires_at <= now:
+            return payload
+
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self, token: str):
+        """토큰 항목을 제거합니다."""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._entries),
+        }
+
+token_cache = TokenCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_MAX_TTL)
+
+metrics.register("token_cache", token_cache.snapshot)
@@ -1,26 +1,25 @@
 from datetime import datetime, timedelta, UTC
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
-from dotenv import load_dotenv
+import uuid
+from .. import config  # .env 로드
 from .. import models, schemas, crud
-from ..database import get_db
+from ..database import get_db, get_async_db
+from .identity import get_identity_async
+# 비밀번호 해싱 도구 (비동기 경로는 passwords.hash_password_async / verify_password_async 사용)
+from .passwords import pwd_context
 from typing import Optional, Dict, Any
 
-# .env 파일 로드
-load_dotenv()
-
 # 환경 변수에서 설정 가져오기
 SECRET_KEY = os.getenv("SECRET_KEY", "your_secret_key_here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
-# 비밀번호 해싱 도구
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 인증 스키마 (Swaager UI에서 인증 버튼 표시)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -43,7 +42,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
         expire = datetime.now(UTC) + expires_delta
     else:
         expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti: 토큰 폐기(로그아웃) 시 식별자 (app/auth/revocation.py)
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -53,11 +53,11 @@ def create_refresh_token(data: dict):
     """
     to_encode = data.copy()
     expire = datetime.now(UTC) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """
     토큰에서 현재 사용자 정보를 추출하는 의존성 함수
     (FastAPI의 Depends를 통해 사용)
@@ -78,14 +78,14 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
     
-    # DB에서 사용자 조회 - 이메일로 변경
-    user = db.query(models.User).filter(models.User.id == token_data.user_id).first()
+    # 사용자 식별 정보 조회 (최근 조회한 사용자는 캐시 사용, 전체 User 행을 읽지 않음)
+    user = await get_identity_async(db, token_data.user_id)
     if user is None:
         raise credentials_exception
     return user
 
 # 선택적 인증 - 로그인 없이도 게임 가능하게 함
-def get_optional_current_user(token: str | None = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_optional_current_user(token: str | None = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """
     선택적 인증을 위한 의존성 함수
     토큰이 없거나 유효하지 않으면 None 반환
@@ -99,13 +99,13 @@ def get_optional_current_user(token: str | None = Depends(oauth2_scheme), db: Se
         if username is None or user_id is None:
             return None
         
-        user = db.query(models.User).filter(models.User.id == user_id).first()
+        user = await get_identity_async(db, user_id)
         return user
     except:
         return None
 
 # 미들웨어에서 설정한 사용자 정보 가져오기
-def get_current_user_from_request(request: Request, db: Session = Depends(get_db)):
+async def get_current_user_from_request(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     미들웨어에서 설정한 사용자 정보를 가져오는 의존성 함수
     """
@@ -117,7 +117,7 @@ def get_current_user_from_request(request: Request, db: Session = Depends(get_db
         )
     
     user_data = request.state.user
-    user = db.query(models.User).filter(models.User.id == user_data["id"]).first()
+    user = await get_identity_async(db, user_data["id"])
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -127,7 +127,7 @@ def get_current_user_from_request(request: Request, db: Session = Depends(get_db
     return user
 
 # 선택적 인증 - 로그인 없이도 게임 가능하게 함
-def get_optional_current_user_from_request(request: Request, db: Session = Depends(get_db)):
+async def get_optional_current_user_from_request(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     미들웨어에서 설정한 사용자 정보를 선택적으로 가져오는 의존성 함수
     사용자 정보가 없으면 None 반환
@@ -136,7 +136,7 @@ def get_optional_current_user_from_request(request: Request, db: Session = Depen
         return None
     
     user_data = request.state.user
-    user = db.query(models.User).filter(models.User.id == user_data["id"]).first()
+    user = await get_identity_async(db, user_data["id"])
     return user 
 
 # 쿠키에서 토큰 추출하는 함수 추가
@@ -145,9 +145,9 @@ def get_token_from_cookie(request: Request):
     return request.cookies.get("access_token")
 
 # 쿠키 기반 인증 의존성 함수
-def get_current_user_from_cookie(
+async def get_current_user_from_cookie(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     쿠키에서 토큰을 추출하여 사용자 인증
@@ -177,7 +177,7 @@ def get_current_user_from_cookie(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await get_identity_async(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
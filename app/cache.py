@@ -0,0 +1,164 @@
+# app/cache.py
+"""
+단일 실행(single-flight) + TTL 캐시
+
+같은 키에 대한 동시 요청은 한 번만 조회하고 나머지는 그 결과를 기다립니다.
+TTL 이 지난 값은 stale_ttl 동안 그대로 반환하면서 백그라운드에서 새로 조회합니다.
+
+사용 예:
+    @cached("tetris_leaderboard", ttl=2, stale_ttl=30, key=lambda limit=10: limit)
+    async def get_leaderboard_async(db: AsyncSession, limit: int = 10): ...
+
+캐시할 함수는 첫 번째 인자로 AsyncSession 을 받아야 합니다.
+조회 태스크는 여러 요청이 함께 기다리고 백그라운드 갱신은 응답 후에도 실행되므로,
+호출한 요청의 세션을 쓰지 않고 같은 대상(primary/복제본 엔진 또는 커넥션)에 묶인 별도 세션을 엽니다.
+"""
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import metrics
+from .database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+_caches: Dict[str, "SingleFlightCache"] = {}
+
+class SingleFlightCache:
+    """
+    키별 값과 조회 시각을 저장하고, 진행 중인 조회를 공유합니다.
+
+    Args:
+        name: 메트릭에 표시할 이름
+        ttl: 값을 그대로 사용할 시간(초)
+        stale_ttl: TTL 이후 백그라운드 갱신을 하면서 이전 값을 반환할 추가 시간(초)
+        max_entries: 최대 키 수 (초과 시 가장 오래 전에 저장된 키부터 제거)
+    """
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, max_entries: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        """
+        조건에 맞는 키(없으면 전체)를 제거합니다.
+        """
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def _start(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """키에 대한 조회를 태스크로 시작하고, 완료되면 결과를 저장합니다."""
+        async def _run():
+            try:
+                value = await load()
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self._inflight.pop(key, None)
+            self._store(key, value)
+            return value
+
+        task = asyncio.ensure_future(_run())
+        self._inflight[key] = task
+        return task
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]):
+        """
+        캐시 값을 반환하거나 load() 로 조회합니다.
+
+        Args:
+            load: 캐시 미스 및 백그라운드 갱신 시 호출할 함수
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    task = self._start(key, load)
+                    task.add_done_callback(self._log_failure)
+                return entry[1]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._start(key, load))
+
+    def _log_failure(self, task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"캐시 백그라운드 갱신 실패 ({self.name}): {str(task.exception())}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(self.stats, size=len(self._entries), inflight=len(self._inflight))
+
+def _session_like(db: AsyncSession) -> AsyncSession:
+    """
+    호출한 세션과 같은 대상에 묶인 새 세션을 만듭니다.
+
+    get_read_db 가 고른 복제본에서 읽고, 트랜잭션 중인 커넥션에 묶인 세션(check_plans 등)이면
+    같은 트랜잭션 안의 savepoint 로 실행됩니다.
+    """
+    if db.bind is None:
+        return AsyncSessionLocal()
+    return AsyncSession(bind=db.bind, autoflush=False, expire_on_commit=False,
+                        join_transaction_mode="create_savepoint")
+
+def cached(name: str, ttl: float, stale_ttl: float = 0.0, key: Optional[Callable[..., Hashable]] = None,
+           max_entries: int = 1024):
+    """
+    AsyncSession 을 첫 인자로 받는 비동기 조회 함수에 single-flight + TTL 캐시를 적용합니다.
+
+    Args:
+        key: 세션을 제외한 인자로 캐시 키를 만드는 함수 (없으면 인자 전체)
+    """
+    cache = SingleFlightCache(name, ttl, stale_ttl, max_entries)
+    _caches[name] = cache
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(db, *args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+
+            async def _load():
+                # 조회 태스크는 다른 요청과 공유되고 첫 요청이 끝난 뒤에도 실행될 수 있으므로
+                # 요청의 세션(db) 대신 같은 대상의 새 세션 사용
+                async with _session_like(db) as session:
+                    return await fn(session, *args, **kwargs)
+
+            return await cache.get(cache_key, _load)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+metrics.register("cache", lambda: {name: cache.snapshot() for name, cache in _caches.items()})
@@ -0,0 +1,11 @@
+# app/config.py
+"""
+환경 변수 로드
+
+.env 파일은 이 모듈이 처음 import 될 때 프로세스당 한 번만 읽습니다.
+환경 변수를 import 시점에 읽는 모듈은 이 모듈을 먼저 import 해야 합니다.
+"""
+from dotenv import load_dotenv
+
+# .env 값이 시스템 환경 변수보다 우선 (기존 database.py 동작 유지)
+load_dotenv(override=True)
@@ -1,4 +1,4 @@
-from . import game, user, tetris
+from . import game, user, tetris, export, leaderboard
 from .user import (
     get_user, 
     get_user_by_email, 
@@ -7,5 +7,12 @@ from .user import (
     get_user_game_history, 
     get_game_detail_history,
     get_user_by_social_id,  # 소셜 ID로 사용자 조회
-    create_social_user      # 소셜 로그인으로 사용자 생성
+    create_social_user,     # 소셜 로그인으로 사용자 생성
+    get_user_async,
+    get_user_by_email_async,
+    create_user_async,
+    authenticate_user_async,
+    get_user_by_social_id_async,
+    create_social_user_async,
+    upsert_social_user_async
 )
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+사용자 기록 내보내기 (스트리밍)
+
+게임/추측/테트리스 게임/테트리스 점수를 서버 측 커서(yield_per)로 조금씩 읽어
+NDJSON 또는 CSV 한 줄씩 만들어 냅니다. 전체 결과를 메모리에 올리지 않습니다.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+# 서버 측 커서에서 한 번에 가져올 행 수
+EXPORT_BATCH_SIZE = 500
+
+# CSV 헤더 (모든 레코드 종류의 컬럼 합집합, 해당 없는 칸은 비워 둠)
+CSV_COLUMNS = [
+    "type", "id", "game_id", "status", "digits", "attempts_used", "answer",
+    "guess", "strike", "ball", "score", "level", "lines_cleared", "game_duration",
+    "created_at", "updated_at", "ended_at",
+]
+
+def _export_queries(user_id: int):
+    """(레코드 종류, 쿼리) 목록. 필요한 컬럼만 선택하여 보드 상태 등은 읽지 않음"""
+    Game, Guess = models.Game, models.Guess
+    TetrisGame, TetrisHighScore = models.TetrisGame, models.TetrisHighScore
+    return [
+        ("game", select(
+            Game.id, Game.status, Game.digits, Game.attempts_used,
+            Game.random_number.label("answer"), Game.created_at,
+        ).where(Game.user_id == user_id).order_by(Game.id)),
+        ("guess", select(
+            Guess.id, Guess.game_id, Guess.guess, Guess.strike, Guess.ball, Guess.created_at,
+        ).join(Game, Game.id == Guess.game_id).where(Game.user_id == user_id).order_by(Guess.id)),
+        ("tetris_game", select(
+            TetrisGame.id, TetrisGame.status, TetrisGame.score, TetrisGame.level,
+            TetrisGame.lines_cleared, TetrisGame.created_at, TetrisGame.updated_at, TetrisGame.ended_at,
+        ).where(TetrisGame.user_id == user_id).order_by(TetrisGame.id)),
+        ("tetris_high_score", select(
+            TetrisHighScore.id, TetrisHighScore.score, TetrisHighScore.level,
+            TetrisHighScore.lines_cleared, TetrisHighScore.game_duration, TetrisHighScore.created_at,
+        ).where(TetrisHighScore.user_id == user_id).order_by(TetrisHighScore.id)),
+    ]
+
+def _to_record(record_type: str, row) -> dict:
+    record = {"type": record_type}
+    for key, value in row.items():
+        record[key] = value.isoformat() if isinstance(value, datetime) else value
+    # 진행 중인 게임의 정답은 내보내지 않음
+    if record_type == "game" and record.get("status") == "ongoing":
+        record["answer"] = None
+    return record
+
+def _ndjson_line(record: dict) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+def _csv_writer():
+    """레코드를 CSV 한 줄 문자열로 바꾸는 함수를 반환합니다."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+
+    def _line(record: dict) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(record)
+        return buffer.getvalue()
+
+    return _line
+
+async def stream_user_history(
+    session_maker: Callable[[], AsyncSession], user_id: int, fmt: str = "ndjson"
+) -> AsyncIterator[str]:
+    """
+    사용자의 전체 기록을 한 줄씩 생성합니다.
+
+    StreamingResponse 는 의존성 정리 이후에 본문을 보내므로,
+    요청 의존성의 세션이 아니라 여기서 직접 세션을 열고 닫습니다.
+    """
+    if fmt == "csv":
+        line = _csv_writer()
+        yield ",".join(CSV_COLUMNS) + "\r\n"
+    else:
+        line = _ndjson_line
+
+    async with session_maker() as db:
+        for record_type, query in _export_queries(user_id):
+            result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for partition in result.mappings().partitions():
+                yield "".join(line(_to_record(record_type, row)) for row in partition)
@@ -1,6 +1,9 @@
 from fastapi import HTTPException
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from .. import models, schemas, utils
+from . import leaderboard
 
 MAX_ATTEMPTS = 10  # 최대 시도 횟수
 
@@ -43,22 +46,9 @@ def create_game(db: Session, game_req: schemas.CreateGameRequest, user=None):
 def make_guess(db: Session, game_id: int, guess_req: schemas.GuessRequest):
     # 1. 게임 조회
     game = db.query(models.Game).filter(models.Game.id == game_id).first()
-    if not game:
-        raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
-    
-    # 2. 게임 상태 확인
-    if game.status != "ongoing":
-        raise HTTPException(
-            status_code=400,
-            detail=f"이미 종료된 게임입니다. 현재 상태: {game.status}"
-        )
     
-    # 3. 추측한 숫자의 자릿수 검증
-    if len(guess_req.guess) != game.digits:
-        raise HTTPException(
-            status_code=400,
-            detail=f"입력한 숫자의 자릿수가 {game.digits}와 일치하지 않습니다."
-        )
+    # 2~3. 게임 상태 및 자릿수 검증
+    _validate_guess(game, guess_req)
     
     # 4. 스트라이크/볼 계산
     strike, ball = utils.calculate_strike_ball(game.random_number, guess_req.guess)
@@ -88,6 +78,27 @@ def make_guess(db: Session, game_id: int, guess_req: schemas.GuessRequest):
     db.commit()
     
     # 8. 응답 정보 구성
+    return _build_guess_response(game, strike, ball)
+
+def _validate_guess(game, guess_req: schemas.GuessRequest):
+    """게임 존재 여부, 상태, 자릿수를 검증합니다."""
+    if not game:
+        raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
+    
+    if game.status != "ongoing":
+        raise HTTPException(
+            status_code=400,
+            detail=f"이미 종료된 게임입니다. 현재 상태: {game.status}"
+        )
+    
+    if len(guess_req.guess) != game.digits:
+        raise HTTPException(
+            status_code=400,
+            detail=f"입력한 숫자의 자릿수가 {game.digits}와 일치하지 않습니다."
+        )
+
+def _build_guess_response(game, strike: int, ball: int):
+    """추측 결과 응답을 구성합니다."""
     attempts_left = MAX_ATTEMPTS - game.attempts_used if game.status == "ongoing" else 0
     message = f"{strike} 스트라이크, {ball} 볼입니다."
     if game.status == "win":
@@ -132,6 +143,10 @@ def get_game_status(db: Session, game_id: int):
         .all()
     )
     
+    return _build_status_response(game, guess_history)
+
+def _build_status_response(game, guess_history):
+    """게임 상태 응답을 구성합니다."""
     history = []
     for guess in guess_history:
         history.append({
@@ -183,4 +198,132 @@ def forfeit_game(db: Session, game_id: int):
     return schemas.ForfeitResponse(
         message="게임이 포기되었습니다.",
         status=game.status
-    )
\ No newline at end of file
+    )
+
+# ---------------------------------------------------------------------------
+# 비동기 버전 (AsyncSession 사용)
+# ---------------------------------------------------------------------------
+
+async def create_game_async(db: AsyncSession, game_req: schemas.CreateGameRequest, user=None):
+    """
+    새 게임 생성 (비동기)
+    
+    Args:
+        db: 비동기 데이터베이스 세션
+        game_req: 게임 생성 요청 데이터
+        user: 로그인한 사용자 (선택적)
+    """
+    random_num = utils.generate_random_number(game_req.digits)
+    new_game = models.Game(
+        random_number=random_num,
+        digits=game_req.digits,
+        user_id=user.id if user else None
+    )
+    db.add(new_game)
+    # expire_on_commit=False 이므로 커밋 후 refresh 없이 id 사용 가능
+    await db.commit()
+    
+    return schemas.CreateGameResponse(
+        game_id=new_game.id,
+        message=f"새로운 {new_game.digits}자리 숫자 야구 게임이 시작되었습니다."
+    )
+
+async def make_guess_async(db: AsyncSession, game_id: int, guess_req: schemas.GuessRequest):
+    """
+    게임에 숫자 추측 (비동기)
+    
+    게임 종료 시 이전 추측 기록 삭제까지 한 번의 커밋으로 처리합니다.
+    """
+    game = await db.get(models.Game, game_id)
+    _validate_guess(game, guess_req)
+    
+    strike, ball = utils.calculate_strike_ball(game.random_number, guess_req.guess)
+    game.attempts_used += 1
+    
+    new_guess = models.Guess(
+        game_id=game.id,
+        guess=guess_req.guess,
+        strike=strike,
+        ball=ball
+    )
+    db.add(new_guess)
+    
+    if strike == game.digits:
+        game.status = "win"
+    elif game.attempts_used >= MAX_ATTEMPTS:
+        game.status = "lose"
+    
+    if game.status != "ongoing":
+        # 게임 종료 시 이전 기록 삭제 (autoflush=False 이므로 이번 추측은 유지됨)
+        await db.execute(delete(models.Guess).where(models.Guess.game_id == game_id))
+    
+    if game.status == "win" and game.user_id:
+        await leaderboard.record_async(db, leaderboard.BOARD_BASEBALL, game.user_id, game.attempts_used)
+    
+    await db.commit()
+    
+    return _build_guess_response(game, strike, ball)
+
+async def get_game_etag_async(db: AsyncSession, game_id: int):
+    """
+    게임 상태의 ETag 와 종료 여부를 반환합니다. (비동기)
+    
+    추측 내역을 읽지 않고 시도 횟수와 상태만 조회합니다.
+    """
+    result = await db.execute(
+        select(models.Game.attempts_used, models.Game.status).where(models.Game.id == game_id)
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
+    
+    return _game_etag(game_id, row.attempts_used, row.status)
+
+def _game_etag(game_id: int, attempts_used: int, status: str):
+    """시도 횟수와 상태로 만든 ETag 와 종료 여부"""
+    return utils.make_etag("game", game_id, attempts_used, status), status != "ongoing"
+
+async def get_game_status_async(db: AsyncSession, game_id: int):
+    """
+    게임 상태 조회 (비동기)
+    """
+    response, _, _ = await get_game_status_with_etag_async(db, game_id)
+    return response
+
+async def get_game_status_with_etag_async(db: AsyncSession, game_id: int):
+    """
+    게임 상태와 그 ETag, 종료 여부를 반환합니다. (비동기)
+    
+    ETag 는 불러온 게임 행으로 계산하므로 별도 조회가 없습니다.
+    """
+    game = await db.get(models.Game, game_id)
+    if not game:
+        raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
+    
+    result = await db.execute(
+        select(models.Guess)
+        .where(models.Guess.game_id == game_id)
+        .order_by(models.Guess.created_at.asc())
+    )
+    
+    etag, finished = _game_etag(game_id, game.attempts_used, game.status)
+    return _build_status_response(game, result.scalars().all()), etag, finished
+
+async def forfeit_game_async(db: AsyncSession, game_id: int):
+    """
+    게임 포기 (비동기)
+    """
+    game = await db.get(models.Game, game_id)
+    if not game:
+        raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
+    
+    if game.status != "ongoing":
+        raise HTTPException(status_code=400, detail=f"이미 종료된 게임입니다. 현재 상태: {game.status}")
+    
+    game.status = "forfeited"
+    await db.commit()
+    
+    return schemas.ForfeitResponse(
+        message="게임이 포기되었습니다.",
+        status=game.status
+    )
@@ -0,0 +1,186 @@
+"""
+기간별 리더보드 (일간/주간/월간)
+
+게임 종료 시 현재 일/주/월 버킷에 사용자 기록을 upsert 하고,
+조회는 한 기간의 버킷만 정렬해 반환합니다. 매 요청마다 원본 테이블을 날짜 조건으로 훑지 않습니다.
+
+- tetris: 기간 내 최고 점수 (높을수록 상위)
+- baseball: 기간 내 승리한 게임의 최소 시도 횟수 (낮을수록 상위)
+
+기간은 UTC 기준으로 자동으로 넘어가며, 주기적 정리 작업이 지난 기간을 상위 K개만 남기고
+보관 기간이 지난 버킷을 삭제합니다.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import select, delete, func, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models, schemas, startup
+from ..cache import cached
+from ..database import AsyncSessionLocal, utcnow
+
+logger = logging.getLogger(__name__)
+
+BOARD_TETRIS = "tetris"
+BOARD_BASEBALL = "baseball"
+# 보드별 정렬 방향 (True: 값이 클수록 상위)
+HIGHER_IS_BETTER = {BOARD_TETRIS: True, BOARD_BASEBALL: False}
+
+PERIODS = ("daily", "weekly", "monthly")
+# 보관할 지난 기간 수
+RETENTION_WINDOWS = {"daily": 7, "weekly": 8, "monthly": 12}
+# 지난 기간 버킷에 남길 상위 항목 수
+LEADERBOARD_BUCKET_KEEP_TOP = int(os.getenv("LEADERBOARD_BUCKET_KEEP_TOP", "100"))
+# 정리 작업 주기(초), 0 이면 실행하지 않음
+LEADERBOARD_BUCKET_CLEANUP_SECONDS = float(os.getenv("LEADERBOARD_BUCKET_CLEANUP_SECONDS", "3600"))
+
+def window_start(period: str, at: datetime, ago: int = 0) -> datetime:
+    """
+    at 이 속한 기간에서 ago 만큼 이전 기간의 시작 시각 (UTC, naive)
+    """
+    if at.tzinfo is not None:
+        at = at.astimezone(UTC).replace(tzinfo=None)
+    day = datetime(at.year, at.month, at.day)
+    if period == "daily":
+        return day - timedelta(days=ago)
+    if period == "weekly":
+        return day - timedelta(days=day.weekday(), weeks=ago)
+    months = at.year * 12 + (at.month - 1) - ago
+    return datetime(months // 12, months % 12 + 1, 1)
+
+def window_end(period: str, start: datetime) -> datetime:
+    """start 로 시작하는 기간의 끝 (다음 기간 시작 시각)"""
+    if period == "daily":
+        return start + timedelta(days=1)
+    if period == "weekly":
+        return start + timedelta(weeks=1)
+    months = start.year * 12 + start.month
+    return datetime(months // 12, months % 12 + 1, 1)
+
+def _insert(db: AsyncSession):
+    """dialect 에 맞는 INSERT ... ON CONFLICT 구문"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(models.LeaderboardBucket)
+    return sqlite.insert(models.LeaderboardBucket)
+
+async def record_async(db: AsyncSession, board: str, user_id: int, value: int):
+    """
+    종료된 게임 기록을 현재 일/주/월 버킷에 반영합니다.
+
+    기존 기록보다 좋을 때만 갱신하며, 커밋은 호출한 쪽에서 게임 상태 변경과 함께 수행합니다.
+    """
+    now = utcnow()
+    bucket = models.LeaderboardBucket.__table__
+    stmt = _insert(db).values([
+        {
+            "board": board,
+            "period": period,
+            "window_start": window_start(period, now),
+            "user_id": user_id,
+            "value": value,
+            "achieved_at": now,
+        }
+        for period in PERIODS
+    ])
+    better = bucket.c.value < stmt.excluded.value if HIGHER_IS_BETTER[board] else bucket.c.value > stmt.excluded.value
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["board", "period", "window_start", "user_id"],
+        set_={"value": stmt.excluded.value, "achieved_at": stmt.excluded.achieved_at},
+        where=better,
+    ))
+
+def _order_by(board: str):
+    Bucket = models.LeaderboardBucket
+    value = Bucket.value.desc() if HIGHER_IS_BETTER[board] else Bucket.value.asc()
+    return value, Bucket.achieved_at.asc()
+
+@cached(
+    "window_leaderboard", ttl=5, stale_ttl=60,
+    key=lambda board, period, limit=10, ago=0: (board, period, limit, ago)
+)
+async def get_window_leaderboard_async(db: AsyncSession, board: str, period: str, limit: int = 10, ago: int = 0):
+    """
+    기간별 리더보드를 조회합니다. (비동기)
+
+    Args:
+        board: 보드 종류 (tetris, baseball)
+        period: 기간 (daily, weekly, monthly)
+        limit: 조회할 최대 항목 수
+        ago: 몇 기간 전 리더보드인지 (0 이면 현재 기간)
+    """
+    Bucket = models.LeaderboardBucket
+    start = window_start(period, datetime.now(UTC), ago)
+    result = await db.execute(
+        select(Bucket.value, Bucket.achieved_at, models.User.username)
+        .join(models.User, Bucket.user_id == models.User.id)
+        .where(Bucket.board == board, Bucket.period == period, Bucket.window_start == start)
+        .order_by(*_order_by(board))
+        .limit(limit)
+    )
+
+    entries = [
+        schemas.WindowLeaderboardItem(rank=rank, username=username, value=value, achieved_at=achieved_at)
+        for rank, (value, achieved_at, username) in enumerate(result.all(), start=1)
+    ]
+    return schemas.WindowLeaderboardResponse(
+        board=board,
+        period=period,
+        window_start=start,
+        window_end=window_end(period, start),
+        entries=entries
+    )
+
+async def cleanup_async(db: AsyncSession):
+    """
+    지난 기간 버킷은 상위 K개만 남기고, 보관 기간이 지난 버킷은 삭제합니다.
+    """
+    Bucket = models.LeaderboardBucket
+    now = datetime.now(UTC)
+    deleted = 0
+    for period in PERIODS:
+        current = window_start(period, now)
+        expired = await db.execute(delete(Bucket).where(
+            Bucket.period == period,
+            Bucket.window_start < window_start(period, now, RETENTION_WINDOWS[period])
+        ))
+        deleted += expired.rowcount
+
+        for board in HIGHER_IS_BETTER:
+            ranked = select(
+                Bucket.board, Bucket.period, Bucket.window_start, Bucket.user_id,
+                func.row_number().over(
+                    partition_by=Bucket.window_start, order_by=_order_by(board)
+                ).label("rank")
+            ).where(
+                Bucket.board == board, Bucket.period == period, Bucket.window_start < current
+            ).subquery()
+            trimmed = await db.execute(delete(Bucket).where(
+                tuple_(Bucket.board, Bucket.period, Bucket.window_start, Bucket.user_id).in_(
+                    select(ranked.c.board, ranked.c.period, ranked.c.window_start, ranked.c.user_id)
+                    .where(ranked.c.rank > LEADERBOARD_BUCKET_KEEP_TOP)
+                )
+            ))
+            deleted += trimmed.rowcount
+    await db.commit()
+    return deleted
+
+async def cleanup_loop():
+    """
+    기간별 리더보드 버킷을 주기적으로 정리합니다.
+    """
+    while True:
+        await asyncio.sleep(LEADERBOARD_BUCKET_CLEANUP_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                deleted = await cleanup_async(db)
+            if deleted:
+                logger.info(f"기간별 리더보드 버킷 정리: {deleted}건 삭제")
+        except Exception as e:
+            logger.error(f"기간별 리더보드 버킷 정리 실패: {str(e)}")
+
+if LEADERBOARD_BUCKET_CLEANUP_SECONDS > 0:
+    startup.register_background(cleanup_loop)
@@ -1,22 +1,24 @@
 from fastapi import HTTPException
+from sqlalchemy import select, func, or_, and_
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
-from datetime import datetime, UTC
+from datetime import UTC
 from typing import List, Dict, Optional, Any
 
 from .. import models, schemas, utils
+from ..database import utcnow
+from ..cache import cached
 from ..tetris import tetris_utils  # 테트리스 게임 로직 유틸리티
+from ..tetris.leaderboard import leaderboard, ScoreEntry, user_best_subquery
+from ..tetris.stats import game_stats
+from . import leaderboard as window_leaderboard
 from ..schemas import TetrisMoveType, TetrisGameStatus
 import random
 
-def create_game(db: Session, game_req: schemas.CreateTetrisGameRequest, user=None):
+def _new_game_model(game_req: schemas.CreateTetrisGameRequest, user=None):
     """
-    새 테트리스 게임을 생성합니다.
-    
-    Args:
-        db: 데이터베이스 세션
-        game_req: 게임 생성 요청 데이터
-        user: 로그인한 사용자 (선택적)
+    초기 상태의 TetrisGame 모델 객체를 생성합니다. (DB 접근 없음)
     """
     # 초기 보드 상태 생성 (빈 보드)
     width = game_req.width
@@ -55,6 +57,19 @@ def create_game(db: Session, game_req: schemas.CreateTetrisGameRequest, user=Non
             user_id=user.id if user else None
         )
     
+    return new_game
+
+def create_game(db: Session, game_req: schemas.CreateTetrisGameRequest, user=None):
+    """
+    새 테트리스 게임을 생성합니다.
+    
+    Args:
+        db: 데이터베이스 세션
+        game_req: 게임 생성 요청 데이터
+        user: 로그인한 사용자 (선택적)
+    """
+    new_game = _new_game_model(game_req, user)
+    
     db.add(new_game)
     
     try:
@@ -66,10 +81,14 @@ def create_game(db: Session, game_req: schemas.CreateTetrisGameRequest, user=Non
         print(f"데이터베이스 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="게임 생성 중 오류가 발생했습니다.")
     
+    return _build_create_response(new_game, game_req)
+
+def _build_create_response(new_game, game_req: schemas.CreateTetrisGameRequest):
+    """게임 생성 응답을 구성합니다."""
     return schemas.CreateTetrisGameResponse(
         game_id=new_game.id,
-        width=width,
-        height=height,
+        width=game_req.width,
+        height=game_req.height,
         level=new_game.level,
         message="새로운 테트리스 게임이 시작되었습니다."
     )
@@ -87,6 +106,14 @@ def get_game_status(db: Session, game_id: int):
     if not game:
         raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
     
+    return _build_status_response(game)
+
+def _build_status_response(game):
+    """
+    게임 상태 응답을 구성합니다.
+    
+    DB 에 저장된 상태로 서버가 만드는 값이므로 검증 없이(model_construct) 생성합니다.
+    """
     # 게임 상태 로드
     board = json.loads(game.board_state)
     current_piece = json.loads(game.current_piece) if game.current_piece else None
@@ -94,7 +121,7 @@ def get_game_status(db: Session, game_id: int):
     held_piece = json.loads(game.held_piece) if game.held_piece else None
     can_hold = game.can_hold if hasattr(game, 'can_hold') else True
     
-    return schemas.TetrisGameStatusResponse(
+    return schemas.TetrisGameStatusResponse.model_construct(
         game_id=game.id,
         status=game.status,
         board=board,
@@ -121,6 +148,42 @@ def make_move(db: Session, game_id: int, move_req: schemas.TetrisMoveRequest):
     if not game:
         raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
     
+    # 이동 처리 (DB 접근 없는 게임 로직)
+    response, move, finished = _apply_move(game, move_req)
+    if move is None:
+        return response
+    
+    # 최고 점수 등록 (로그인한 사용자의 경우)
+    if finished and game.user_id:
+        save_high_score(db, game.user_id, game.score, game.level, game.lines_cleared, _game_duration(game))
+    
+    # 이동 기록 저장
+    db.add(move)
+    
+    # 변경사항 저장
+    db.commit()
+    db.refresh(game)
+    
+    return response
+
+def _game_duration(game) -> int:
+    """게임 지속 시간(초)"""
+    created_at, ended_at = game.created_at, game.ended_at
+    # 저장하는 시각은 timezone 정보 없는 UTC (이전에 aware 로 저장된 값은 맞춰서 비교)
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(UTC).replace(tzinfo=None)
+    if ended_at.tzinfo is not None:
+        ended_at = ended_at.astimezone(UTC).replace(tzinfo=None)
+    return (ended_at - created_at).seconds
+
+def _apply_move(game, move_req: schemas.TetrisMoveRequest):
+    """
+    게임 객체에 이동을 적용합니다. (DB 접근 없음)
+    
+    Returns:
+        (응답, 저장할 TetrisMove 또는 None, 이번 이동으로 게임이 종료되었는지 여부)
+        이동이 실패한 경우 TetrisMove는 None이며 게임 객체는 변경되지 않습니다.
+    """
     # 게임이 진행 중인지 확인
     if game.status != "ongoing":
         raise HTTPException(
@@ -159,7 +222,7 @@ def make_move(db: Session, game_id: int, move_req: schemas.TetrisMoveRequest):
     
     # 이동 결과 적용
     if not result["success"]:
-        return schemas.TetrisMoveResponse(
+        return schemas.TetrisMoveResponse.model_construct(
             success=False,
             board=board,
             current_piece=current_piece,
@@ -171,7 +234,7 @@ def make_move(db: Session, game_id: int, move_req: schemas.TetrisMoveRequest):
             status=game.status,
             can_hold=can_hold,
             message=result["message"]
-        )
+        ), None, False
     
     # 이동 결과 업데이트
     board = result["board"]
@@ -198,14 +261,11 @@ def make_move(db: Session, game_id: int, move_req: schemas.TetrisMoveRequest):
     game.level = new_level
     
     # 게임 오버 체크
+    finished = False
     if tetris_utils.check_game_over(board, current_piece):
         game.status = "game_over"
-        game.ended_at = datetime.now(UTC)
-        
-        # 최고 점수 등록 (로그인한 사용자의 경우)
-        if game.user_id:
-            game_duration = (game.ended_at - game.created_at).seconds
-            save_high_score(db, game.user_id, game.score, game.level, game.lines_cleared, game_duration)
+        game.ended_at = utcnow()
+        finished = True
     
     # 게임 상태 업데이트
     game.board_state = json.dumps(board)
@@ -233,13 +293,9 @@ def make_move(db: Session, game_id: int, move_req: schemas.TetrisMoveRequest):
         score_after_move=game.score,
         lines_cleared=len(cleared_lines)
     )
-    db.add(move)
     
-    # 변경사항 저장
-    db.commit()
-    db.refresh(game)
-    
-    return schemas.TetrisMoveResponse(
+    # 게임 로직이 만든 값이므로 검증 없이 응답 구성
+    response = schemas.TetrisMoveResponse.model_construct(
         success=True,
         board=board,
         current_piece=current_piece,
@@ -253,6 +309,8 @@ def make_move(db: Session, game_id: int, move_req: schemas.TetrisMoveRequest):
         can_hold=can_hold,
         message="이동이 성공적으로 처리되었습니다."
     )
+    
+    return response, move, finished
 
 def pause_game(db: Session, game_id: int, pause_req: schemas.TetrisPauseRequest):
     """
@@ -268,6 +326,13 @@ def pause_game(db: Session, game_id: int, pause_req: schemas.TetrisPauseRequest)
     if not game:
         raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
     
+    response = _apply_pause(game, pause_req)
+    db.commit()
+    
+    return response
+
+def _apply_pause(game, pause_req: schemas.TetrisPauseRequest):
+    """게임 상태를 일시정지/재개로 변경하고 응답을 구성합니다. (DB 접근 없음)"""
     # 게임이 이미 종료된 경우
     if game.status == "game_over":
         raise HTTPException(status_code=400, detail="이미 종료된 게임입니다.")
@@ -280,8 +345,6 @@ def pause_game(db: Session, game_id: int, pause_req: schemas.TetrisPauseRequest)
         game.status = "ongoing"
         message = "게임이 재개되었습니다."
     
-    db.commit()
-    
     return schemas.TetrisPauseResponse(
         game_id=game.id,
         status=game.status,
@@ -301,27 +364,34 @@ def forfeit_game(db: Session, game_id: int):
     if not game:
         raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
     
-    # 이미 종료된 게임인 경우
-    if game.status == "game_over":
-        raise HTTPException(status_code=400, detail="이미 종료된 게임입니다.")
-    
     # 게임 종료 처리
-    game.status = "game_over"
-    game.ended_at = datetime.now(UTC)
+    _finish_game(game)
     
     # 최고 점수 등록 (로그인한 사용자의 경우)
     if game.user_id:
-        game_duration = (game.ended_at - game.created_at).seconds
-        save_high_score(db, game.user_id, game.score, game.level, game.lines_cleared, game_duration)
+        save_high_score(db, game.user_id, game.score, game.level, game.lines_cleared, _game_duration(game))
     
     db.commit()
     
+    return _build_game_over_response(game)
+
+def _finish_game(game):
+    """포기 처리를 위해 게임을 종료 상태로 변경합니다. (DB 접근 없음)"""
+    # 이미 종료된 게임인 경우
+    if game.status == "game_over":
+        raise HTTPException(status_code=400, detail="이미 종료된 게임입니다.")
+    
+    game.status = "game_over"
+    game.ended_at = utcnow()
+
+def _build_game_over_response(game):
+    """게임 종료 응답을 구성합니다."""
     return schemas.TetrisGameOverResponse(
         game_id=game.id,
         final_score=game.score,
         level_reached=game.level,
         lines_cleared=game.lines_cleared,
-        game_duration=(game.ended_at - game.created_at).seconds,
+        game_duration=_game_duration(game),
         high_score=False  # 기본값, 최고 점수 여부는 save_high_score 함수에서 결정
     )
 
@@ -376,21 +446,21 @@ def get_leaderboard(db: Session, limit: int = 10):
     ).limit(limit).all()
     
     # 결과 변환
-    leaderboard = []
-    for high_score, username in high_scores:
-        leaderboard.append(
-            schemas.TetrisHighScoreItem(
-                username=username,
-                score=high_score.score,
-                level=high_score.level,
-                lines_cleared=high_score.lines_cleared,
-                game_duration=high_score.game_duration,
-                created_at=high_score.created_at
-            )
-        )
+    leaderboard = [_build_score_item(high_score, username) for high_score, username in high_scores]
     
     return schemas.TetrisLeaderboardResponse(scores=leaderboard)
 
+def _build_score_item(high_score, username: str):
+    """최고 점수 항목을 구성합니다."""
+    return schemas.TetrisHighScoreItem(
+        username=username,
+        score=high_score.score,
+        level=high_score.level,
+        lines_cleared=high_score.lines_cleared,
+        game_duration=high_score.game_duration,
+        created_at=high_score.created_at
+    )
+
 def get_user_high_scores(db: Session, user_id: int, limit: int = 5):
     """
     사용자의 최고 점수 목록을 조회합니다.
@@ -415,18 +485,7 @@ def get_user_high_scores(db: Session, user_id: int, limit: int = 5):
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     
     # 결과 변환
-    scores = []
-    for high_score in high_scores:
-        scores.append(
-            schemas.TetrisHighScoreItem(
-                username=user.username,
-                score=high_score.score,
-                level=high_score.level,
-                lines_cleared=high_score.lines_cleared,
-                game_duration=high_score.game_duration,
-                created_at=high_score.created_at
-            )
-        )
+    scores = [_build_score_item(high_score, user.username) for high_score in high_scores]
     
     return schemas.TetrisLeaderboardResponse(scores=scores)
 
@@ -535,7 +594,7 @@ def update_game_state(db: Session, game_id: int, move_req: schemas.TetrisMoveReq
     # 점수, 레벨 등 업데이트
     # ...
     
-    game.updated_at = datetime.now(UTC)
+    game.updated_at = utcnow()
     db.commit()
     
     # 응답 반환 - 항상 held_piece 포함
@@ -552,4 +611,300 @@ def update_game_state(db: Session, game_id: int, move_req: schemas.TetrisMoveReq
         status=game.status,
         can_hold=can_hold,
         message=message
-    )
\ No newline at end of file
+    )
+
+# ---------------------------------------------------------------------------
+# 비동기 버전 (AsyncSession 사용)
+# ---------------------------------------------------------------------------
+
+async def create_game_async(db: AsyncSession, game_req: schemas.CreateTetrisGameRequest, user=None):
+    """
+    새 테트리스 게임을 생성합니다. (비동기)
+    
+    Args:
+        db: 비동기 데이터베이스 세션
+        game_req: 게임 생성 요청 데이터
+        user: 로그인한 사용자 (선택적)
+    """
+    new_game = _new_game_model(game_req, user)
+    db.add(new_game)
+    
+    try:
+        # expire_on_commit=False 이므로 커밋 후 refresh 없이 id 사용 가능
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        print(f"데이터베이스 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="게임 생성 중 오류가 발생했습니다.")
+    
+    return _build_create_response(new_game, game_req)
+
+async def _get_game_or_404(db: AsyncSession, game_id: int):
+    game = await db.get(models.TetrisGame, game_id)
+    if not game:
+        raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
+    return game
+
+async def get_game_etag_async(db: AsyncSession, game_id: int):
+    """
+    게임 상태의 ETag 와 종료 여부를 반환합니다. (비동기)
+    
+    보드 JSON 을 읽지 않고 마지막 업데이트 시각과 상태만 조회합니다.
+    """
+    result = await db.execute(
+        select(models.TetrisGame.updated_at, models.TetrisGame.status).where(models.TetrisGame.id == game_id)
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=404, detail="게임을 찾을 수 없습니다.")
+    
+    return _game_etag(game_id, row.updated_at, row.status)
+
+def _game_etag(game_id: int, updated_at, status: str):
+    """마지막 업데이트 시각과 상태로 만든 ETag 와 종료 여부"""
+    version = int(updated_at.timestamp() * 1_000_000) if updated_at else 0
+    return utils.make_etag("tetris", game_id, version, status), status == TetrisGameStatus.GAME_OVER.value
+
+async def get_game_status_async(db: AsyncSession, game_id: int):
+    """
+    게임 상태를 조회합니다. (비동기)
+    """
+    game = await _get_game_or_404(db, game_id)
+    return _build_status_response(game)
+
+async def get_game_status_with_etag_async(db: AsyncSession, game_id: int):
+    """
+    게임 상태와 그 ETag, 종료 여부를 한 번의 조회로 반환합니다. (비동기)
+    """
+    game = await _get_game_or_404(db, game_id)
+    etag, finished = _game_etag(game_id, game.updated_at, game.status)
+    return _build_status_response(game), etag, finished
+
+async def make_move_async(db: AsyncSession, game_id: int, move_req: schemas.TetrisMoveRequest):
+    """
+    게임에서 이동을 수행합니다. (비동기)
+    
+    게임 오버 시 최고 점수 등록까지 한 번의 커밋으로 처리합니다.
+    """
+    game = await _get_game_or_404(db, game_id)
+    
+    response, move, finished = _apply_move(game, move_req)
+    if move is None:
+        return response
+    
+    high_score = None
+    if finished and game.user_id:
+        high_score = await save_high_score_async(db, game.user_id, game.score, game.level, game.lines_cleared, _game_duration(game))
+        await window_leaderboard.record_async(db, window_leaderboard.BOARD_TETRIS, game.user_id, game.score)
+    
+    db.add(move)
+    await db.commit()
+    
+    if finished:
+        game_stats.record(game.id, game.score, game.lines_cleared)
+    if high_score is not None:
+        leaderboard.add(ScoreEntry.from_model(high_score))
+        _invalidate_user_high_scores(high_score.user_id)
+    
+    return response
+
+async def pause_game_async(db: AsyncSession, game_id: int, pause_req: schemas.TetrisPauseRequest):
+    """
+    게임을 일시정지하거나 재개합니다. (비동기)
+    """
+    game = await _get_game_or_404(db, game_id)
+    response = _apply_pause(game, pause_req)
+    await db.commit()
+    
+    return response
+
+async def forfeit_game_async(db: AsyncSession, game_id: int):
+    """
+    게임을 포기하고 종료합니다. (비동기)
+    """
+    game = await _get_game_or_404(db, game_id)
+    _finish_game(game)
+    
+    high_score = None
+    if game.user_id:
+        high_score = await save_high_score_async(db, game.user_id, game.score, game.level, game.lines_cleared, _game_duration(game))
+        await window_leaderboard.record_async(db, window_leaderboard.BOARD_TETRIS, game.user_id, game.score)
+    
+    await db.commit()
+    
+    game_stats.record(game.id, game.score, game.lines_cleared)
+    if high_score is not None:
+        leaderboard.add(ScoreEntry.from_model(high_score))
+        _invalidate_user_high_scores(high_score.user_id)
+    
+    return _build_game_over_response(game)
+
+async def save_high_score_async(db: AsyncSession, user_id: int, score: int, level: int, lines_cleared: int, game_duration: int):
+    """
+    사용자의 최고 점수를 저장합니다. (비동기)
+    
+    커밋은 호출한 쪽에서 게임 상태 변경과 함께 수행하고, 커밋 후 반환된 기록을
+    인메모리 리더보드에 추가합니다. 최고 점수가 아니면 None 을 반환합니다.
+    """
+    # 인메모리 리더보드의 최고 기록 이하라면 DB 최고 기록보다도 낮으므로 조회 생략
+    best = leaderboard.user_best(user_id)
+    if best is not None and score <= best.score:
+        return None
+    
+    result = await db.execute(
+        select(models.TetrisHighScore.score)
+        .where(models.TetrisHighScore.user_id == user_id)
+        .order_by(models.TetrisHighScore.score.desc())
+        .limit(1)
+    )
+    highest_score = result.scalar_one_or_none()
+    
+    if highest_score is None or score > highest_score:
+        high_score = models.TetrisHighScore(
+            user_id=user_id,
+            score=score,
+            level=level,
+            lines_cleared=lines_cleared,
+            game_duration=game_duration
+        )
+        db.add(high_score)
+        return high_score
+    
+    return None
+
+def _invalidate_user_high_scores(user_id: int):
+    """새 최고 점수가 저장된 사용자의 캐시된 최고 점수 목록을 제거합니다."""
+    get_user_high_scores_async.cache.invalidate(lambda key: key[0] == user_id)
+
+async def _usernames_async(db: AsyncSession, user_ids) -> Dict[int, str]:
+    """리더보드에 사용자명이 없는 사용자만 한 번에 조회합니다."""
+    missing = {user_id for user_id in user_ids if leaderboard.username(user_id) is None}
+    if missing:
+        result = await db.execute(
+            select(models.User.id, models.User.username).where(models.User.id.in_(missing))
+        )
+        leaderboard.set_usernames(dict(result.all()))
+    return {user_id: leaderboard.username(user_id) for user_id in user_ids}
+
+@cached("tetris_leaderboard", ttl=2, stale_ttl=30, key=lambda limit=10: limit)
+async def get_leaderboard_async(db: AsyncSession, limit: int = 10):
+    """
+    최고 점수 리더보드를 조회합니다. (비동기)
+    
+    인메모리 리더보드가 적재되어 있고 보관한 상위 기록 수 이내이면 DB 를 조회하지 않습니다.
+    """
+    entries = leaderboard.top(limit) if leaderboard.loaded else None
+    if entries is not None:
+        leaderboard.stats["hits"] += 1
+        usernames = await _usernames_async(db, {entry.user_id for entry in entries})
+        return schemas.TetrisLeaderboardResponse(scores=[
+            _build_score_item(entry, usernames[entry.user_id])
+            for entry in entries if usernames[entry.user_id] is not None
+        ])
+    
+    leaderboard.stats["fallbacks"] += 1
+    result = await db.execute(
+        select(models.TetrisHighScore, models.User.username)
+        .join(models.User, models.TetrisHighScore.user_id == models.User.id)
+        .order_by(models.TetrisHighScore.score.desc())
+        .limit(limit)
+    )
+    
+    leaderboard_items = [_build_score_item(high_score, username) for high_score, username in result.all()]
+    return schemas.TetrisLeaderboardResponse(scores=leaderboard_items)
+
+def _build_rank_item(rank: int, high_score, username: str):
+    """순위가 포함된 최고 점수 항목을 구성합니다."""
+    return schemas.TetrisRankItem(
+        rank=rank,
+        username=username,
+        score=high_score.score,
+        level=high_score.level,
+        lines_cleared=high_score.lines_cleared,
+        game_duration=high_score.game_duration,
+        created_at=high_score.created_at
+    )
+
+async def _get_my_rank_from_db(db: AsyncSession, user_id: int, around: int):
+    """인메모리 리더보드 적재 전에 사용하는 SQL 버전"""
+    best = user_best_subquery()
+    total_players = (await db.execute(select(func.count()).select_from(best))).scalar_one()
+    
+    mine = (await db.execute(select(best).where(best.c.user_id == user_id))).first()
+    if mine is None:
+        return schemas.TetrisMyRankResponse(rank=None, total_players=total_players, entries=[])
+    
+    # 점수가 같으면 먼저 달성한 기록이 앞 순위
+    is_above = or_(
+        best.c.score > mine.score,
+        and_(best.c.score == mine.score, best.c.created_at < mine.created_at)
+    )
+    higher = (await db.execute(
+        select(func.count()).select_from(best).where(is_above)
+    )).scalar_one()
+    rank = higher + 1
+    
+    columns = (best, models.User.username)
+    above = (await db.execute(
+        select(*columns).join(models.User, models.User.id == best.c.user_id)
+        .where(is_above)
+        .order_by(best.c.score.asc(), best.c.created_at.desc()).limit(around)
+    )).all()
+    below = (await db.execute(
+        select(*columns).join(models.User, models.User.id == best.c.user_id)
+        .where(~is_above, best.c.user_id != user_id)
+        .order_by(best.c.score.desc(), best.c.created_at.asc()).limit(around)
+    )).all()
+    username = await db.scalar(select(models.User.username).where(models.User.id == user_id))
+    
+    entries = [_build_rank_item(rank - len(above) + i, row, row.username) for i, row in enumerate(reversed(above))]
+    entries.append(_build_rank_item(rank, mine, username))
+    entries.extend(_build_rank_item(rank + 1 + i, row, row.username) for i, row in enumerate(below))
+    return schemas.TetrisMyRankResponse(rank=rank, total_players=total_players, entries=entries)
+
+async def get_my_rank_async(db: AsyncSession, user_id: int, around: int = 5):
+    """
+    사용자별 최고 기록 기준으로 내 순위와 위아래 around 명을 조회합니다. (비동기)
+    """
+    if not leaderboard.loaded:
+        leaderboard.stats["fallbacks"] += 1
+        return await _get_my_rank_from_db(db, user_id, around)
+    
+    leaderboard.stats["hits"] += 1
+    rank, ranked = leaderboard.around(user_id, around)
+    usernames = await _usernames_async(db, {entry.user_id for _, entry in ranked})
+    return schemas.TetrisMyRankResponse(
+        rank=rank,
+        total_players=leaderboard.total_players,
+        entries=[
+            _build_rank_item(position, entry, usernames[entry.user_id])
+            for position, entry in ranked if usernames[entry.user_id] is not None
+        ]
+    )
+
+def get_percentiles():
+    """
+    종료된 게임의 점수/라인 백분위수와 분포를 반환합니다. (DB 접근 없음)
+    """
+    if not game_stats.loaded:
+        raise HTTPException(status_code=503, detail="통계를 준비하는 중입니다. 잠시 후 다시 시도해주세요.")
+    return schemas.TetrisPercentilesResponse(**game_stats.summary())
+
+@cached("tetris_user_high_scores", ttl=30, key=lambda user_id, limit=5: (user_id, limit), max_entries=10000)
+async def get_user_high_scores_async(db: AsyncSession, user_id: int, limit: int = 5):
+    """
+    사용자의 최고 점수 목록을 조회합니다. (비동기)
+    """
+    user = await db.get(models.User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    
+    result = await db.execute(
+        select(models.TetrisHighScore)
+        .where(models.TetrisHighScore.user_id == user_id)
+        .order_by(models.TetrisHighScore.score.desc())
+        .limit(limit)
+    )
+    
+    scores = [_build_score_item(high_score, user.username) for high_score in result.scalars().all()]
+    return schemas.TetrisLeaderboardResponse(scores=scores)
@@ -1,8 +1,16 @@
+from sqlalchemy import select, update, func, tuple_, true, null, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from .. import models, schemas, utils
 from ..auth.utils import get_password_hash, verify_password, create_access_token, create_refresh_token
-from datetime import timedelta, datetime, UTC
+from ..auth.passwords import hash_password_async, verify_password_async
+from ..auth.identity import invalidate_identity
+from ..database import utcnow
+from datetime import timedelta, datetime
+import base64
 import random
 import string
 
@@ -17,34 +25,45 @@ def get_user_by_email(db: Session, email: str):
 """
 새 사용자 생성
     
-1. 이메일 중복 확인
-2. 사용자명 중복 확인   
-3. 비밀번호 해싱
-4. 사용자 생성 및 저장
+1. 비밀번호 해싱
+2. INSERT ... ON CONFLICT DO NOTHING RETURNING 으로 생성 (중복 확인은 unique 제약이 담당)
+3. 삽입된 행이 없으면 이메일/사용자명 중 어느 쪽이 중복인지 확인해 400 반환
 """
 def create_user(db: Session, user: schemas.UserCreate):
-    # 이메일 중복 확인
-    db_user = get_user_by_email(db, email=user.email)
-    if db_user:
-        raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다")
-    
-    # 사용자명 중복 확인
-    db_user = get_user_by_username(db, username=user.username)
-    if db_user:
-        raise HTTPException(status_code=400, detail="이미 사용 중인 사용자명입니다")
-    
-    # 비밀번호 해싱
-    hashed_password = get_password_hash(user.password)
-    db_user = models.User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password
-    )
-    db.add(db_user)
+    stmt = _insert_user(db).values(**_user_values(user, get_password_hash(user.password)))
+    db_user = db.scalars(stmt.on_conflict_do_nothing().returning(models.User)).first()
+    if db_user is None:
+        db.rollback()
+        email_taken = db.execute(_duplicate_email_query(user)).scalar()
+        _raise_duplicate_user(email_taken)
     db.commit()
-    db.refresh(db_user)
+    invalidate_identity(db_user.id)
     return db_user
 
+def _insert_user(db):
+    """dialect 에 맞는 users INSERT ... ON CONFLICT 구문"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(models.User)
+    return sqlite.insert(models.User)
+
+def _user_values(user: schemas.UserCreate, hashed_password: str):
+    return {
+        "username": user.username,
+        "email": user.email,
+        "hashed_password": hashed_password,
+        "is_active": True,
+        "created_at": utcnow(),
+    }
+
+def _duplicate_email_query(user: schemas.UserCreate):
+    """가입 충돌 시 이메일 중복 여부 (아니면 사용자명 중복)"""
+    return select(func.count()).select_from(models.User).where(models.User.email == user.email)
+
+def _raise_duplicate_user(email_taken: int):
+    if email_taken:
+        raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다")
+    raise HTTPException(status_code=400, detail="이미 사용 중인 사용자명입니다")
+
 """
 사용자 인증 - 이메일 기반으로 변경
     
@@ -54,7 +73,8 @@ def create_user(db: Session, user: schemas.UserCreate):
 """
 def authenticate_user(db: Session, email: str, password: str):
     user = get_user_by_email(db, email)
-    if not user:
+    # 소셜 로그인으로만 가입한 사용자는 비밀번호가 없음
+    if not user or not user.hashed_password:
         return False
     if not verify_password(password, user.hashed_password):
         return False
@@ -81,52 +101,117 @@ def create_user_tokens(user):
         "token_type": "bearer"
     }
 
+HISTORY_PAGE_SIZE = 20      # 기본 페이지 크기
+HISTORY_MAX_PAGE_SIZE = 100  # 최대 페이지 크기
+
 """
-사용자의 게임 히스토리 조회
+사용자의 게임 히스토리 조회 (키셋 페이지네이션)
     
-1. 사용자 확인
-2. 사용자의 모든 게임 조회 (최신순)
-3. 각 게임의 마지막 추측 정보 포함
+1. 사용자 확인 (첫 페이지에서만 전체 게임 수도 조회, 다음 페이지는 게임 수와 무관한 비용)
+2. 커서 이후의 게임을 (created_at, id) 내림차순으로 limit 개 조회
+   - 각 게임의 마지막 추측은 LATERAL JOIN 으로 같은 쿼리에서 함께 조회 (N+1 제거)
+3. 다음 페이지가 있으면 next_cursor 반환
 """
-def get_user_game_history(db: Session, user_id: int):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
+def get_user_game_history(db: Session, user_id: int, limit: int = HISTORY_PAGE_SIZE, cursor: str | None = None):
+    row = db.execute(_history_user_query(user_id, with_total=cursor is None)).first()
+    if not row:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
     
-    # 사용자의 모든 게임 조회 (최신순)
-    games = (
-        db.query(models.Game)
-        .filter(models.Game.user_id == user_id)
-        .order_by(models.Game.created_at.desc())
-        .all()
+    rows = db.execute(_history_page_query(user_id, limit, cursor)).all()
+    return _build_history_page(row, rows, limit)
+
+def encode_history_cursor(created_at: datetime, game_id: int) -> str:
+    """마지막 항목의 (created_at, id) 를 불투명한 커서 문자열로 인코딩합니다."""
+    raw = f"{created_at.isoformat()}|{game_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_history_cursor(cursor: str):
+    """커서 문자열을 (created_at, id) 로 디코딩합니다."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, game_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(game_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 커서입니다")
+
+def _history_user_query(user_id: int, with_total: bool = True):
+    """
+    사용자명과 전체 게임 수 (games(user_id, created_at) 인덱스만으로 계산)
+
+    전체 게임 수는 사용자의 게임 수에 비례하는 비용이 들므로 with_total=False 이면 NULL 로 조회합니다.
+    """
+    if not with_total:
+        return select(models.User.username, null().label("total_games")).where(models.User.id == user_id)
+    total_games = (
+        select(func.count())
+        .select_from(models.Game)
+        .where(models.Game.user_id == user_id)
+        .scalar_subquery()
+    )
+    return select(models.User.username, total_games.label("total_games")).where(models.User.id == user_id)
+
+def _history_page_query(user_id: int, limit: int, cursor: str | None):
+    """한 페이지의 게임과 각 게임의 마지막 추측을 조회하는 단일 쿼리"""
+    last_guess = (
+        select(models.Guess.guess, models.Guess.created_at)
+        .where(models.Guess.game_id == models.Game.id)
+        .order_by(models.Guess.created_at.desc())
+        .limit(1)
+        .lateral("last_guess")
     )
     
-    # 게임 정보 변환
-    game_history = []
-    for game in games:
-        # 각 게임의 마지막 추측 조회
-        last_guess = (
-            db.query(models.Guess)
-            .filter(models.Guess.game_id == game.id)
-            .order_by(models.Guess.created_at.desc())
-            .first()
+    query = (
+        select(
+            models.Game.id,
+            models.Game.digits,
+            models.Game.status,
+            models.Game.attempts_used,
+            models.Game.created_at,
+            last_guess.c.guess.label("last_guess"),
+            last_guess.c.created_at.label("last_guess_time"),
         )
-        
-        game_info = {
-            "game_id": game.id,
-            "digits": game.digits,
-            "status": game.status,
-            "attempts_used": game.attempts_used,
-            "created_at": game.created_at,
-            "last_guess": last_guess.guess if last_guess else None,
-            "last_guess_time": last_guess.created_at if last_guess else None
+        .outerjoin(last_guess, true())
+        .where(models.Game.user_id == user_id)
+        .order_by(models.Game.created_at.desc(), models.Game.id.desc())
+        # 다음 페이지 존재 여부 확인을 위해 하나 더 조회
+        .limit(limit + 1)
+    )
+    
+    if cursor:
+        cursor_created_at, cursor_id = decode_history_cursor(cursor)
+        query = query.where(
+            tuple_(models.Game.created_at, models.Game.id) < tuple_(cursor_created_at, cursor_id)
+        )
+    
+    return query
+
+def _build_history_page(user_row, rows, limit: int):
+    """조회 결과를 히스토리 응답 형태로 변환합니다."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    games = [
+        {
+            "game_id": row.id,
+            "digits": row.digits,
+            "status": row.status,
+            "attempts_used": row.attempts_used,
+            "created_at": row.created_at,
+            "last_guess": row.last_guess,
+            "last_guess_time": row.last_guess_time
         }
-        game_history.append(game_info)
+        for row in rows
+    ]
+    
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_history_cursor(rows[-1].created_at, rows[-1].id)
     
     return {
-        "username": user.username,
-        "total_games": len(games),
-        "games": game_history
+        "username": user_row.username,
+        "total_games": user_row.total_games,
+        "games": games,
+        "next_cursor": next_cursor
     }
 
 """
@@ -160,6 +245,10 @@ def get_game_detail_history(db: Session, user_id: int, game_id: int):
         .all()
     )
     
+    return _build_game_detail(game, guesses)
+
+def _build_game_detail(game, guesses):
+    """게임 상세 히스토리를 구성합니다."""
     guess_history = []
     for guess in guesses:
         guess_info = {
@@ -214,19 +303,210 @@ def create_social_user(db: Session, user: schemas.SocialUserCreate):
     Returns:
         생성된 사용자
     """
-    # 랜덤한 비밀번호 생성 (32자)
-    random_password = ''.join(random.choices(string.ascii_letters + string.digits, k=32))
-    hashed_password = get_password_hash(random_password)
-    
-    db_user = models.User(
+    db_user = _new_social_user_model(user, get_password_hash(_random_password()))
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    return db_user
+
+def _random_password():
+    """소셜 로그인 사용자용 랜덤 비밀번호 (32자)"""
+    return ''.join(random.choices(string.ascii_letters + string.digits, k=32))
+
+def _new_social_user_model(user: schemas.SocialUserCreate, hashed_password: str):
+    """소셜 로그인 User 모델 객체를 생성합니다. (DB 접근 없음)"""
+    return models.User(
         username=user.username,
         email=user.email,
         social_id=user.social_id,
         social_type=user.social_type,
         hashed_password=hashed_password,
         is_active=True
+    ) 
+
+
+# ---------------------------------------------------------------------------
+# 비동기 버전 (AsyncSession 사용)
+# ---------------------------------------------------------------------------
+
+async def get_user_async(db: AsyncSession, user_id: int):
+    return await db.get(models.User, user_id)
+
+async def get_user_by_username_async(db: AsyncSession, username: str):
+    result = await db.execute(select(models.User).where(models.User.username == username))
+    return result.scalars().first()
+
+async def get_user_by_email_async(db: AsyncSession, email: str):
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    return result.scalars().first()
+
+async def get_user_by_social_id_async(db: AsyncSession, social_id: str, social_type: str):
+    result = await db.execute(
+        select(models.User).where(
+            models.User.social_id == social_id,
+            models.User.social_type == social_type
+        )
+    )
+    return result.scalars().first()
+
+async def create_user_async(db: AsyncSession, user: schemas.UserCreate):
+    """
+    새 사용자 생성 (비동기)
+    
+    INSERT ... ON CONFLICT DO NOTHING RETURNING 한 번으로 생성하고, 중복은 unique 제약으로 판단합니다.
+    동시에 같은 이메일/사용자명으로 가입해도 하나만 생성됩니다.
+    """
+    # 해싱은 전용 실행기에서 (이벤트 루프를 막지 않음)
+    hashed_password = await hash_password_async(user.password)
+    stmt = _insert_user(db).values(**_user_values(user, hashed_password))
+    db_user = (await db.scalars(stmt.on_conflict_do_nothing().returning(models.User))).first()
+    if db_user is None:
+        await db.rollback()
+        email_taken = (await db.execute(_duplicate_email_query(user))).scalar()
+        _raise_duplicate_user(email_taken)
+    await db.commit()
+    invalidate_identity(db_user.id)
+    return db_user
+
+async def upsert_social_user_async(db: AsyncSession, user: schemas.SocialUserCreate, email_verified: bool = False):
+    """
+    소셜 로그인 사용자를 조회하거나 생성합니다. (비동기)
+    
+    1. (social_type, social_id) 로 가입된 사용자가 있으면 그대로 반환 (재로그인)
+    2. 없으면 INSERT ... ON CONFLICT DO NOTHING RETURNING 으로 생성 (비밀번호 없음)
+    3. 생성되지 않았으면 어느 unique 제약과 충돌했는지 확인
+       - 소셜 키: 동시에 처음 로그인한 요청이 먼저 생성한 것이므로 그 사용자 반환
+       - 이메일: 소셜 정보가 없는 계정이고 소셜 서비스가 이메일을 확인한 경우에만 연결, 아니면 409
+         (다른 소셜 계정으로 바꾸거나, 확인되지 않은 이메일로 기존 계정을 가져가지 않도록)
+       - 사용자명: 소셜 ID 를 붙인 사용자명으로 한 번 더 시도
+    
+    Args:
+        email_verified: 소셜 서비스가 이메일 소유를 확인했는지 여부
+    """
+    User = models.User
+    existing = await get_user_by_social_id_async(db, user.social_id, user.social_type)
+    if existing is not None:
+        return existing
+    
+    for username in (user.username, f"{user.username}_{user.social_id}"):
+        stmt = _insert_user(db).values(
+            username=username,
+            email=user.email,
+            social_id=user.social_id,
+            social_type=user.social_type,
+            hashed_password=None,
+            is_active=True,
+            created_at=utcnow(),
+        )
+        db_user = (await db.scalars(stmt.on_conflict_do_nothing().returning(User))).first()
+        if db_user is not None:
+            await db.commit()
+            invalidate_identity(db_user.id)
+            return db_user
+        await db.rollback()
+        
+        # 소셜 키 충돌: 동시에 처음 로그인한 요청이 먼저 생성
+        existing = await get_user_by_social_id_async(db, user.social_id, user.social_type)
+        if existing is not None:
+            return existing
+        
+        # 이메일 충돌: 확인된 이메일이고 소셜 정보가 없는 계정에만 연결
+        account = await get_user_by_email_async(db, user.email)
+        if account is not None:
+            return await _link_social_account_async(db, account, user, email_verified)
+        # 사용자명 충돌: 다음 사용자명으로 재시도
+    
+    raise HTTPException(status_code=409, detail="사용자를 생성할 수 없습니다. 다시 시도해주세요.")
+
+async def _link_social_account_async(db: AsyncSession, account, user: schemas.SocialUserCreate, email_verified: bool):
+    """같은 이메일의 기존 계정에 소셜 정보를 연결합니다. (소셜 정보가 이미 있는 계정은 바꾸지 않음)"""
+    if not email_verified or account.social_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 가입된 이메일입니다. 기존 계정으로 로그인해주세요.",
+        )
+    User = models.User
+    stmt = (
+        update(User)
+        .where(User.id == account.id, User.social_id.is_(None))
+        .values(social_id=user.social_id, social_type=user.social_type)
+        .returning(User)
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
+    try:
+        linked = (await db.scalars(stmt)).first()
+    except IntegrityError:
+        # 같은 소셜 키로 동시에 다른 계정이 만들어진 경우
+        await db.rollback()
+        linked = None
+    if linked is None:
+        await db.rollback()
+        existing = await get_user_by_social_id_async(db, user.social_id, user.social_type)
+        if existing is not None:
+            return existing
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 가입된 이메일입니다. 기존 계정으로 로그인해주세요.",
+        )
+    await db.commit()
+    invalidate_identity(linked.id)
+    return linked
+
+async def create_social_user_async(db: AsyncSession, user: schemas.SocialUserCreate):
+    """
+    소셜 로그인으로 새 사용자를 생성합니다. (비동기)
+    """
+    db_user = _new_social_user_model(user, await hash_password_async(_random_password()))
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user 
\ No newline at end of file
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    """
+    사용자 인증 (비동기)
+    """
+    user = await get_user_by_email_async(db, email)
+    # 소셜 로그인으로만 가입한 사용자는 비밀번호가 없음
+    if not user or not user.hashed_password:
+        return False
+    if not await verify_password_async(password, user.hashed_password):
+        return False
+    return user
+
+async def get_user_game_history_async(db: AsyncSession, user_id: int, limit: int = HISTORY_PAGE_SIZE, cursor: str | None = None):
+    """
+    사용자의 게임 히스토리 조회 (비동기, 키셋 페이지네이션)
+    """
+    row = (await db.execute(_history_user_query(user_id, with_total=cursor is None))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
+    
+    rows = (await db.execute(_history_page_query(user_id, limit, cursor))).all()
+    return _build_history_page(row, rows, limit)
+
+async def get_game_detail_history_async(db: AsyncSession, user_id: int, game_id: int):
+    """
+    특정 게임의 상세 히스토리 조회 (비동기)
+    """
+    user = await db.get(models.User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
+    
+    result = await db.execute(
+        select(models.Game).where(
+            models.Game.id == game_id,
+            models.Game.user_id == user_id
+        )
+    )
+    game = result.scalars().first()
+    if not game:
+        raise HTTPException(status_code=404, detail="게임을 찾을 수 없거나 접근 권한이 없습니다")
+    
+    guesses = await db.execute(
+        select(models.Guess)
+        .where(models.Guess.game_id == game_id)
+        .order_by(models.Guess.created_at.asc())
+    )
+    
+    return _build_game_detail(game, guesses.scalars().all())
@@ -1,18 +1,23 @@
 # app/database.py
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
-from dotenv import load_dotenv
 import logging
+import itertools
+import time
+from datetime import datetime, UTC
+from fastapi import Request
+from . import config  # .env 로드
+from . import metrics
+from .db_pool import (
+    InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_engine,
+    PRE_PING_ALWAYS, PRE_PING_IDLE, PRE_PING_NEVER
+)
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# .env 파일 다시 로드 (적용 확인)
-load_dotenv(override=True)
-
 # 데이터베이스 URL 직접 설정 - .env 파일에서 가져오기
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -32,17 +37,45 @@ try:
 except Exception as e:
     logger.error(f"데이터베이스 연결 정보 파싱 오류: {str(e)}")
 
+# 커넥션 풀 설정 (.env 에서 조정 가능)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 체크아웃 대기 한도(초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 커넥션 최대 수명(초), -1 이면 비활성화
+# 사전 ping 정책: always(매 체크아웃), idle(유휴 시간이 임계값 이상일 때만), never
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", PRE_PING_IDLE).lower()
+DB_POOL_PRE_PING_IDLE_SECONDS = float(os.getenv("DB_POOL_PRE_PING_IDLE_SECONDS", "30"))
+
+if DB_POOL_PRE_PING not in (PRE_PING_ALWAYS, PRE_PING_IDLE, PRE_PING_NEVER):
+    logger.warning(f"알 수 없는 DB_POOL_PRE_PING 값({DB_POOL_PRE_PING}), idle 정책을 사용합니다.")
+    DB_POOL_PRE_PING = PRE_PING_IDLE
+
+def pool_options(name: str) -> dict:
+    """
+    create_engine/create_async_engine 에 전달할 공통 풀 옵션
+    """
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING == PRE_PING_ALWAYS,
+        "pool_logging_name": name,
+    }
+
 try:
     # SQLAlchemy 1.4 이상 버전에 맞는 옵션 추가
     engine = create_engine(
         DATABASE_URL,
         echo=False,  # SQL 쿼리 로깅 비활성화
-        pool_pre_ping=True,  # 연결 확인
+        poolclass=InstrumentedQueuePool,
         connect_args={
             # 필요한 경우 추가 연결 옵션 설정
             # "sslmode": "require"  # SSL 필요 (Supabase)
-        }
+        },
+        **pool_options("primary")
     )
+    instrument_engine(engine, "primary", DB_POOL_PRE_PING, DB_POOL_PRE_PING_IDLE_SECONDS)
     logger.info("데이터베이스 엔진 생성 성공")
 except Exception as e:
     logger.error(f"데이터베이스 엔진 생성 실패: {str(e)}")
@@ -51,12 +84,165 @@ except Exception as e:
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def utcnow() -> datetime:
+    """
+    DB 에 저장하는 현재 시각 (timezone 정보 없는 UTC)
+
+    컬럼이 timezone 없는 DateTime 이므로 aware 값을 넘기면 asyncpg 가 인코딩하지 못합니다.
+    모델 기본값/onupdate 와 직접 대입하는 시각은 모두 이 함수를 사용합니다.
+    """
+    return datetime.now(UTC).replace(tzinfo=None)
+
+def to_async_url(url: str) -> str:
+    """
+    동기 드라이버 URL을 asyncpg 드라이버 URL로 변환합니다.
+    (예: postgresql://... -> postgresql+asyncpg://...)
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+# 비동기 데이터베이스 URL - 별도 지정이 없으면 DATABASE_URL에서 변환
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+try:
+    # asyncpg 기반 비동기 엔진 (라우터에서 사용)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        **pool_options("primary_async")
+    )
+    instrument_engine(async_engine.sync_engine, "primary_async", DB_POOL_PRE_PING, DB_POOL_PRE_PING_IDLE_SECONDS)
+    logger.info("비동기 데이터베이스 엔진 생성 성공")
+except Exception as e:
+    logger.error(f"비동기 데이터베이스 엔진 생성 실패: {str(e)}")
+    raise
+
+# expire_on_commit=False: 커밋 후 속성 접근 시 추가 SELECT(및 이벤트 루프 밖 I/O)가 발생하지 않도록 함
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# 읽기 전용 복제본 설정 (쉼표로 구분된 URL 목록, 비워두면 모든 읽기를 primary 에서 처리)
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# 복제본 선택 방식: round_robin | least_loaded (체크아웃된 커넥션이 가장 적은 복제본)
+REPLICA_ROUTING = os.getenv("REPLICA_ROUTING", "round_robin").lower()
+# 쓰기 직후 같은 자원의 읽기를 primary 로 보내는 시간(초) - 복제 지연으로 인한 오래된 읽기 방지
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+# 클라이언트가 이 헤더를 "primary" 로 보내면 항상 primary 에서 읽음
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+replica_engines = []
+for index, replica_url in enumerate(DATABASE_REPLICA_URLS):
+    replica_name = f"replica_{index}_async"
+    replica_engine = create_async_engine(
+        to_async_url(replica_url),
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        **pool_options(replica_name)
+    )
+    instrument_engine(replica_engine.sync_engine, replica_name, DB_POOL_PRE_PING, DB_POOL_PRE_PING_IDLE_SECONDS)
+    replica_engines.append(replica_engine)
+
+if replica_engines:
+    logger.info(f"읽기 복제본 {len(replica_engines)}개 사용 (라우팅: {REPLICA_ROUTING})")
+
+ReplicaSessionLocals = [
+    async_sessionmaker(bind=replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    for replica_engine in replica_engines
+]
+
+class ReadRouter:
+    """
+    읽기 요청을 복제본으로 분배하고, 최근 쓰기가 있었던 자원은 primary 로 보냅니다.
+
+    최근 쓰기 기록은 프로세스 메모리에 저장되므로 같은 워커로 들어온 요청에만 적용됩니다.
+    다른 워커에서도 최신 데이터가 필요하면 클라이언트가 X-Read-Consistency: primary 헤더를 보냅니다.
+    """
+    def __init__(self, session_makers, strategy: str, sticky_seconds: float):
+        self.session_makers = session_makers
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self._counter = itertools.count()
+        self._recent_writes = {}
+        self.stats = {"primary_reads": 0, "replica_reads": 0, "read_your_writes": 0}
+
+    def mark_written(self, *keys: str):
+        """
+        쓰기가 발생한 자원을 기록합니다. (예: "/tetris/12", "user:3")
+        """
+        if not self.session_makers:
+            return
+        now = time.monotonic()
+        if len(self._recent_writes) > 10000:
+            self._recent_writes = {k: t for k, t in self._recent_writes.items() if t > now}
+        deadline = now + self.sticky_seconds
+        for key in keys:
+            self._recent_writes[key] = deadline
+
+    def _recently_written(self, key: str) -> bool:
+        deadline = self._recent_writes.get(key)
+        return deadline is not None and deadline > time.monotonic()
+
+    def _pick_replica(self):
+        if self.strategy == "least_loaded":
+            index = min(
+                range(len(replica_engines)),
+                key=lambda i: replica_engines[i].sync_engine.pool.checkedout(),
+            )
+        else:
+            index = next(self._counter) % len(self.session_makers)
+        return self.session_makers[index]
+
+    def session_maker_for(self, request: Request):
+        """
+        요청에 사용할 세션 팩토리를 선택합니다.
+        """
+        if not self.session_makers:
+            self.stats["primary_reads"] += 1
+            return AsyncSessionLocal
+
+        if request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+            self.stats["primary_reads"] += 1
+            return AsyncSessionLocal
+
+        keys = [request.url.path]
+        user = getattr(request.state, "user", None)
+        if user:
+            keys.append(f"user:{user['id']}")
+        if any(self._recently_written(key) for key in keys):
+            self.stats["read_your_writes"] += 1
+            self.stats["primary_reads"] += 1
+            return AsyncSessionLocal
+
+        self.stats["replica_reads"] += 1
+        return self._pick_replica()
+
+read_router = ReadRouter(ReplicaSessionLocals, REPLICA_ROUTING, READ_YOUR_WRITES_SECONDS)
+metrics.register("db_read_routing", lambda: dict(read_router.stats, replicas=len(ReplicaSessionLocals)))
+
+def mark_written(request: Request, *keys: str):
+    """
+    쓰기 요청 처리 후 호출하여, 이어지는 같은 자원/사용자의 읽기가 primary 로 가도록 합니다.
+    """
+    user = getattr(request.state, "user", None)
+    if user:
+        keys = keys + (f"user:{user['id']}",)
+    read_router.mark_written(*keys)
+
 def init_db():
+    # 스키마는 마이그레이션이 관리함 (app/migrations)
+    from .migrations import upgrade
     try:
-        Base.metadata.create_all(bind=engine)
-        logger.info("데이터베이스 테이블 생성 완료")
+        upgrade(engine)
+        logger.info("데이터베이스 마이그레이션 완료")
     except Exception as e:
-        logger.error(f"데이터베이스 테이블 생성 실패: {str(e)}")
+        logger.error(f"데이터베이스 마이그레이션 실패: {str(e)}")
         raise
     
 def get_db():
@@ -68,6 +254,24 @@ def get_db():
         db.close()
         logger.debug("데이터베이스 세션 종료")
 
+async def get_async_db():
+    """
+    비동기 데이터베이스 세션 의존성 함수
+    DB 대기 중에 스레드풀 스레드를 점유하지 않습니다.
+    """
+    async with AsyncSessionLocal() as db:
+        logger.debug("비동기 데이터베이스 세션 생성")
+        yield db
+        logger.debug("비동기 데이터베이스 세션 종료")
+
+async def get_read_db(request: Request):
+    """
+    읽기 전용 비동기 세션 의존성 함수
+    복제본이 설정되어 있으면 복제본에서, 최근 쓰기가 있었던 자원이면 primary 에서 읽습니다.
+    """
+    async with read_router.session_maker_for(request)() as db:
+        yield db
+
 # 애플리케이션 시작시 데이터베이스 테이블 생성 가능 여부 테스트
 def test_connection():
     try:
@@ -0,0 +1,145 @@
+# app/db_pool.py
+"""
+관측 가능한 커넥션 풀
+
+- 체크아웃 대기 시간 히스토그램, 타임아웃 횟수 수집
+- 유휴 시간이 임계값을 넘은 커넥션만 체크아웃 시 ping 으로 검증
+  (pool_pre_ping=True 처럼 매 체크아웃마다 왕복하지 않음)
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# 체크아웃 대기 시간 버킷 (ms)
+WAIT_TIME_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# 사전 ping 정책
+PRE_PING_ALWAYS = "always"  # 매 체크아웃마다 검증 (SQLAlchemy pool_pre_ping)
+PRE_PING_IDLE = "idle"      # 임계값 이상 유휴 상태였던 커넥션만 검증
+PRE_PING_NEVER = "never"    # 검증하지 않음
+
+class PoolMetrics:
+    """
+    풀 하나에 대한 메트릭 (checkout/timeout/ping 카운터와 대기 시간 히스토그램)
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.wait_time_ms = metrics.Histogram(WAIT_TIME_BUCKETS_MS)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.stale_connections = 0
+        self._lock = threading.Lock()
+
+    def incr(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        data = {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "pings": self.pings,
+            "stale_connections": self.stale_connections,
+            "wait_time_ms": self.wait_time_ms.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+        return data
+
+# 풀 logging_name -> 메트릭 (풀이 recreate 되어도 같은 이름을 유지하므로 메트릭이 이어짐)
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    if name not in _pool_metrics:
+        _pool_metrics[name] = PoolMetrics(name)
+    return _pool_metrics[name]
+
+def pool_metrics_snapshot() -> Dict[str, Any]:
+    return {name: m.snapshot() for name, m in _pool_metrics.items()}
+
+metrics.register("db_pool", pool_metrics_snapshot)
+
+class _InstrumentedPoolMixin:
+    """
+    QueuePool 계열에 체크아웃 대기 시간/타임아웃 측정을 추가합니다.
+    """
+    def _do_get(self):
+        pool_metrics = get_pool_metrics(self._orig_logging_name)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.incr("timeouts")
+            raise
+        finally:
+            pool_metrics.wait_time_ms.observe((time.perf_counter() - start) * 1000)
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def instrument_engine(engine, name: str, pre_ping: str = PRE_PING_IDLE, pre_ping_idle_seconds: float = 30.0):
+    """
+    엔진의 풀에 메트릭 수집과 유휴 기반 사전 ping 을 연결합니다.
+
+    Args:
+        engine: 동기 Engine (AsyncEngine 의 경우 .sync_engine 전달)
+        name: 풀 이름 (create_engine 의 pool_logging_name 과 같아야 함)
+        pre_ping: 사전 ping 정책 ("always" 는 create_engine(pool_pre_ping=True) 로 처리)
+        pre_ping_idle_seconds: idle 정책에서 검증을 수행할 최소 유휴 시간(초)
+    """
+    pool_metrics = get_pool_metrics(name)
+    pool_metrics.pool = engine.pool
+    dialect = engine.dialect
+
+    @event.listens_for(engine, "engine_connect")
+    def _track_pool(connection):
+        # dispose() 등으로 풀이 교체된 경우 최신 풀을 가리키도록 갱신
+        pool_metrics.pool = engine.pool
+
+    @event.listens_for(engine.pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine.pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(engine.pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.incr("checkouts")
+        if pre_ping != PRE_PING_IDLE:
+            return
+
+        last_used = connection_record.info.get("last_used")
+        if last_used is None or time.monotonic() - last_used < pre_ping_idle_seconds:
+            return
+
+        pool_metrics.incr("pings")
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # DisconnectionError 를 던지면 풀이 커넥션을 폐기하고 새 커넥션으로 재시도함
+            pool_metrics.incr("stale_connections")
+            logger.warning(f"유휴 커넥션 검증 실패, 재연결합니다: {str(e)}")
+            raise exc.DisconnectionError() from e
@@ -1,41 +1,40 @@
 # app/main.py
 import os
-from fastapi import FastAPI, Request, Response
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
+from . import config  # .env 로드
 from .database import Base, engine, test_connection
 from .routers import game, auth, tetris
-from .middleware.auth import auth_middleware
-from dotenv import load_dotenv
-import time
+from .middleware.auth import AuthMiddleware
+from .middleware.routes import public, compile_routes
+from . import metrics, startup
 import logging
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# /metrics 노출 여부 (켜도 로그인한 사용자만 조회 가능)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
 
-# 데이터베이스 연결 테스트
-logger.info("애플리케이션 시작: 데이터베이스 연결 테스트 중...")
-db_connected = test_connection()
-if not db_connected:
-    logger.warning("데이터베이스 연결에 실패했습니다. 일부 기능이 작동하지 않을 수 있습니다.")
-else:
-    logger.info("데이터베이스 연결이 정상적으로 확인되었습니다.")
-
-try:
-    # DB 테이블 생성
-    logger.info("데이터베이스 테이블 생성 중...")
-    Base.metadata.create_all(bind=engine)
-    logger.info("데이터베이스 테이블 생성 완료")
-except Exception as e:
-    logger.error(f"데이터베이스 테이블 생성 실패: {str(e)}")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    DB 연결 확인, 마이그레이션, 워밍업은 import 시점이 아닌 서버 시작 시 실행
+    라우트 인증 정책도 모든 라우터가 등록된 뒤인 이 시점에 컴파일
+    """
+    compile_routes(app)
+    await startup.startup()
+    yield
+    await startup.shutdown()
 
 app = FastAPI(
     title="Baseball Score API",
     description="숫자 야구 게임과 테트리스 게임을 위한 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정을 .env에서 가져오기
@@ -48,45 +47,26 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["Content-Type", "Authorization", "Accept", "X-Requested-With", "Set-Cookie"],
-    expose_headers=["Authorization", "Set-Cookie"],
+    allow_headers=["Content-Type", "Authorization", "Accept", "X-Requested-With", "Set-Cookie", "X-Read-Consistency", "If-None-Match"],
+    expose_headers=["Authorization", "Set-Cookie", "ETag"],
     max_age=3600,  # preflight 요청 캐싱 시간(초)
 )
 
-# 미들웨어 등록
-app.middleware("http")(auth_middleware)
+# 인증 + 처리 시간 미들웨어 등록 (CORS 바깥, 순수 ASGI)
+app.add_middleware(AuthMiddleware)
 
 # 라우터 등록
 app.include_router(auth.router, tags=["auth"], prefix="/auth")
 app.include_router(game.router, tags=["games"])
 app.include_router(tetris.router, tags=["tetris"])
 
-# 카카오 OAuth 설정 확인
-if not os.getenv("KAKAO_CLIENT_ID"):
-    logger.warning("KAKAO_CLIENT_ID가 설정되지 않았습니다. 카카오 로그인이 작동하지 않을 수 있습니다.")
-
-# 미들웨어 설정
-@app.middleware("http")
-async def token_refresh_middleware(request: Request, call_next):
-    """
-    액세스 토큰이 만료된 경우 리프레시 토큰을 사용하여 자동으로 갱신하는 미들웨어
-    """
-    start_time = time.time()
-    
-    # 요청 처리
-    response = await call_next(request)
-    
-    # 처리 시간 계산
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    return response
-
 @app.get("/")
+@public
 def read_root():
     return {"message": "Baseball Score API에 오신 것을 환영합니다!"}
 
 @app.get("/health")
+@public
 def health_check():
     # 데이터베이스 연결 상태 확인
     db_status = "connected" if test_connection() else "disconnected"
@@ -95,4 +75,15 @@ def health_check():
         "message": "서버가 정상적으로 실행 중입니다.",
         "database": db_status,
         "environment": os.getenv("ENVIRONMENT", "development")
-    }
\ No newline at end of file
+    }
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    프로세스 메트릭 조회 (커넥션 풀 사용량, 체크아웃 대기 시간, 타임아웃 등)
+
+    내부 상태가 드러나므로 METRICS_ENABLED=true 일 때만 열고, 인증이 필요합니다.
+    """
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return metrics.snapshot()
\ No newline at end of file
@@ -0,0 +1,56 @@
+# app/metrics.py
+"""
+프로세스 내 메트릭 레지스트리
+
+각 하위 시스템(커넥션 풀, 캐시 등)은 register()로 스냅샷 함수를 등록하고,
+/metrics 엔드포인트는 snapshot()으로 등록된 모든 값을 한 번에 반환합니다.
+"""
+import bisect
+import threading
+from typing import Any, Callable, Dict, List
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+def register(name: str, provider: Callable[[], Dict[str, Any]]):
+    """
+    메트릭 스냅샷 함수를 등록합니다. 같은 이름으로 다시 등록하면 교체됩니다.
+    """
+    _providers[name] = provider
+
+def snapshot() -> Dict[str, Any]:
+    """
+    등록된 모든 메트릭의 현재 값을 반환합니다.
+    """
+    return {name: provider() for name, provider in _providers.items()}
+
+class Histogram:
+    """
+    고정 버킷 히스토그램 (누적이 아닌 버킷별 개수)
+
+    Args:
+        buckets: 오름차순 버킷 상한값 목록. 마지막 상한을 넘는 값은 "+Inf" 버킷에 들어갑니다.
+    """
+    def __init__(self, buckets: List[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.counts)
+            total, value_sum = self.count, self.sum
+        labels = [f"le_{bound:g}" for bound in self.buckets] + ["le_+Inf"]
+        return {
+            "buckets": dict(zip(labels, counts)),
+            "count": total,
+            "sum": round(value_sum, 3),
+        }
@@ -1,166 +1,187 @@
-from fastapi import Request, HTTPException, status
+"""
+인증 미들웨어 (순수 ASGI)
+
+@app.middleware("http") 방식(BaseHTTPMiddleware)은 요청마다 call_next 태스크를 만들고
+응답 본문을 스트림으로 다시 감싸 전달하므로, 미들웨어 하나당 요청 처리 비용이 추가됩니다.
+이 미들웨어는 ASGI 호출을 그대로 넘기고 응답 시작 메시지(http.response.start)에만 헤더를 추가합니다.
+
+- 처리 시간: X-Process-Time (초, 응답 시작까지)
+- 인증: 라우트 정책(app/middleware/routes.py)에 따라 토큰 검증, request.state.user 설정
+- 토큰 갱신: 만료된 액세스 토큰은 리프레시 토큰으로 새로 발급해 Authorization 응답 헤더로 전달
+"""
+import time
+from typing import List, Optional, Tuple
+
+from fastapi import status
 from fastapi.responses import JSONResponse
-from jose import JWTError, jwt, ExpiredSignatureError
-from ..auth.utils import SECRET_KEY, ALGORITHM, create_access_token
-from ..database import get_db, SessionLocal
-from .. import models
-import re
-from datetime import datetime, UTC
-import os
-
-# 인증이 필요하지 않은 경로 패턴
-PUBLIC_PATHS = [
-    "/docs",
-    "/redoc",
-    "/openapi.json",
-    "/",
-    "/health",
-    "/auth/login",
-    "/auth/signup",
-    "/auth/refresh",
-    "/auth/logout",
-    "/auth/kakao",  # 카카오 로그인 엔드포인트 추가
-    "/auth/kakao/callback",  # 카카오 로그인 콜백 엔드포인트 추가
-    "/game/new",
-    "/tetris/new"
-]
-
-# 선택적 인증 경로 패턴 (로그인 없이도 접근 가능하지만, 로그인 정보가 있으면 활용)
-OPTIONAL_AUTH_PATHS = [
-    r"^/games$",
-    r"^/games/\d+$",
-    r"^/games/\d+/guesses$",
-    r"^/tetris$",                  # 테트리스 게임 생성
-    r"^/tetris/\d+$",              # 테트리스 게임 상태 조회
-    r"^/tetris/\d+/moves$",        # 테트리스 게임 이동
-    r"^/tetris/\d+/pause$",        # 테트리스 게임 일시정지/재개
-    r"^/tetris/leaderboard$",      # 테트리스 리더보드
-]
-
-async def auth_middleware(request: Request, call_next):
+from jose import JWTError, ExpiredSignatureError
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..auth.utils import create_access_token
+from ..auth.token_cache import token_cache
+from ..auth.identity import get_identity_async
+from ..auth.revocation import is_revoked
+from ..database import AsyncSessionLocal
+from .routes import get_classifier, PUBLIC, OPTIONAL
+import logging
+
+logger = logging.getLogger(__name__)
+
+async def _identity_from_refresh_token(refresh_token: str):
+    """
+    리프레시 토큰이 유효하고 토큰의 사용자가 존재하면 사용자 식별 정보를 반환합니다.
+
+    사용자 확인은 비동기 세션으로 조회하며(이벤트 루프를 막지 않음), 최근 확인한 사용자는 캐시를 사용합니다.
     """
-    모든 HTTP 요청에 대해 인증을 처리하는 미들웨어
-    
-    1. 공개 경로는 인증 없이 통과
+    try:
+        refresh_payload = token_cache.decode(refresh_token)
+    except (JWTError, ValueError):
+        return None
+    if is_revoked(refresh_payload):
+        return None
+
+    refresh_email = refresh_payload.get("sub")
+    refresh_user_id = refresh_payload.get("id") or refresh_payload.get("user_id")  # id 또는 user_id 키 모두 확인
+    if not refresh_email or not refresh_user_id:
+        return None
+
+    try:
+        async with AsyncSessionLocal() as db:
+            identity = await get_identity_async(db, refresh_user_id)
+    except Exception as e:
+        logger.error(f"토큰 갱신 중 사용자 조회 실패: {str(e)}")
+        return None
+
+    if identity is None or not identity.is_active or identity.email != refresh_email:
+        return None
+    return identity
+
+def _request_tokens(scope: Scope) -> Tuple[Optional[str], Optional[str]]:
+    """
+    요청 헤더에서 (액세스 토큰, 리프레시 토큰)을 추출합니다.
+    액세스 토큰은 Authorization 헤더 우선, 없으면 쿠키. 리프레시 토큰은 쿠키에서만.
+    """
+    authorization = None
+    cookie_header = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            authorization = value.decode("latin-1")
+        elif name == b"cookie":
+            cookie_header = value.decode("latin-1")
+
+    # request.cookies 와 같은 파서
+    cookies = cookie_parser(cookie_header) if cookie_header else {}
+    access_token = None
+    if authorization and authorization.startswith("Bearer "):
+        access_token = authorization.replace("Bearer ", "")
+    if not access_token:
+        access_token = cookies.get("access_token")
+    return access_token, cookies.get("refresh_token")
+
+def _unauthorized(detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        content={"detail": detail},
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def authenticate(scope: Scope, response_headers: List[Tuple[bytes, bytes]]) -> Optional[JSONResponse]:
+    """
+    요청 하나의 인증을 처리합니다.
+
+    1. 공개 경로는 인증 없이 통과 (정책은 각 라우트에 @public / @optional_auth 로 선언)
     2. 선택적 인증 경로는 토큰이 없어도 통과하지만, 있으면 사용자 정보 설정
     3. 그 외 경로는 유효한 토큰이 필요
-    4. 액세스 토큰이 만료된 경우 리프레시 토큰으로 자동 갱신
+    4. 액세스 토큰이 만료된 경우 리프레시 토큰으로 자동 갱신 (새 토큰은 response_headers 에 추가)
+    5. 폐기된(로그아웃한) 토큰은 유효하지 않은 토큰으로 처리
+
+    Returns:
+        요청을 거절할 때 보낼 응답, 통과하면 None
     """
     # OPTIONS 요청은 항상 통과시킴
-    if request.method == "OPTIONS":
-        return await call_next(request)
-    
-    # 요청 경로 확인
-    path = request.url.path
-    
+    if scope["method"] == "OPTIONS":
+        return None
+
+    # 라우트에 선언된 인증 정책 확인 (app/middleware/routes.py)
+    policy = get_classifier(scope["app"]).classify(scope["path"])
+
     # 공개 경로는 인증 없이 통과
-    if any(re.match(pattern, path) for pattern in PUBLIC_PATHS):
-        return await call_next(request)
-    
+    if policy == PUBLIC:
+        return None
+
     # 선택적 인증 경로 확인
-    optional_auth = any(re.match(pattern, path) for pattern in OPTIONAL_AUTH_PATHS)
-    
+    optional_auth = policy == OPTIONAL
+
     # 토큰 추출 (헤더 또는 쿠키에서)
-    access_token = None
-    refresh_token = None
-    
-    # 1. 헤더에서 토큰 추출
-    authorization = request.headers.get("Authorization")
-    if authorization and authorization.startswith("Bearer "):
-        access_token = authorization.replace("Bearer ", "")
-    
-    # 2. 쿠키에서 토큰 추출 (헤더에 없는 경우)
-    if not access_token:
-        access_token = request.cookies.get("access_token")
-    
-    # 리프레시 토큰 추출 (쿠키에서만)
-    refresh_token = request.cookies.get("refresh_token")
-    
-    # 토큰이 없는 경우
+    access_token, refresh_token = _request_tokens(scope)
+
+    # 토큰이 없는 경우: 선택적 인증 경로는 통과, 필수 인증 경로는 401
     if not access_token:
-        if optional_auth:
-            # 선택적 인증 경로는 토큰 없이 통과
-            return await call_next(request)
-        # 필수 인증 경로는 토큰 없으면 401 에러
-        return JSONResponse(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            content={"detail": "인증 정보가 없습니다"},
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+        return None if optional_auth else _unauthorized("인증 정보가 없습니다")
+
+    # request.state (Starlette 는 scope["state"] 를 사용)
+    state = scope.setdefault("state", {})
+
     # 액세스 토큰 검증
     try:
-        # 토큰 디코딩 및 검증
-        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
-        email = payload.get("sub")  # username 대신 email
-        user_id = payload.get("id") or payload.get("user_id")  # id 또는 user_id 키 모두 확인
-        
-        # 토큰에 필요한 정보가 없는 경우
-        if not email or not user_id:
-            if optional_auth:
-                return await call_next(request)
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": "유효하지 않은 토큰입니다"},
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # 요청 상태에 사용자 정보 추가
-        request.state.user = {"email": email, "id": user_id}  # username 대신 email
-        
+        # 토큰 디코딩 및 검증 (이미 검증한 토큰은 캐시된 클레임 사용)
+        payload = token_cache.decode(access_token)
     except ExpiredSignatureError:
         # 액세스 토큰이 만료된 경우, 리프레시 토큰으로 갱신 시도
-        if refresh_token:
-            try:
-                # 리프레시 토큰 검증
-                refresh_payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-                refresh_email = refresh_payload.get("sub")
-                refresh_user_id = refresh_payload.get("id") or refresh_payload.get("user_id")  # id 또는 user_id 키 모두 확인
-                
-                if refresh_email and refresh_user_id:
-                    # 데이터베이스에서 사용자 확인
-                    db = SessionLocal()
-                    try:
-                        user = db.query(models.User).filter(models.User.id == refresh_user_id).first()
-                        if user and user.email == refresh_email:
-                            # 새 액세스 토큰 생성
-                            new_access_token = create_access_token(
-                                data={"sub": user.email, "id": user.id}
-                            )
-                            
-                            # 요청 상태에 사용자 정보 추가
-                            request.state.user = {"email": user.email, "id": user.id}
-                            
-                            # 다음 미들웨어 또는 엔드포인트 호출
-                            response = await call_next(request)
-                            
-                            # 응답 객체에 새 토큰 설정
-                            response.headers["Authorization"] = f"Bearer {new_access_token}"
-                            
-                            return response
-                    finally:
-                        db.close()
-            except:
-                pass
-            
+        identity = await _identity_from_refresh_token(refresh_token) if refresh_token else None
+        if identity is not None:
+            # 새 액세스 토큰 생성, 응답 헤더로 전달
+            new_access_token = create_access_token(
+                data={"sub": identity.email, "id": identity.id}
+            )
+            response_headers.append((b"authorization", f"Bearer {new_access_token}".encode("latin-1")))
+            state["user"] = {"email": identity.email, "id": identity.id}
+            return None
+
         # 리프레시 토큰이 없거나 유효하지 않은 경우
-        if optional_auth:
-            return await call_next(request)
-        return JSONResponse(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            content={"detail": "인증 토큰이 만료되었습니다. 다시 로그인해주세요."},
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-        
+        return None if optional_auth else _unauthorized("인증 토큰이 만료되었습니다. 다시 로그인해주세요.")
     except (JWTError, ValueError):
         # 토큰 파싱 또는 검증 실패
-        if optional_auth:
-            return await call_next(request)
-        return JSONResponse(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            content={"detail": "유효하지 않은 토큰입니다"},
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    # 다음 미들웨어 또는 엔드포인트 호출
-    return await call_next(request) 
\ No newline at end of file
+        return None if optional_auth else _unauthorized("유효하지 않은 토큰입니다")
+
+    email = payload.get("sub")  # username 대신 email
+    user_id = payload.get("id") or payload.get("user_id")  # id 또는 user_id 키 모두 확인
+
+    # 토큰에 필요한 정보가 없거나 폐기된(로그아웃한) 토큰인 경우
+    if not email or not user_id or is_revoked(payload):
+        return None if optional_auth else _unauthorized("유효하지 않은 토큰입니다")
+
+    # 요청 상태에 사용자 정보 추가
+    state["user"] = {"email": email, "id": user_id}  # username 대신 email
+    return None
+
+class AuthMiddleware:
+    """
+    처리 시간 측정, 인증, 응답 헤더 추가를 한 번에 하는 ASGI 미들웨어
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        response_headers: List[Tuple[bytes, bytes]] = []
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    *response_headers,
+                    (b"x-process-time", str(process_time).encode("latin-1")),
+                ]
+            await send(message)
+
+        rejection = await authenticate(scope, response_headers)
+        if rejection is not None:
+            await rejection(scope, receive, send_with_headers)
+            return
+        await self.app(scope, receive, send_with_headers)
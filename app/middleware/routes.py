@@ -0,0 +1,119 @@
+# app/middleware/routes.py
+"""
+라우트별 인증 정책
+
+엔드포인트 함수에 정책을 선언하고, 서버 시작 시 앱의 라우트를 한 번 훑어 조회 구조로 컴파일합니다.
+
+    @router.get("/tetris/{game_id}")
+    @optional_auth
+    async def get_game_status(...): ...
+
+- public: 인증 없이 통과
+- optional: 토큰이 없어도 통과하지만, 있으면 사용자 정보 설정
+- required: 유효한 토큰 필요 (선언하지 않은 라우트의 기본값)
+
+조회는 고정 경로 dict 를 먼저 보고, 없으면 경로 파라미터가 있는 라우트를 합친 정규식 하나로 찾습니다.
+"""
+import logging
+import re
+from typing import Callable, Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+PUBLIC = "public"
+OPTIONAL = "optional"
+REQUIRED = "required"
+# 같은 경로에 정책이 다른 라우트가 있으면 더 엄격한 쪽을 사용
+_STRICTNESS = {PUBLIC: 0, OPTIONAL: 1, REQUIRED: 2}
+
+_PARAM = re.compile(r"\{([^}:]+)(:[^}]+)?\}")
+
+def public(endpoint: Callable) -> Callable:
+    """인증 없이 접근할 수 있는 엔드포인트로 표시합니다."""
+    endpoint.auth_policy = PUBLIC
+    return endpoint
+
+def optional_auth(endpoint: Callable) -> Callable:
+    """토큰이 있으면 사용자 정보를 설정하고, 없어도 접근할 수 있는 엔드포인트로 표시합니다."""
+    endpoint.auth_policy = OPTIONAL
+    return endpoint
+
+def _path_regex(path: str) -> str:
+    """/tetris/{game_id} -> /tetris/[^/]+ ({name:path} 는 .*)"""
+    parts = []
+    last = 0
+    for match in _PARAM.finditer(path):
+        parts.append(re.escape(path[last:match.start()]))
+        parts.append(".*" if match.group(2) == ":path" else "[^/]+")
+        last = match.end()
+    parts.append(re.escape(path[last:]))
+    return "".join(parts)
+
+class RouteClassifier:
+    """
+    경로 -> 인증 정책 조회 구조
+
+    Args:
+        exact: 고정 경로별 정책
+        patterns: (경로 템플릿, 정책) 목록, 라우팅과 같은 순서
+    """
+    def __init__(self, exact: Dict[str, str], patterns: List[tuple]):
+        self.exact = exact
+        self.policies = [policy for _, policy in patterns]
+        # 라우트마다 그룹 하나, 매칭된 그룹 번호로 정책을 찾음
+        self._pattern: Optional[re.Pattern] = (
+            re.compile("(?:" + "|".join(f"({_path_regex(path)})" for path, _ in patterns) + r")\Z")
+            if patterns else None
+        )
+
+    def classify(self, path: str) -> str:
+        policy = self.exact.get(path)
+        if policy is not None:
+            return policy
+        if self._pattern is not None:
+            match = self._pattern.match(path)
+            if match is not None:
+                return self.policies[match.lastindex - 1]
+        return REQUIRED
+
+    @classmethod
+    def from_app(cls, app: FastAPI) -> "RouteClassifier":
+        """앱의 라우트와 문서 경로로 조회 구조를 만듭니다."""
+        declared: Dict[str, str] = {}
+        for url in (app.openapi_url, app.docs_url, app.redoc_url, app.swagger_ui_oauth2_redirect_url):
+            if url:
+                declared[url] = PUBLIC
+
+        for route in app.routes:
+            if not isinstance(route, APIRoute):
+                continue
+            policy = getattr(route.endpoint, "auth_policy", REQUIRED)
+            previous = declared.get(route.path)
+            if previous is not None and previous != policy:
+                logger.warning(f"경로 {route.path} 에 서로 다른 인증 정책이 있어 더 엄격한 정책을 사용합니다")
+                policy = max(previous, policy, key=_STRICTNESS.get)
+            declared[route.path] = policy
+
+        exact = {path: policy for path, policy in declared.items() if "{" not in path}
+        patterns = [(path, policy) for path, policy in declared.items() if "{" in path]
+        return cls(exact, patterns)
+
+def get_classifier(app: FastAPI) -> RouteClassifier:
+    """
+    앱의 조회 구조를 반환합니다. 시작 시 compile_routes 로 만들어 두며, 없으면 이때 만듭니다.
+    """
+    classifier = getattr(app.state, "route_classifier", None)
+    if classifier is None:
+        classifier = compile_routes(app)
+    return classifier
+
+def compile_routes(app: FastAPI) -> RouteClassifier:
+    classifier = RouteClassifier.from_app(app)
+    app.state.route_classifier = classifier
+    logger.info(
+        f"인증 정책 컴파일: 고정 경로 {len(classifier.exact)}개, 파라미터 경로 {len(classifier.policies)}개"
+    )
+    return classifier
@@ -0,0 +1,119 @@
+# app/migrations/__init__.py
+"""
+버전 기반 스키마 마이그레이션
+
+- versions/ 아래의 vNNNN_*.py 모듈이 하나의 마이그레이션
+  (VERSION, DESCRIPTION, upgrade(connection), 선택적으로 TRANSACTIONAL)
+- 적용 이력은 schema_migrations 테이블에 기록
+- PostgreSQL 에서는 advisory lock 으로 여러 워커가 동시에 실행해도 한 번만 적용됨
+
+사용법:
+    python -m app.migrations          # 미적용 마이그레이션 실행
+    python -m app.migrations status   # 적용 상태 확인
+"""
+import importlib
+import logging
+import pkgutil
+from ..database import utcnow
+from types import ModuleType
+from typing import List
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# 마이그레이션 실행을 직렬화하기 위한 advisory lock 키 (임의의 고정값)
+MIGRATION_LOCK_ID = 7_203_114
+
+def load_migrations() -> List[ModuleType]:
+    """
+    versions 패키지의 마이그레이션 모듈을 버전 순으로 반환합니다.
+    """
+    from . import versions
+
+    modules = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        if not info.name.startswith("v"):
+            continue
+        modules.append(importlib.import_module(f"{versions.__name__}.{info.name}"))
+
+    modules.sort(key=lambda m: m.VERSION)
+    seen = set()
+    for module in modules:
+        if module.VERSION in seen:
+            raise RuntimeError(f"중복된 마이그레이션 버전: {module.VERSION}")
+        seen.add(module.VERSION)
+    return modules
+
+def _ensure_version_table(connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " description VARCHAR NOT NULL,"
+        " applied_at TIMESTAMP NOT NULL"
+        ")"
+    ))
+
+def applied_versions(connection) -> set:
+    _ensure_version_table(connection)
+    return {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+def _record(connection, module: ModuleType):
+    connection.execute(
+        text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+        {"v": module.VERSION, "d": module.DESCRIPTION, "t": utcnow()},
+    )
+
+def upgrade(engine) -> List[int]:
+    """
+    미적용 마이그레이션을 순서대로 실행합니다.
+
+    Args:
+        engine: 동기 SQLAlchemy Engine
+
+    Returns:
+        이번에 적용된 버전 목록
+    """
+    is_postgres = engine.dialect.name == "postgresql"
+    applied_now = []
+
+    # advisory lock 은 세션 단위이므로 잠금 전용 커넥션을 끝까지 유지
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock_conn:
+        if is_postgres:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            done = applied_versions(lock_conn)
+            for module in load_migrations():
+                if module.VERSION in done:
+                    continue
+
+                logger.info(f"마이그레이션 적용 중: {module.VERSION} {module.DESCRIPTION}")
+                if getattr(module, "TRANSACTIONAL", True):
+                    with engine.begin() as conn:
+                        module.upgrade(conn)
+                        _record(conn, module)
+                else:
+                    # CREATE INDEX CONCURRENTLY 등 트랜잭션 밖에서 실행해야 하는 DDL
+                    module.upgrade(lock_conn)
+                    _record(lock_conn, module)
+                applied_now.append(module.VERSION)
+        finally:
+            if is_postgres:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+    if applied_now:
+        logger.info(f"마이그레이션 적용 완료: {applied_now}")
+    else:
+        logger.info("적용할 마이그레이션이 없습니다.")
+    return applied_now
+
+def status(engine) -> List[dict]:
+    """
+    각 마이그레이션의 적용 여부를 반환합니다.
+    """
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+    return [
+        {"version": m.VERSION, "description": m.DESCRIPTION, "applied": m.VERSION in done}
+        for m in load_migrations()
+    ]
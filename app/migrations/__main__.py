@@ -0,0 +1,18 @@
+# app/migrations/__main__.py
+import sys
+
+from ..database import engine
+from . import upgrade, status
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+
+    if command == "upgrade":
+        upgrade(engine)
+    elif command == "status":
+        for item in status(engine):
+            mark = "x" if item["applied"] else " "
+            print(f"[{mark}] {item['version']:04d} {item['description']}")
+    else:
+        print("사용법: python -m app.migrations [upgrade|status]")
+        sys.exit(1)
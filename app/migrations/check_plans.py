@@ -0,0 +1,195 @@
+# app/migrations/check_plans.py
+"""
+쿼리 실행 계획 점검 (PostgreSQL 전용)
+
+트랜잭션 안에서 대량의 테스트 데이터를 넣고 app/crud 의 비동기 함수들을 실행하며
+발생한 SELECT 문을 수집한 뒤, 각 쿼리를 EXPLAIN 하여 시드 테이블에 대한
+Seq Scan 이 있으면 보고합니다. 모든 작업은 마지막에 롤백되므로 데이터는 남지 않습니다.
+
+사용법:
+    python -m app.migrations.check_plans [--scale N]
+
+Seq Scan 이 발견되면 종료 코드 1 을 반환합니다.
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from fastapi import HTTPException
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import async_engine
+from .. import crud, schemas
+
+SEEDED_TABLES = {"users", "games", "guesses", "tetris_games", "tetris_moves", "tetris_high_scores"}
+
+SEED_SQL = [
+    """
+    INSERT INTO users (username, email, hashed_password, is_active, created_at, social_id, social_type)
+    SELECT 'plan_user_' || g, 'plan_' || g || '@example.com', 'x', true,
+           now() - (g || ' minutes')::interval,
+           CASE WHEN g % 3 = 0 THEN 'plan_' || g END,
+           CASE WHEN g % 3 = 0 THEN 'kakao' END
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO games (random_number, digits, status, attempts_used, created_at, user_id)
+    SELECT '123', 3,
+           CASE WHEN g % 10 = 0 THEN 'ongoing' WHEN g % 2 = 0 THEN 'win' ELSE 'lose' END,
+           g % 10, now() - (g || ' seconds')::interval,
+           :min_user_id + (g % :users)
+    FROM generate_series(1, :games) g
+    """,
+    """
+    INSERT INTO guesses (game_id, guess, strike, ball, created_at)
+    SELECT :min_game_id + (g % :games), '456', g % 3, g % 2, now() - (g || ' seconds')::interval
+    FROM generate_series(1, :guesses) g
+    """,
+    """
+    INSERT INTO tetris_games (status, score, level, lines_cleared, board_state, current_piece, next_piece,
+                              held_piece, can_hold, created_at, updated_at, ended_at, user_id)
+    SELECT CASE WHEN g % 5 = 0 THEN 'ongoing' ELSE 'game_over' END, g % 50000, 1 + g % 10, g % 200,
+           '[]', NULL, NULL, NULL, true, now() - (g || ' seconds')::interval, now(), now(),
+           :min_user_id + (g % :users)
+    FROM generate_series(1, :tetris_games) g
+    """,
+    """
+    INSERT INTO tetris_moves (game_id, move_type, piece_position, score_after_move, lines_cleared, created_at)
+    SELECT :min_tetris_game_id + (g % :tetris_games), 'left', '[0, 3]', g % 1000, 0, now()
+    FROM generate_series(1, :tetris_moves) g
+    """,
+    """
+    INSERT INTO tetris_high_scores (user_id, score, level, lines_cleared, game_duration, created_at)
+    SELECT :min_user_id + (g % :users), (g * 7919) % 100000, 1 + g % 10, g % 200, g % 3600,
+           now() - (g || ' seconds')::interval
+    FROM generate_series(1, :high_scores) g
+    """,
+]
+
+def _seq_scans(plan: dict):
+    """실행 계획 트리에서 시드 테이블에 대한 Seq Scan 노드를 찾습니다."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in SEEDED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+async def _seed(conn, scale: int) -> dict:
+    sizes = {
+        "users": 2_000 * scale,
+        "games": 50_000 * scale,
+        "guesses": 200_000 * scale,
+        "tetris_games": 20_000 * scale,
+        "tetris_moves": 100_000 * scale,
+        "high_scores": 20_000 * scale,
+    }
+    params = dict(sizes)
+
+    await conn.execute(text(SEED_SQL[0]), params)
+    params["min_user_id"] = (await conn.execute(
+        text("SELECT min(id) FROM users WHERE username LIKE 'plan_user_%'")
+    )).scalar()
+
+    await conn.execute(text(SEED_SQL[1]), params)
+    params["min_game_id"] = (await conn.execute(
+        text("SELECT min(id) FROM games WHERE user_id >= :min_user_id"), params
+    )).scalar()
+
+    await conn.execute(text(SEED_SQL[2]), params)
+    await conn.execute(text(SEED_SQL[3]), params)
+    params["min_tetris_game_id"] = (await conn.execute(
+        text("SELECT min(id) FROM tetris_games WHERE user_id >= :min_user_id"), params
+    )).scalar()
+
+    await conn.execute(text(SEED_SQL[4]), params)
+    await conn.execute(text(SEED_SQL[5]), params)
+
+    for table in sorted(SEEDED_TABLES):
+        await conn.execute(text(f"ANALYZE {table}"))
+    return params
+
+def _scenarios(params: dict):
+    """(이름, 세션을 받아 crud 함수를 실행하는 코루틴 함수) 목록"""
+    user_id = params["min_user_id"]
+    game_id = params["min_game_id"]
+    tetris_game_id = params["min_tetris_game_id"]
+    return [
+        ("user.get_user_by_email_async", lambda db: crud.user.get_user_by_email_async(db, "plan_3@example.com")),
+        ("user.get_user_by_social_id_async", lambda db: crud.user.get_user_by_social_id_async(db, "plan_3", "kakao")),
+        ("user.get_user_game_history_async", lambda db: crud.user.get_user_game_history_async(db, user_id)),
+        ("user.get_game_detail_history_async", lambda db: crud.user.get_game_detail_history_async(db, user_id, game_id)),
+        ("game.get_game_status_async", lambda db: crud.game.get_game_status_async(db, game_id)),
+        ("game.make_guess_async", lambda db: crud.game.make_guess_async(db, game_id, schemas.GuessRequest(guess="789"))),
+        ("tetris.get_game_status_async", lambda db: crud.tetris.get_game_status_async(db, tetris_game_id)),
+        ("tetris.get_leaderboard_async", lambda db: crud.tetris.get_leaderboard_async(db, 10)),
+        ("tetris.get_user_high_scores_async", lambda db: crud.tetris.get_user_high_scores_async(db, user_id, 5)),
+        ("tetris.save_high_score_async", lambda db: crud.tetris.save_high_score_async(db, user_id, 1, 1, 0, 10)),
+        ("leaderboard.get_window_leaderboard_async", lambda db: crud.leaderboard.get_window_leaderboard_async(db, "tetris", "weekly", 10)),
+    ]
+
+async def check(scale: int = 1) -> int:
+    """
+    점검을 실행하고 Seq Scan 이 발견된 쿼리 수를 반환합니다.
+    """
+    captured = []
+    capturing = {"on": False}
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing["on"] and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    findings = 0
+    try:
+        async with async_engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                print(f"테스트 데이터 생성 중 (scale={scale})...")
+                params = await _seed(conn, scale)
+
+                for name, run in _scenarios(params):
+                    captured.clear()
+                    # crud 함수의 commit 은 savepoint 에만 적용되고 마지막에 전체 롤백됨
+                    db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+                    capturing["on"] = True
+                    try:
+                        await run(db)
+                    except HTTPException as e:
+                        print(f"  - {name}: HTTP {e.status_code} {e.detail}")
+                    finally:
+                        capturing["on"] = False
+                        await db.close()
+
+                    for statement, parameters in list(captured):
+                        result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                        plan = result.scalar()
+                        if isinstance(plan, str):
+                            plan = json.loads(plan)
+                        tables = _seq_scans(plan[0]["Plan"])
+                        if tables:
+                            findings += 1
+                            print(f"[SEQ SCAN] {name}: {', '.join(sorted(set(tables)))}")
+                            print("    " + " ".join(statement.split()))
+                        else:
+                            print(f"[ok] {name}")
+            finally:
+                await transaction.rollback()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+    print(f"Seq Scan 이 발견된 쿼리: {findings}")
+    return findings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="app/crud 쿼리의 Seq Scan 점검")
+    parser.add_argument("--scale", type=int, default=1, help="시드 데이터 배수 (기본 1)")
+    args = parser.parse_args()
+
+    if async_engine.dialect.name != "postgresql":
+        print("PostgreSQL 에서만 실행할 수 있습니다.")
+        sys.exit(2)
+
+    sys.exit(1 if asyncio.run(check(args.scale)) else 0)
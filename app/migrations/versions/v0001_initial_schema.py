@@ -0,0 +1,99 @@
+"""
+초기 스키마
+
+기존에 Base.metadata.create_all 로 만들던 테이블을 그대로 생성합니다.
+이미 테이블이 있는 DB 에서는 아무것도 하지 않으며, 예전 버전에서 만들어져
+held_piece / can_hold 컬럼이 없는 tetris_games 테이블에는 컬럼을 추가합니다.
+이 파일의 테이블 정의는 당시 스키마의 스냅샷이므로 models.py 변경에 맞춰 수정하지 않습니다.
+"""
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, DateTime, ForeignKey, Boolean, inspect, text
+)
+
+VERSION = 1
+DESCRIPTION = "initial schema"
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String, unique=True, index=True),
+    Column("email", String, unique=True, index=True),
+    Column("hashed_password", String, nullable=True),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("social_id", String, nullable=True),
+    Column("social_type", String, nullable=True),
+)
+
+Table(
+    "games", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("random_number", String, nullable=False),
+    Column("digits", Integer),
+    Column("status", String),
+    Column("attempts_used", Integer),
+    Column("created_at", DateTime),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=True),
+)
+
+Table(
+    "guesses", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("game_id", Integer, ForeignKey("games.id")),
+    Column("guess", String, nullable=False),
+    Column("strike", Integer),
+    Column("ball", Integer),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "tetris_games", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("status", String),
+    Column("score", Integer),
+    Column("level", Integer),
+    Column("lines_cleared", Integer),
+    Column("board_state", String),
+    Column("current_piece", String, nullable=True),
+    Column("next_piece", String, nullable=True),
+    Column("held_piece", String, nullable=True),
+    Column("can_hold", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("ended_at", DateTime, nullable=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=True),
+)
+
+Table(
+    "tetris_moves", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("game_id", Integer, ForeignKey("tetris_games.id")),
+    Column("move_type", String, nullable=False),
+    Column("piece_position", String, nullable=True),
+    Column("score_after_move", Integer),
+    Column("lines_cleared", Integer),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "tetris_high_scores", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("score", Integer),
+    Column("level", Integer),
+    Column("lines_cleared", Integer),
+    Column("game_duration", Integer),
+    Column("created_at", DateTime),
+)
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+
+    # 예전 스키마로 생성된 tetris_games 에 홀드 관련 컬럼 추가
+    columns = {c["name"] for c in inspect(connection).get_columns("tetris_games")}
+    if "held_piece" not in columns:
+        connection.execute(text("ALTER TABLE tetris_games ADD COLUMN held_piece VARCHAR"))
+    if "can_hold" not in columns:
+        connection.execute(text("ALTER TABLE tetris_games ADD COLUMN can_hold BOOLEAN DEFAULT TRUE"))
@@ -0,0 +1,105 @@
+"""
+성능을 위한 복합/부분 인덱스
+
+- guesses(game_id, created_at): 게임 상태/상세 히스토리의 추측 내역 조회
+- games(user_id, created_at): 사용자 게임 히스토리 (최신순)
+- games(user_id, created_at) WHERE status = 'ongoing': 진행 중인 게임 조회
+- tetris_high_scores(score DESC): 전체 리더보드
+- tetris_high_scores(user_id, score DESC): 사용자별 최고 점수
+- tetris_moves(game_id, id): 게임별 이동 기록
+- users(social_type, social_id) UNIQUE: 소셜 로그인 사용자 조회 및 중복 방지
+
+운영 중인 테이블 잠금을 피하기 위해 PostgreSQL 에서는 CREATE INDEX CONCURRENTLY 로
+트랜잭션 밖에서 생성합니다.
+
+- CONCURRENTLY 생성이 실패하면 INVALID 인덱스가 남으므로, 다시 실행할 때 INVALID 인덱스는 지우고 새로 만듭니다.
+  (checkfirst 는 INVALID 인덱스도 있는 것으로 보고 건너뜀)
+- 소셜 키가 중복된 사용자가 있으면 unique 인덱스를 만들 수 없으므로 인덱스를 만들기 전에 중단합니다.
+  중복 계정은 게임 기록이 연결되어 있어 자동으로 지우지 않으며, 정리한 뒤 다시 실행해야 합니다.
+"""
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, Index, text
+
+VERSION = 2
+DESCRIPTION = "composite indexes for hot queries"
+TRANSACTIONAL = False
+
+metadata = MetaData()
+
+users = Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("social_id", String),
+    Column("social_type", String),
+)
+games = Table(
+    "games", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("status", String),
+    Column("created_at", DateTime),
+)
+guesses = Table(
+    "guesses", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("game_id", Integer),
+    Column("created_at", DateTime),
+)
+tetris_moves = Table(
+    "tetris_moves", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("game_id", Integer),
+)
+tetris_high_scores = Table(
+    "tetris_high_scores", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer),
+    Column("score", Integer),
+)
+
+def _index(name, *columns, **kwargs):
+    return Index(name, *columns, postgresql_concurrently=True, **kwargs)
+
+INDEXES = [
+    _index("ix_guesses_game_id_created_at", guesses.c.game_id, guesses.c.created_at),
+    _index("ix_games_user_id_created_at", games.c.user_id, games.c.created_at),
+    _index(
+        "ix_games_ongoing_user_id_created_at", games.c.user_id, games.c.created_at,
+        postgresql_where=text("status = 'ongoing'"),
+    ),
+    _index("ix_tetris_high_scores_score", tetris_high_scores.c.score.desc()),
+    _index("ix_tetris_high_scores_user_id_score", tetris_high_scores.c.user_id, tetris_high_scores.c.score.desc()),
+    _index("ix_tetris_moves_game_id_id", tetris_moves.c.game_id, tetris_moves.c.id),
+    _index("uq_users_social_type_social_id", users.c.social_type, users.c.social_id, unique=True),
+]
+
+def _check_social_duplicates(connection):
+    """(social_type, social_id) 가 중복된 사용자가 있으면 예외를 발생시킵니다."""
+    duplicates = connection.execute(text(
+        "SELECT social_type, social_id, COUNT(*) FROM users "
+        "WHERE social_id IS NOT NULL "
+        "GROUP BY social_type, social_id HAVING COUNT(*) > 1 "
+        "ORDER BY COUNT(*) DESC LIMIT 20"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{social_type}:{social_id} ({count}명)" for social_type, social_id, count in duplicates)
+        raise RuntimeError(
+            f"소셜 키가 중복된 사용자가 있어 uq_users_social_type_social_id 를 만들 수 없습니다. "
+            f"중복 계정을 정리한 뒤 다시 실행하세요: {listed}"
+        )
+
+def _drop_invalid_index(connection, name: str):
+    """CONCURRENTLY 생성이 중간에 실패해 남은 INVALID 인덱스를 지웁니다. (PostgreSQL)"""
+    invalid = connection.execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name}).first()
+    if invalid:
+        connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+def upgrade(connection):
+    _check_social_duplicates(connection)
+    is_postgres = connection.dialect.name == "postgresql"
+    for index in INDEXES:
+        if is_postgres:
+            _drop_invalid_index(connection, index.name)
+        index.create(connection, checkfirst=True)
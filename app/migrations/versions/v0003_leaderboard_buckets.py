@@ -0,0 +1,28 @@
+"""
+기간별 리더보드 버킷 테이블
+
+일간/주간/월간 테트리스 점수와 숫자 야구 최소 시도 횟수 리더보드를
+(보드, 기간, 기간 시작 시각, 사용자) 단위로 미리 집계해 두는 테이블입니다.
+"""
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, ForeignKey, Index
+
+VERSION = 3
+DESCRIPTION = "leaderboard buckets"
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+
+leaderboard_buckets = Table(
+    "leaderboard_buckets", metadata,
+    Column("board", String, primary_key=True),
+    Column("period", String, primary_key=True),
+    Column("window_start", DateTime, primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("value", Integer, nullable=False),
+    Column("achieved_at", DateTime),
+    Index("ix_leaderboard_buckets_window_value", "board", "period", "window_start", "value"),
+)
+
+def upgrade(connection):
+    leaderboard_buckets.create(connection, checkfirst=True)
@@ -0,0 +1,23 @@
+"""
+폐기된 토큰 테이블
+
+로그아웃 등으로 만료 전에 폐기한 JWT 의 jti 를 원래 만료 시각과 함께 저장합니다.
+만료 시각이 지난 행은 더 이상 확인할 필요가 없으므로 주기적으로 삭제됩니다.
+"""
+from sqlalchemy import MetaData, Table, Column, String, DateTime, Index
+
+VERSION = 4
+DESCRIPTION = "revoked tokens"
+
+metadata = MetaData()
+
+revoked_tokens = Table(
+    "revoked_tokens", metadata,
+    Column("jti", String(32), primary_key=True),
+    Column("expires_at", DateTime, nullable=False),
+    Column("revoked_at", DateTime, nullable=False),
+    Index("ix_revoked_tokens_expires_at", "expires_at"),
+)
+
+def upgrade(connection):
+    revoked_tokens.create(connection, checkfirst=True)
@@ -1,7 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
-from datetime import datetime, UTC
-from .database import Base
+from .database import Base, utcnow
 
 """
 사용자 모델
@@ -17,12 +16,17 @@ class User(Base):
     email = Column(String, unique=True, index=True)
     hashed_password = Column(String, nullable=True)  # 소셜 로그인 사용자는 비밀번호가 없을 수 있음
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow)
     
     # 소셜 로그인 관련 필드 추가
     social_id = Column(String, nullable=True)  # 소셜 서비스에서의 사용자 ID
     social_type = Column(String, nullable=True)  # 소셜 서비스 타입 (kakao, google 등)
     
+    # 소셜 로그인 사용자 조회 및 중복 방지
+    __table_args__ = (
+        Index("uq_users_social_type_social_id", "social_type", "social_id", unique=True),
+    )
+    
     # 관계 설정
     games = relationship("Game", back_populates="user")
     tetris_games = relationship("TetrisGame", back_populates="user")
@@ -48,10 +52,20 @@ class Game(Base):
     # 시도 횟수
     attempts_used = Column(Integer, default=0)
     # 생성 시각
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow)
     # 사용자 ID (nullable - 로그인 없이도 게임 가능)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
+    __table_args__ = (
+        # 사용자별 게임 목록 (최신순)
+        Index("ix_games_user_id_created_at", "user_id", "created_at"),
+        # 진행 중인 게임만 담는 부분 인덱스
+        Index(
+            "ix_games_ongoing_user_id_created_at", "user_id", "created_at",
+            postgresql_where=text("status = 'ongoing'"),
+        ),
+    )
+    
     # 관계 설정
     user = relationship("User", back_populates="games")
     guesses = relationship("Guess", back_populates="game")
@@ -70,7 +84,12 @@ class Guess(Base):
     guess = Column(String, nullable=False)  # 예: "123"
     strike = Column(Integer, default=0)
     ball = Column(Integer, default=0)
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow)
+    
+    # 게임별 추측 내역 (시간순)
+    __table_args__ = (
+        Index("ix_guesses_game_id_created_at", "game_id", "created_at"),
+    )
     
     # 관계 설정
     game = relationship("Game", back_populates="guesses")
@@ -98,9 +117,9 @@ class TetrisGame(Base):
     # 홀드 사용 가능 여부
     can_hold = Column(Boolean, default=True)
     # 게임 시작 시각
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow)
     # 마지막 업데이트 시각
-    updated_at = Column(DateTime, default=lambda: datetime.now(UTC), onupdate=lambda: datetime.now(UTC))
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
     # 게임 종료 시각
     ended_at = Column(DateTime, nullable=True)
     # 사용자 ID (nullable - 로그인 없이도 게임 가능)
@@ -124,7 +143,12 @@ class TetrisMove(Base):
     # 이동으로 제거된 라인 수
     lines_cleared = Column(Integer, default=0)
     # 이동 시각
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow)
+    
+    # 게임별 이동 기록 (순서대로)
+    __table_args__ = (
+        Index("ix_tetris_moves_game_id_id", "game_id", "id"),
+    )
     
     # 관계 설정
     game = relationship("TetrisGame", back_populates="moves")
@@ -140,7 +164,54 @@ class TetrisHighScore(Base):
     level = Column(Integer, default=1)
     lines_cleared = Column(Integer, default=0)
     game_duration = Column(Integer, default=0)  # 초 단위
-    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow)
+    
+    __table_args__ = (
+        # 전체 리더보드 (점수 내림차순)
+        Index("ix_tetris_high_scores_score", text("score DESC")),
+        # 사용자별 최고 점수
+        Index("ix_tetris_high_scores_user_id_score", "user_id", text("score DESC")),
+    )
     
     # 관계 설정
-    user = relationship("User", back_populates="tetris_high_scores")
\ No newline at end of file
+    user = relationship("User", back_populates="tetris_high_scores")
+
+"""
+기간별 리더보드 버킷
+    
+- (보드, 기간, 기간 시작 시각, 사용자) 마다 한 행으로 해당 기간의 최고 기록 저장
+- 게임 종료 시 upsert 로 갱신하고, 조회는 한 기간의 행만 정렬하여 반환
+- 지난 기간은 상위 K개만 남기고 보관 기간이 지나면 삭제
+"""
+class LeaderboardBucket(Base):
+    __tablename__ = "leaderboard_buckets"
+
+    # 보드 종류 (tetris: 점수 높은 순, baseball: 승리까지 시도 횟수 적은 순)
+    board = Column(String, primary_key=True)
+    # 기간 (daily, weekly, monthly)
+    period = Column(String, primary_key=True)
+    # 기간 시작 시각 (UTC)
+    window_start = Column(DateTime, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # 기간 내 최고 기록
+    value = Column(Integer, nullable=False)
+    # 최고 기록 달성 시각
+    achieved_at = Column(DateTime, default=utcnow)
+    
+    __table_args__ = (
+        # 기간별 순위 조회
+        Index("ix_leaderboard_buckets_window_value", "board", "period", "window_start", "value"),
+    )
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # 토큰의 jti 클레임
+    jti = Column(String(32), primary_key=True)
+    # 토큰의 원래 만료 시각 (지나면 삭제)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, default=utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
@@ -0,0 +1,248 @@
+# app/ratelimit.py
+"""
+토큰 버킷 요청 제한
+
+게임 진행 요청(테트리스 이동, 숫자 야구 추측)은 요청마다 DB 트랜잭션을 쓰므로,
+폭주하는 클라이언트는 DB 작업 전에 429 로 거절합니다.
+
+사용 예:
+    @router.post("/tetris/{game_id}/moves", dependencies=[Depends(rate_limit("tetris_moves"))])
+
+- 키: 로그인 사용자는 사용자 id(request.state.user), 아니면 클라이언트 IP
+  리버스 프록시 뒤에서는 모든 요청의 접속 주소가 프록시이므로, TRUSTED_PROXIES 에 프록시 주소를 지정하면
+  그 프록시가 보낸 X-Forwarded-For 에서 실제 클라이언트 IP 를 찾음
+- 라우트별 예산: 초당 보충량(RATE)과 최대 누적량(BURST), RATE_LIMIT_<라우트>_RATE / _BURST 로 설정
+- 저장소: 기본은 워커별 메모리(키당 [토큰 수, 갱신 시각] 하나), 가득 찬 버킷은 새 버킷과 같으므로 삭제
+  RATE_LIMIT_REDIS_URL 을 지정하면 모든 워커가 Redis 의 버킷을 공유 (redis 패키지 필요)
+  그 밖의 저장소는 RateLimitBackend 를 구현해 set_backend() 로 교체
+- 저장소 오류 시 요청을 거절하지 않고 통과시킴 (제한 기능 때문에 게임이 멈추지 않도록)
+"""
+import ipaddress
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException, Request, status
+
+from . import metrics, startup
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # 선택적 의존성
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# 메모리 저장소의 최대 키 수 (넘으면 가장 오래 사용하지 않은 키부터 제거)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# 워커 간 공유 저장소 (비워두면 워커별 메모리)
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+# X-Forwarded-For 를 신뢰할 프록시 주소/대역 (쉼표로 구분, 예: 10.0.0.0/8,127.0.0.1)
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(value.strip(), strict=False)
+    for value in os.getenv("TRUSTED_PROXIES", "").split(",") if value.strip()
+]
+
+class Limit(NamedTuple):
+    # 초당 보충되는 요청 수
+    rate: float
+    # 한 번에 보낼 수 있는 최대 요청 수
+    burst: float
+
+def _limit(name: str, rate: str, burst: str) -> Limit:
+    prefix = f"RATE_LIMIT_{name.upper()}"
+    return Limit(float(os.getenv(f"{prefix}_RATE", rate)), float(os.getenv(f"{prefix}_BURST", burst)))
+
+# 라우트별 예산
+ROUTE_LIMITS: Dict[str, Limit] = {
+    "tetris_moves": _limit("tetris_moves", "20", "40"),
+    "game_guesses": _limit("game_guesses", "2", "10"),
+}
+
+class RateLimitBackend:
+    """
+    버킷 저장소 인터페이스
+    """
+    async def take(self, key: str, limit: Limit) -> float:
+        """
+        버킷에서 토큰 하나를 꺼냅니다.
+
+        Returns:
+            허용이면 0, 거절이면 다음 토큰이 생길 때까지 남은 시간(초)
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {}
+
+class MemoryBackend(RateLimitBackend):
+    """
+    워커별 메모리 저장소
+
+    키 -> [토큰 수, 갱신 시각, 가득 차는 데 걸리는 시간] 을 최근 사용 순서로 저장합니다.
+    가장 오래 쓰지 않은 키부터 확인해 이미 가득 찼을 키는 꺼낼 때마다 제거합니다. (평균 O(1))
+    """
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self.evicted = 0
+
+    def _evict(self, now: float):
+        buckets = self._buckets
+        while buckets:
+            _, bucket = next(iter(buckets.items()))
+            if now - bucket[1] < bucket[2] and len(buckets) <= self.max_keys:
+                break
+            buckets.popitem(last=False)
+            self.evicted += 1
+
+    async def take(self, key: str, limit: Limit) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [limit.burst, now, limit.burst / limit.rate]
+            self._buckets[key] = bucket
+        else:
+            bucket[0] = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        self._evict(now)
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / limit.rate
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": "memory", "keys": len(self._buckets), "evicted": self.evicted}
+
+# 버킷 갱신을 원자적으로 실행 (시각은 Redis 서버 기준이므로 워커 간 시계 차이와 무관)
+_REDIS_TAKE = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(retry)
+"""
+
+class RedisBackend(RateLimitBackend):
+    """
+    Redis 공유 저장소
+
+    키마다 해시 하나(tokens, ts)를 두고 스크립트로 갱신합니다.
+    가득 찰 시간이 지나면 Redis 만료로 키가 사라집니다.
+    """
+    def __init__(self, url: str):
+        if redis_asyncio is None:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL 을 사용하려면 redis 패키지가 필요합니다.")
+        self._client = redis_asyncio.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    async def take(self, key: str, limit: Limit) -> float:
+        retry = await self._take(keys=[f"ratelimit:{key}"], args=[limit.rate, limit.burst])
+        return float(retry)
+
+    async def close(self):
+        await self._client.aclose()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+_backend: RateLimitBackend = RedisBackend(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else MemoryBackend(RATE_LIMIT_MAX_KEYS)
+_stats = {"allowed": 0, "limited": 0, "errors": 0}
+
+def set_backend(backend: RateLimitBackend):
+    """버킷 저장소를 교체합니다. (예: 다른 공유 저장소)"""
+    global _backend
+    _backend = backend
+
+async def close():
+    await _backend.close()
+
+startup.register_shutdown(close)
+
+def _is_trusted(address: str, trusted: List) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+def client_ip(request: Request, trusted: Optional[List] = None) -> str:
+    """
+    요청한 클라이언트 IP
+
+    접속 주소가 신뢰하는 프록시이면 X-Forwarded-For 를 오른쪽(가장 가까운 프록시)부터 읽어
+    신뢰하는 프록시가 아닌 첫 주소를 사용합니다. 클라이언트가 보낸 값은 왼쪽에 있으므로 위조할 수 없습니다.
+    """
+    trusted = TRUSTED_PROXIES if trusted is None else trusted
+    address = request.client.host if request.client else "unknown"
+    if not trusted or not _is_trusted(address, trusted):
+        return address
+    forwarded = [value.strip() for value in ",".join(request.headers.getlist("x-forwarded-for")).split(",")]
+    for hop in reversed([value for value in forwarded if value]):
+        address = hop
+        if not _is_trusted(hop, trusted):
+            break
+    return address
+
+def client_key(request: Request) -> str:
+    """로그인 사용자는 사용자 id, 아니면 클라이언트 IP"""
+    user = getattr(request.state, "user", None)
+    if user:
+        return f"u{user['id']}"
+    return f"ip:{client_ip(request)}"
+
+def rate_limit(name: str) -> Callable:
+    """
+    라우트 의존성을 만듭니다. 엔드포인트의 다른 의존성(DB 세션 등)보다 먼저 실행되도록
+    경로 데코레이터의 dependencies 에 넣습니다.
+    """
+    limit = ROUTE_LIMITS[name]
+
+    async def check_rate_limit(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+        try:
+            retry_after = await _backend.take(f"{name}:{client_key(request)}", limit)
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.error(f"요청 제한 확인 실패 ({name}): {str(e)}")
+            return
+        if retry_after <= 0:
+            _stats["allowed"] += 1
+            return
+        _stats["limited"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    return check_rate_limit
+
+metrics.register("rate_limit", lambda: dict(
+    _stats,
+    enabled=RATE_LIMIT_ENABLED,
+    limits={name: limit._asdict() for name, limit in ROUTE_LIMITS.items()},
+    **_backend.snapshot(),
+))
@@ -0,0 +1,45 @@
+# app/responses.py
+"""
+빠른 JSON 응답
+
+FastAPI 는 response_model 이 있는 엔드포인트의 반환값을 다시 검증한 뒤 표준 json 으로 직렬화합니다.
+보드(List[List[int]]) 처럼 서버가 만든 큰 중첩 데이터는 이 재검증 비용이 큽니다.
+
+핫 경로에서는 crud 가 model_construct 로 검증 없이 만든 응답 모델을 FastJSONResponse 로 감싸 반환합니다.
+Response 객체를 직접 반환하면 FastAPI 의 재검증을 건너뛰며, response_model 은 문서(OpenAPI)용으로만 쓰입니다.
+orjson 이 설치되어 있으면 orjson 으로, 없으면 표준 json 으로 직렬화합니다.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # 선택적 의존성
+    orjson = None
+
+def json_default(obj: Any):
+    """JSON 기본 타입이 아닌 값 변환 (검증 없이 만든 모델은 필드 값을 그대로 사용)"""
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"JSON 으로 직렬화할 수 없는 타입입니다: {type(obj).__name__}")
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default)
+    return json.dumps(content, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    재검증 없이 orjson(없으면 json)으로 직렬화하는 JSON 응답
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
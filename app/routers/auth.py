@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Cookie, Query
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from .. import models, crud, schemas
-from ..database import get_db
+from ..middleware.routes import public
+from ..database import get_async_db, get_read_db, read_router
 from ..auth.utils import SECRET_KEY, ALGORITHM, get_current_user, create_access_token, create_refresh_token
 from datetime import datetime, timedelta, UTC
 from typing import Optional
 import os
 from ..auth.utils import verify_token
+from ..auth.identity import UserIdentity
+from ..auth import revocation
 from ..auth.oauth import process_kakao_login
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 import urllib.parse
 import base64
 import json
@@ -35,8 +38,9 @@ oauth2_scheme = OAuth2PasswordBearer(
 새 사용자 등록 엔드포인트
 """
 @router.post("/signup", response_model=schemas.UserResponse)
-def signup_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    return crud.user.create_user(db=db, user=user)
+@public
+async def signup_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud.user.create_user_async(db=db, user=user)
 
 """
 사용자 로그인 엔드포인트 
@@ -45,15 +49,16 @@ def signup_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
 - 리프레시 토큰은 쿠키에 설정
 """
 @router.post("/login", response_model=schemas.LoginResponse)
+@public
 async def login(
     response: Response,
     login_data: schemas.LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     이메일과 비밀번호로 로그인합니다.
     """
-    user = crud.user.authenticate_user(db, login_data.email, login_data.password)
+    user = await crud.user.authenticate_user_async(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -92,10 +97,11 @@ async def login(
     )
 
 @router.post("/kakao", response_model=schemas.LoginResponse)
+@public
 async def kakao_login(
     response: Response,
     login_req: schemas.KakaoLoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     카카오 인증 코드로 로그인합니다.
@@ -117,6 +123,7 @@ async def kakao_login(
     return login_response
 
 @router.get("/kakao")
+@public
 async def kakao_login(
     success_uri: str = Query(...),
     error_uri: str = Query(...)
@@ -138,12 +145,13 @@ async def kakao_login(
     return RedirectResponse(url=kakao_auth_url)
 
 @router.get("/kakao/callback")
+@public
 async def kakao_callback(
     response: Response,
     code: str = Query(None),
     error: str = Query(None),
     state: str = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     카카오 로그인 콜백 처리.
@@ -209,13 +217,31 @@ async def kakao_callback(
 
 """
 로그아웃 엔드포인트
+- 요청의 액세스 토큰과 리프레시 토큰을 폐기 (만료 전에 다시 사용할 수 없음)
 - 쿠키에서 리프레시 토큰 제거
 """
 @router.post("/logout")
-async def logout(response: Response):
+@public
+async def logout(
+    request: Request,
+    response: Response,
+    refresh_token: Optional[str] = Cookie(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    로그아웃합니다. 리프레시 토큰 쿠키를 삭제합니다.
+    로그아웃합니다. 토큰을 폐기하고 리프레시 토큰 쿠키를 삭제합니다.
     """
+    access_token = None
+    authorization = request.headers.get("Authorization")
+    if authorization and authorization.startswith("Bearer "):
+        access_token = authorization.replace("Bearer ", "")
+    if not access_token:
+        access_token = request.cookies.get("access_token")
+    
+    for token in (access_token, refresh_token):
+        if token:
+            await revocation.revoke_async(db, verify_token(token))
+    
     response.delete_cookie(
         key="refresh_token",
         httponly=True,
@@ -226,10 +252,11 @@ async def logout(response: Response):
     return {"message": "로그아웃되었습니다."}
 
 @router.post("/refresh", response_model=schemas.Token)
+@public
 async def refresh_token(
     response: Response,
     refresh_token: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     리프레시 토큰을 사용하여 새 액세스 토큰을 발급합니다.
@@ -241,9 +268,9 @@ async def refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 리프레시 토큰 검증
+    # 리프레시 토큰 검증 (로그아웃 또는 이미 교체된 토큰은 거부)
     payload = verify_token(refresh_token)
-    if not payload:
+    if not payload or revocation.is_revoked(payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="유효하지 않은 리프레시 토큰입니다.",
@@ -254,7 +281,7 @@ async def refresh_token(
     user_id = payload.get("id") or payload.get("user_id")
     
     # 사용자 확인
-    user = crud.get_user(db, user_id=user_id)
+    user = await crud.get_user_async(db, user_id=user_id)
     if not user or user.email != username:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -262,9 +289,10 @@ async def refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 새 토큰 생성
+    # 새 토큰 생성, 사용한 리프레시 토큰은 폐기 (재사용 방지)
     new_access_token = create_access_token(data={"sub": username, "id": user_id})
     new_refresh_token = create_refresh_token(data={"sub": username, "id": user_id})
+    await revocation.revoke_async(db, payload)
     
     # 리프레시 토큰을 쿠키에 설정
     secure = os.getenv("ENVIRONMENT", "development") == "production"
@@ -286,20 +314,46 @@ async def refresh_token(
 현재 로그인한 사용자 정보 조회
 """
 @router.get("/me", response_model=schemas.UserResponse)
-def read_users_me(current_user: models.User = Depends(get_current_user)):
+def read_users_me(current_user: UserIdentity = Depends(get_current_user)):
     return current_user
 
 """
 사용자의 게임 히스토리 조회
     
 미들웨어에서 설정한 사용자 정보를 사용하여 해당 사용자의 게임 목록 조회
+- limit: 페이지 크기
+- cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
 """
 @router.get("/history", response_model=schemas.UserGameHistoryResponse)
-def get_user_game_history(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_user_game_history(
+    limit: int = Query(crud.user.HISTORY_PAGE_SIZE, ge=1, le=crud.user.HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    current_user: UserIdentity = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.user.get_user_game_history(db=db, user_id=current_user.id)
+    return await crud.user.get_user_game_history_async(
+        db=db, user_id=current_user.id, limit=limit, cursor=cursor
+    )
+
+"""
+사용자의 전체 기록 내보내기
+    
+게임, 추측, 테트리스 게임, 테트리스 점수를 NDJSON 또는 CSV 로 스트리밍합니다.
+서버 측 커서로 조금씩 읽어 보내므로 기록이 많아도 메모리 사용량이 일정합니다.
+"""
+@router.get("/history/export")
+async def export_user_history(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: UserIdentity = Depends(get_current_user)
+):
+    session_maker = read_router.session_maker_for(request)
+    filename = f"history_{current_user.id}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        crud.export.stream_user_history(session_maker, current_user.id, format),
+        media_type=crud.export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 """
 특정 게임의 상세 히스토리 조회
@@ -309,7 +363,7 @@ def get_user_game_history(
 3. 게임이 종료된 경우 정답도 함께 반환
 """
 @router.get("/history/{game_id}", response_model=schemas.GameDetailHistoryResponse)
-def get_game_detail_history(game_id: int, request: Request, db: Session = Depends(get_db)):
+async def get_game_detail_history(game_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     # 미들웨어에서 설정한 사용자 정보 사용
     if not hasattr(request.state, "user"):
         raise HTTPException(
@@ -319,9 +373,10 @@ def get_game_detail_history(game_id: int, request: Request, db: Session = Depend
         )
     
     user_id = request.state.user["id"]
-    return crud.user.get_game_detail_history(db=db, user_id=user_id, game_id=game_id)
+    return await crud.user.get_game_detail_history_async(db=db, user_id=user_id, game_id=game_id)
 
 @router.get("/debug-token")
+@public
 async def debug_token(request: Request):
     """
     토큰 디버깅을 위한 엔드포인트
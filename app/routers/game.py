@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from ..database import get_db
-from .. import models,crud, schemas
+from fastapi import APIRouter, Depends, Response, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..middleware.routes import optional_auth
+from ..database import get_async_db, get_read_db, mark_written
+from .. import models, crud, schemas, utils
+from ..ratelimit import rate_limit
 from ..auth.utils import get_optional_current_user
+from ..auth.identity import get_identity_async
 
 router = APIRouter()
 
@@ -13,18 +16,20 @@ router = APIRouter()
 2. 게임 생성 및 응답 반환
 """
 @router.post("/games", response_model=schemas.CreateGameResponse)
-def create_game(
+@optional_auth
+async def create_game(
     game_req: schemas.CreateGameRequest, 
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # 미들웨어에서 설정한 사용자 정보 사용 (선택적)
+    # 미들웨어에서 설정한 사용자 정보 사용 (선택적, 식별 정보 캐시가 있으면 조회 생략)
     user = None
     if hasattr(request.state, "user"):
-        user_id = request.state.user["id"]
-        user = db.query(models.User).filter(models.User.id == user_id).first()
+        user = await get_identity_async(db, request.state.user["id"])
     
-    return crud.game.create_game(db=db, game_req=game_req, user=user)
+    response = await crud.game.create_game_async(db=db, game_req=game_req, user=user)
+    mark_written(request, f"/games/{response.game_id}")
+    return response
 
 """
 게임에 숫자 추측 엔드포인트
@@ -32,20 +37,58 @@ def create_game(
 1. 게임 ID와 추측 숫자를 받아 처리
 2. 스트라이크/볼 계산 및 게임 상태 업데이트
 3. 결과 응답 반환
+- 사용자(또는 IP)별 요청 제한을 넘으면 DB 작업 전에 429
 """
-@router.post("/games/{game_id}/guesses", response_model=schemas.GuessResponse)
-def make_guess(game_id: int, guess_req: schemas.GuessRequest, db: Session = Depends(get_db)):
-    return crud.game.make_guess(db=db, game_id=game_id, guess_req=guess_req)
+@router.post("/games/{game_id}/guesses", response_model=schemas.GuessResponse, dependencies=[Depends(rate_limit("game_guesses"))])
+@optional_auth
+async def make_guess(game_id: int, guess_req: schemas.GuessRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    response = await crud.game.make_guess_async(db=db, game_id=game_id, guess_req=guess_req)
+    mark_written(request, f"/games/{game_id}")
+    return response
+
+"""
+숫자 야구 기간별 리더보드 조회 엔드포인트
+    
+기간(daily, weekly, monthly) 안에서 승리까지 시도 횟수가 적은 순으로 반환
+- ago: 몇 기간 전 리더보드인지 (0 이면 현재 기간)
+"""
+@router.get("/games/leaderboard/{period}", response_model=schemas.WindowLeaderboardResponse)
+@optional_auth
+async def get_window_leaderboard(
+    period: schemas.LeaderboardPeriod,
+    limit: int = Query(10, ge=1, le=100),
+    ago: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await crud.leaderboard.get_window_leaderboard_async(
+        db=db, board=crud.leaderboard.BOARD_BASEBALL, period=period.value, limit=limit, ago=ago
+    )
 
 """
 게임 상태 조회 엔드포인트
     
 1. 게임 ID로 게임 정보 조회
 2. 게임 상태 및 추측 내역 반환
+3. If-None-Match 가 현재 ETag 와 같으면 추측 내역을 읽지 않고 304 반환
+   (If-None-Match 가 없으면 불러온 게임 행으로 ETag 계산)
 """
 @router.get("/games/{game_id}", response_model=schemas.GameStatusResponse)
-def get_game_status(game_id: int, db: Session = Depends(get_db)):
-    return crud.game.get_game_status(db=db, game_id=game_id)
+@optional_auth
+async def get_game_status(
+    game_id: int, 
+    request: Request, 
+    response: Response, 
+    db: AsyncSession = Depends(get_read_db)
+):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        etag, finished = await crud.game.get_game_etag_async(db=db, game_id=game_id)
+        if utils.etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=utils.cache_headers(etag, finished))
+    
+    content, etag, finished = await crud.game.get_game_status_with_etag_async(db=db, game_id=game_id)
+    response.headers.update(utils.cache_headers(etag, finished))
+    return content
 
 """
 게임 포기 엔드포인트
@@ -55,5 +98,8 @@ def get_game_status(game_id: int, db: Session = Depends(get_db)):
 3. 결과 응답 반환
 """
 @router.delete("/games/{game_id}", response_model=schemas.ForfeitResponse)
-def forfeit_game(game_id: int, db: Session = Depends(get_db)):
-    return crud.game.forfeit_game(db=db, game_id=game_id)
\ No newline at end of file
+@optional_auth
+async def forfeit_game(game_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    response = await crud.game.forfeit_game_async(db=db, game_id=game_id)
+    mark_written(request, f"/games/{game_id}")
+    return response
\ No newline at end of file
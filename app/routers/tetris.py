@@ -1,92 +1,182 @@
-from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
-from ..database import get_db
-from .. import models, crud, schemas
+from fastapi import APIRouter, Depends, Response, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..middleware.routes import optional_auth
+from ..database import get_async_db, get_read_db, mark_written
+from .. import models, crud, schemas, utils
+from ..ratelimit import rate_limit
 from ..auth.utils import get_optional_current_user
+from ..auth.identity import get_identity_async
+from ..tetris import wire
 
 router = APIRouter()
 
+# 게임 엔드포인트는 Accept: application/msgpack 요청에 압축 형식으로 응답 (app/tetris/wire.py)
+MSGPACK_RESPONSES = {200: {"content": {wire.MSGPACK_MEDIA_TYPE: {}}}}
+
 """
 새 테트리스 게임 생성 엔드포인트
 """
-@router.post("/tetris", response_model=schemas.CreateTetrisGameResponse)
-def create_game(
+@router.post("/tetris", response_model=schemas.CreateTetrisGameResponse, responses=MSGPACK_RESPONSES)
+@optional_auth
+async def create_game(
     game_req: schemas.CreateTetrisGameRequest, 
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # 미들웨어에서 설정한 사용자 정보 사용 (선택적)
+    # 미들웨어에서 설정한 사용자 정보 사용 (선택적, 식별 정보 캐시가 있으면 조회 생략)
     user = None
     if hasattr(request.state, "user"):
-        user_id = request.state.user["id"]
-        user = db.query(models.User).filter(models.User.id == user_id).first()
+        user = await get_identity_async(db, request.state.user["id"])
     
-    return crud.tetris.create_game(db=db, game_req=game_req, user=user)
+    response = await crud.tetris.create_game_async(db=db, game_req=game_req, user=user)
+    mark_written(request, f"/tetris/{response.game_id}")
+    return wire.negotiate(request, response)
 
 """
 테트리스 리더보드 조회 엔드포인트
 """
 @router.get("/tetris/leaderboard", response_model=schemas.TetrisLeaderboardResponse)
-def get_leaderboard(
+@optional_auth
+async def get_leaderboard(
     limit: int = 10, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await crud.tetris.get_leaderboard_async(db=db, limit=limit)
+
+"""
+내 테트리스 순위 조회 엔드포인트
+    
+사용자별 최고 기록 기준 순위와 위아래 around 명의 기록을 반환합니다.
+"""
+@router.get("/tetris/leaderboard/me", response_model=schemas.TetrisMyRankResponse)
+async def get_my_rank(
+    request: Request,
+    around: int = Query(5, ge=0, le=50),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # 미들웨어에서 설정한 사용자 정보 사용
+    if not hasattr(request.state, "user"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="인증이 필요합니다",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user_id = request.state.user["id"]
+    return await crud.tetris.get_my_rank_async(db=db, user_id=user_id, around=around)
+
+"""
+테트리스 기간별 리더보드 조회 엔드포인트
+    
+기간(daily, weekly, monthly) 안의 사용자별 최고 점수 순으로 반환
+- ago: 몇 기간 전 리더보드인지 (0 이면 현재 기간)
+"""
+@router.get("/tetris/leaderboard/{period}", response_model=schemas.WindowLeaderboardResponse)
+@optional_auth
+async def get_window_leaderboard(
+    period: schemas.LeaderboardPeriod,
+    limit: int = Query(10, ge=1, le=100),
+    ago: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.tetris.get_leaderboard(db=db, limit=limit)
+    return await crud.leaderboard.get_window_leaderboard_async(
+        db=db, board=crud.leaderboard.BOARD_TETRIS, period=period.value, limit=limit, ago=ago
+    )
+
+"""
+테트리스 점수 분포 조회 엔드포인트
+    
+종료된 게임의 점수/제거 라인 수 p50, p90, p99 와 히스토그램 반환
+"""
+@router.get("/tetris/stats/percentiles", response_model=schemas.TetrisPercentilesResponse)
+@optional_auth
+async def get_percentiles():
+    return crud.tetris.get_percentiles()
 
 """
 사용자의 테트리스 최고 점수 조회 엔드포인트
 """
 @router.get("/tetris/user/highscores", response_model=schemas.TetrisLeaderboardResponse)
-def get_user_high_scores(
+@optional_auth
+async def get_user_high_scores(
     request: Request,
     limit: int = 5, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     # 미들웨어에서 설정한 사용자 정보 사용
     if not hasattr(request.state, "user"):
         return schemas.TetrisLeaderboardResponse(scores=[])
     
     user_id = request.state.user["id"]
-    return crud.tetris.get_user_high_scores(db=db, user_id=user_id, limit=limit)
+    return await crud.tetris.get_user_high_scores_async(db=db, user_id=user_id, limit=limit)
 
 """
 테트리스 게임 상태 조회 엔드포인트
+    
+If-None-Match 가 현재 ETag 와 같으면 보드를 읽지 않고 304 반환
+If-None-Match 가 없으면 게임 행을 한 번만 읽어 ETag 도 함께 계산
 """
-@router.get("/tetris/{game_id}", response_model=schemas.TetrisGameStatusResponse)
-def get_game_status(
+@router.get("/tetris/{game_id}", response_model=schemas.TetrisGameStatusResponse, responses=MSGPACK_RESPONSES)
+@optional_auth
+async def get_game_status(
     game_id: int, 
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    return crud.tetris.get_game_status(db=db, game_id=game_id)
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        etag, finished = await crud.tetris.get_game_etag_async(db=db, game_id=game_id)
+        if utils.etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=dict(utils.cache_headers(etag, finished), Vary="Accept"))
+    
+    # 검증 없이 만든 응답을 그대로 직렬화 (FastAPI 재검증 생략)
+    content, etag, finished = await crud.tetris.get_game_status_with_etag_async(db=db, game_id=game_id)
+    return wire.negotiate(request, content, utils.cache_headers(etag, finished))
 
 """
 테트리스 게임 이동 엔드포인트
+- 사용자(또는 IP)별 요청 제한을 넘으면 DB 작업 전에 429
 """
-@router.post("/tetris/{game_id}/moves", response_model=schemas.TetrisMoveResponse)
-def make_move(
+@router.post(
+    "/tetris/{game_id}/moves", response_model=schemas.TetrisMoveResponse, responses=MSGPACK_RESPONSES,
+    dependencies=[Depends(rate_limit("tetris_moves"))]
+)
+@optional_auth
+async def make_move(
     game_id: int, 
     move_req: schemas.TetrisMoveRequest, 
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return crud.tetris.make_move(db=db, game_id=game_id, move_req=move_req)
+    response = await crud.tetris.make_move_async(db=db, game_id=game_id, move_req=move_req)
+    mark_written(request, f"/tetris/{game_id}")
+    return wire.negotiate(request, response)
 
 """
 테트리스 게임 일시정지/재개 엔드포인트
 """
-@router.post("/tetris/{game_id}/pause", response_model=schemas.TetrisPauseResponse)
-def pause_game(
+@router.post("/tetris/{game_id}/pause", response_model=schemas.TetrisPauseResponse, responses=MSGPACK_RESPONSES)
+@optional_auth
+async def pause_game(
     game_id: int, 
     pause_req: schemas.TetrisPauseRequest, 
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return crud.tetris.pause_game(db=db, game_id=game_id, pause_req=pause_req)
+    response = await crud.tetris.pause_game_async(db=db, game_id=game_id, pause_req=pause_req)
+    mark_written(request, f"/tetris/{game_id}")
+    return wire.negotiate(request, response)
 
 """
 테트리스 게임 포기 엔드포인트
 """
-@router.delete("/tetris/{game_id}", response_model=schemas.TetrisGameOverResponse)
-def forfeit_game(
+@router.delete("/tetris/{game_id}", response_model=schemas.TetrisGameOverResponse, responses=MSGPACK_RESPONSES)
+@optional_auth
+async def forfeit_game(
     game_id: int, 
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return crud.tetris.forfeit_game(db=db, game_id=game_id)
\ No newline at end of file
+    response = await crud.tetris.forfeit_game_async(db=db, game_id=game_id)
+    mark_written(request, f"/tetris/{game_id}")
+    return wire.negotiate(request, response)
\ No newline at end of file
@@ -114,8 +114,9 @@ class GameHistoryItem(BaseModel):
 
 class UserGameHistoryResponse(BaseModel):
     username: str
-    total_games: int
+    total_games: int | None = None  # 전체 게임 수 (첫 페이지에서만 포함)
     games: List[GameHistoryItem]
+    next_cursor: str | None = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
     model_config = {
         "from_attributes": True
@@ -293,6 +294,62 @@ class TetrisLeaderboardResponse(BaseModel):
         "from_attributes": True
     }
 
+# 순위가 포함된 최고 점수 항목 (사용자별 최고 기록 기준)
+class TetrisRankItem(BaseModel):
+    rank: int
+    username: str
+    score: int
+    level: int
+    lines_cleared: int
+    game_duration: int
+    created_at: datetime
+
+# 내 순위와 주변 순위 응답
+class TetrisMyRankResponse(BaseModel):
+    rank: Optional[int] = None  # 기록이 없으면 None
+    total_players: int
+    entries: List[TetrisRankItem]
+
+# 기간별 리더보드 기간
+class LeaderboardPeriod(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+# 기간별 리더보드 항목
+class WindowLeaderboardItem(BaseModel):
+    rank: int
+    username: str
+    value: int  # 테트리스: 점수, 숫자 야구: 승리까지 시도 횟수
+    achieved_at: datetime
+
+# 기간별 리더보드 응답
+class WindowLeaderboardResponse(BaseModel):
+    board: str
+    period: LeaderboardPeriod
+    window_start: datetime
+    window_end: datetime
+    entries: List[WindowLeaderboardItem]
+
+# 히스토그램 버킷 (lower 이상 upper 미만)
+class HistogramBucket(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+# 백분위수와 분포
+class PercentileSummary(BaseModel):
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+    histogram: List[HistogramBucket]
+
+# 테트리스 점수/라인 분포 응답
+class TetrisPercentilesResponse(BaseModel):
+    games: int
+    score: PercentileSummary
+    lines: PercentileSummary
+
 # 카카오 로그인 관련 스키마
 class KakaoLoginRequest(BaseModel):
     """카카오 로그인 요청 스키마"""
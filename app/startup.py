@@ -0,0 +1,168 @@
+# app/startup.py
+"""
+애플리케이션 시작/종료 작업
+
+import 시점에는 DB 접근 등 부수 효과가 없도록 하고, 아래 작업은 lifespan 에서 실행합니다.
+1. 데이터베이스 연결 확인
+2. 스키마 마이그레이션 (RUN_MIGRATIONS_ON_STARTUP)
+3. 선택적 워밍업 (STARTUP_WARMUP): 커넥션 풀을 미리 채우고 등록된 캐시를 적재
+4. 백그라운드 작업 시작 (예: 인메모리 리더보드 주기적 동기화), 종료 시 취소
+5. 시작/종료 시 등록된 함수 실행 (예: HTTP 클라이언트 생성/닫기)
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import text
+
+from . import config  # .env 로드
+from . import migrations
+from .database import engine, async_engine, replica_engines, test_connection, DB_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").lower() == "true"
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() == "true"
+# 워밍업 시 미리 열어둘 커넥션 수 (기본: 풀 크기)
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", str(DB_POOL_SIZE)))
+
+# 워밍업 단계에서 실행할 캐시 적재 함수 목록
+_warmup_hooks: List[Callable[[], Awaitable[None]]] = []
+# 서버 실행 동안 돌릴 백그라운드 작업 목록
+_background_jobs: List[Callable[[], Awaitable[None]]] = []
+_background_tasks: List[asyncio.Task] = []
+# 시작/종료 시 실행할 함수 목록
+_startup_hooks: List[Callable[[], Awaitable[None]]] = []
+_shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+
+def register_warmup(hook: Callable[[], Awaitable[None]]):
+    """
+    워밍업 단계에서 실행할 비동기 함수를 등록합니다. (예: 인메모리 캐시 적재)
+    """
+    _warmup_hooks.append(hook)
+    return hook
+
+def register_background(job: Callable[[], Awaitable[None]]):
+    """
+    서버 시작 시 태스크로 실행하고 종료 시 취소할 비동기 함수를 등록합니다.
+    """
+    _background_jobs.append(job)
+    return job
+
+def register_startup(hook: Callable[[], Awaitable[None]]):
+    """
+    시작 시 (워밍업 여부와 관계없이) 실행할 비동기 함수를 등록합니다. (예: 애플리케이션 범위 HTTP 클라이언트 생성)
+    """
+    _startup_hooks.append(hook)
+    return hook
+
+def register_shutdown(hook: Callable[[], Awaitable[None]]):
+    """
+    종료 시 실행할 비동기 함수를 등록합니다. (예: 애플리케이션 범위 HTTP 클라이언트 닫기)
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+async def _open_async_connections(count: int):
+    """비동기 풀에 count 개의 커넥션을 동시에 열었다가 반납합니다."""
+    results = await asyncio.gather(
+        *(async_engine.connect() for _ in range(count)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    try:
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in opened))
+    finally:
+        for conn in opened:
+            await conn.close()
+    failed = len(results) - len(opened)
+    if failed:
+        logger.warning(f"워밍업 커넥션 {failed}개 생성 실패")
+    return len(opened)
+
+def _open_sync_connections(count: int):
+    """동기 풀에 count 개의 커넥션을 열었다가 반납합니다."""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+async def warm_up():
+    """
+    커넥션 풀을 미리 채우고 등록된 캐시 적재 함수를 실행합니다.
+    """
+    start = time.perf_counter()
+    count = max(DB_WARMUP_CONNECTIONS, 0)
+    if count:
+        opened = await _open_async_connections(count)
+        # 동기 풀은 인증 의존성 등 일부 경로에서만 사용하므로 적게 연다
+        sync_opened = await asyncio.to_thread(_open_sync_connections, min(count, 2))
+        logger.info(f"커넥션 풀 워밍업: 비동기 {opened}개, 동기 {sync_opened}개")
+
+    for hook in _warmup_hooks:
+        try:
+            await hook()
+        except Exception as e:
+            logger.error(f"워밍업 작업 실패 ({hook.__name__}): {str(e)}")
+
+    logger.info(f"워밍업 완료 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+async def startup():
+    """
+    애플리케이션 시작 시 실행 (lifespan)
+    """
+    logger.info("애플리케이션 시작: 데이터베이스 연결 테스트 중...")
+    db_connected = await asyncio.to_thread(test_connection)
+    if not db_connected:
+        logger.warning("데이터베이스 연결에 실패했습니다. 일부 기능이 작동하지 않을 수 있습니다.")
+    else:
+        logger.info("데이터베이스 연결이 정상적으로 확인되었습니다.")
+
+    if RUN_MIGRATIONS_ON_STARTUP and db_connected:
+        try:
+            logger.info("데이터베이스 마이그레이션 적용 중...")
+            await asyncio.to_thread(migrations.upgrade, engine)
+        except Exception as e:
+            logger.error(f"데이터베이스 마이그레이션 실패: {str(e)}")
+
+    # 카카오 OAuth 설정 확인
+    if not os.getenv("KAKAO_CLIENT_ID"):
+        logger.warning("KAKAO_CLIENT_ID가 설정되지 않았습니다. 카카오 로그인이 작동하지 않을 수 있습니다.")
+
+    if STARTUP_WARMUP and db_connected:
+        await warm_up()
+
+    for hook in _startup_hooks:
+        try:
+            await hook()
+        except Exception as e:
+            logger.error(f"시작 작업 실패 ({hook.__name__}): {str(e)}")
+
+    for job in _background_jobs:
+        _background_tasks.append(asyncio.create_task(job(), name=job.__qualname__))
+
+async def shutdown():
+    """
+    애플리케이션 종료 시 실행 (lifespan)
+    """
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+
+    for hook in _shutdown_hooks:
+        try:
+            await hook()
+        except Exception as e:
+            logger.error(f"종료 작업 실패 ({hook.__name__}): {str(e)}")
+
+    await async_engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
+    engine.dispose()
+    logger.info("데이터베이스 커넥션 풀 정리 완료")
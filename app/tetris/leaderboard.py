@@ -0,0 +1,295 @@
+# app/tetris/leaderboard.py
+"""
+인메모리 테트리스 리더보드
+
+tetris_high_scores 의 모든 행이 아니라 다음 두 가지만 보관하므로 메모리는 플레이어 수에 비례합니다.
+- 상위 기록: 전체 기록 중 (점수 내림차순, 달성 시각 오름차순, id) 상위 TETRIS_LEADERBOARD_TOP_SIZE 개
+  기록은 추가만 되므로 한 번 밀려난 기록은 다시 상위에 들 수 없음
+  상위 N개 조회는 앞부분 슬라이스, 보관 개수보다 많이 요청하면 DB 에서 조회
+- 사용자별 최고 기록: 순위 계산용 (한 사용자의 여러 기록이 다른 사용자의 순위를 밀어내지 않도록 사용자당 한 항목)
+  순위를 셀 수 있는 스킵 리스트에 보관해 갱신 / 순위 / 주변 순위 조회가 O(log n)
+점수 저장 시 한 건씩 추가하고, 다른 워커가 저장한 점수는 마지막으로 반영한 id 이후의 행만 주기적으로 읽어 반영합니다.
+id 순서와 커밋 순서가 다를 수 있으므로 최근 id 일부를 다시 읽고(중복은 무시), 재구성 주기마다 전체를 다시 적재합니다.
+"""
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from datetime import datetime, UTC
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from .. import metrics, models, startup
+from ..database import AsyncSessionLocal
+from .skiplist import IndexableSkipList
+
+logger = logging.getLogger(__name__)
+
+# 증분 동기화 주기(초), 0 이면 인메모리 리더보드를 사용하지 않음
+TETRIS_LEADERBOARD_RESYNC_SECONDS = float(os.getenv("TETRIS_LEADERBOARD_RESYNC_SECONDS", "10"))
+# 전체 재적재 주기(초)
+TETRIS_LEADERBOARD_REBUILD_SECONDS = float(os.getenv("TETRIS_LEADERBOARD_REBUILD_SECONDS", "3600"))
+# 메모리에 보관할 상위 기록 수 (상위 N개 조회의 최대 N)
+TETRIS_LEADERBOARD_TOP_SIZE = int(os.getenv("TETRIS_LEADERBOARD_TOP_SIZE", "1000"))
+# 적재 시 한 번에 가져올 행 수
+LOAD_BATCH_SIZE = 5000
+# 증분 동기화 때 다시 읽을 최근 id 수 (늦게 커밋된 작은 id 를 놓치지 않도록)
+_REFRESH_OVERLAP_IDS = 1000
+
+def _timestamp(value: Optional[datetime]) -> float:
+    """정렬용 타임스탬프 (naive 는 UTC 로 간주)"""
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+class ScoreEntry:
+    """리더보드 한 항목 (tetris_high_scores 한 행)"""
+    __slots__ = ("key", "id", "user_id", "score", "level", "lines_cleared", "game_duration", "created_at")
+
+    def __init__(self, id: int, user_id: int, score: int, level: int, lines_cleared: int,
+                 game_duration: int, created_at: datetime):
+        self.key = (-score, _timestamp(created_at), id)
+        self.id = id
+        self.user_id = user_id
+        self.score = score
+        self.level = level
+        self.lines_cleared = lines_cleared
+        self.game_duration = game_duration
+        self.created_at = created_at
+
+    @classmethod
+    def from_model(cls, high_score: models.TetrisHighScore):
+        return cls(high_score.id, high_score.user_id, high_score.score, high_score.level,
+                   high_score.lines_cleared, high_score.game_duration, high_score.created_at)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row.id, row.user_id, row.score, row.level, row.lines_cleared, row.game_duration, row.created_at)
+
+def user_best_subquery():
+    """사용자별 최고 기록 한 행씩 (점수 내림차순, 먼저 달성한 기록 우선)"""
+    HighScore = models.TetrisHighScore
+    ranked = select(
+        HighScore,
+        func.row_number().over(
+            partition_by=HighScore.user_id,
+            order_by=(HighScore.score.desc(), HighScore.created_at.asc(), HighScore.id.asc())
+        ).label("row_number")
+    ).subquery()
+    return select(ranked).where(ranked.c.row_number == 1).subquery()
+
+class Leaderboard:
+    """
+    상위 기록 목록과 사용자별 최고 기록 인덱스
+    """
+    def __init__(self, top_size: int = TETRIS_LEADERBOARD_TOP_SIZE):
+        self.loaded = False
+        self.top_size = top_size
+        # 상위 기록 (키, 항목) 정렬 리스트, 최대 top_size 개
+        self._top: List[Tuple[Tuple[float, float, int], ScoreEntry]] = []
+        self._top_ids = set()
+        self._user_best: Dict[int, ScoreEntry] = {}
+        # 사용자별 최고 기록 (키 순서, 순위 계산용)
+        self._ranking = IndexableSkipList()
+        self._usernames: Dict[int, str] = {}
+        # 반영한 가장 큰 id (증분 동기화 기준)
+        self.watermark = 0
+        # 재적재 중에 추가된 항목 (새 인덱스로 교체한 뒤 다시 반영)
+        self._pending: Optional[List[ScoreEntry]] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "fallbacks": 0, "inserts": 0, "resyncs": 0, "refreshes": 0}
+
+    def _insert(self, entry: ScoreEntry):
+        """항목 하나를 반영합니다. 이미 반영한 항목은 무시합니다."""
+        self.watermark = max(self.watermark, entry.id)
+        top = self._top
+        if entry.id not in self._top_ids and (len(top) < self.top_size or entry.key < top[-1][0]):
+            bisect.insort(top, (entry.key, entry))
+            self._top_ids.add(entry.id)
+            if len(top) > self.top_size:
+                self._top_ids.discard(top.pop()[1].id)
+
+        best = self._user_best.get(entry.user_id)
+        if best is None or entry.key < best.key:
+            if best is not None:
+                self._ranking.remove(best.key)
+            self._ranking.insert(entry.key, entry)
+            self._user_best[entry.user_id] = entry
+
+    def add(self, entry: ScoreEntry, username: Optional[str] = None):
+        """
+        커밋된 점수 한 건을 추가합니다.
+        """
+        with self._lock:
+            if username:
+                self._usernames[entry.user_id] = username
+            if self._pending is not None:
+                self._pending.append(entry)
+            if self.loaded:
+                self._insert(entry)
+                self.stats["inserts"] += 1
+
+    def begin_reload(self):
+        with self._lock:
+            self._pending = []
+
+    def cancel_reload(self):
+        with self._lock:
+            self._pending = None
+
+    def replace(self, top: List[ScoreEntry], bests: List[ScoreEntry], usernames: Dict[int, str], watermark: int):
+        """
+        DB 에서 새로 읽은 상위 기록과 사용자별 최고 기록으로 교체합니다.
+        """
+        with self._lock:
+            pending = self._pending or []
+            self._pending = None
+            self._top = sorted(((entry.key, entry) for entry in top), key=lambda item: item[0])[:self.top_size]
+            self._top_ids = {entry.id for _, entry in self._top}
+            self._user_best = {entry.user_id: entry for entry in bests}
+            self._ranking = IndexableSkipList()
+            for entry in sorted(bests, key=lambda entry: entry.key):
+                self._ranking.insert(entry.key, entry)
+            self._usernames = usernames
+            self.watermark = watermark
+            for entry in pending:
+                self._insert(entry)
+            self.loaded = True
+            self.stats["resyncs"] += 1
+
+    def top(self, limit: int) -> Optional[List[ScoreEntry]]:
+        """점수 상위 limit 개 항목, 보관한 상위 기록보다 많이 요청하면 None"""
+        with self._lock:
+            if limit > self.top_size and len(self._top) >= self.top_size:
+                return None
+            return [entry for _, entry in self._top[:max(limit, 0)]]
+
+    def user_best(self, user_id: int) -> Optional[ScoreEntry]:
+        return self._user_best.get(user_id)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """사용자별 최고 기록 기준 순위 (1부터), 기록이 없으면 None"""
+        with self._lock:
+            best = self._user_best.get(user_id)
+            if best is None:
+                return None
+            return self._ranking.index(best.key) + 1
+
+    def around(self, user_id: int, count: int) -> Tuple[Optional[int], List[Tuple[int, ScoreEntry]]]:
+        """
+        사용자 순위와 위아래 count 명의 (순위, 최고 기록) 목록을 반환합니다.
+        기록이 없으면 (None, []) 입니다.
+        """
+        with self._lock:
+            best = self._user_best.get(user_id)
+            if best is None:
+                return None, []
+            index = self._ranking.index(best.key)
+            start = max(index - count, 0)
+            entries = self._ranking.values(start, index + count + 1)
+            return index + 1, [(start + offset + 1, entry) for offset, entry in enumerate(entries)]
+
+    @property
+    def total_players(self) -> int:
+        return len(self._ranking)
+
+    def username(self, user_id: int) -> Optional[str]:
+        return self._usernames.get(user_id)
+
+    def set_usernames(self, usernames: Dict[int, str]):
+        with self._lock:
+            self._usernames.update(usernames)
+
+    def snapshot(self):
+        return dict(self.stats, loaded=self.loaded, top=len(self._top), users=len(self._ranking),
+                    watermark=self.watermark)
+
+leaderboard = Leaderboard()
+metrics.register("tetris_leaderboard", leaderboard.snapshot)
+
+def _score_columns(source):
+    return (source.c.id, source.c.user_id, source.c.score, source.c.level,
+            source.c.lines_cleared, source.c.game_duration, source.c.created_at)
+
+async def load():
+    """
+    상위 기록과 사용자별 최고 기록만 읽어 리더보드를 다시 만듭니다.
+    (사용자별 최고 기록은 DB 에서 골라 서버 측 커서로 읽음)
+    """
+    HighScore = models.TetrisHighScore
+    User = models.User
+    usernames: Dict[int, str] = {}
+    bests: List[ScoreEntry] = []
+
+    leaderboard.begin_reload()
+    try:
+        async with AsyncSessionLocal() as db:
+            # 이후에 추가되는 행은 증분 동기화 또는 재적재 중 기록(pending)으로 반영
+            watermark = await db.scalar(select(func.max(HighScore.id))) or 0
+
+            rows = (await db.execute(
+                select(*_score_columns(HighScore.__table__), User.username)
+                .join(User, HighScore.user_id == User.id)
+                .order_by(HighScore.score.desc(), HighScore.created_at.asc(), HighScore.id.asc())
+                .limit(leaderboard.top_size)
+            )).all()
+            top = [ScoreEntry.from_row(row) for row in rows]
+            usernames.update((row.user_id, row.username) for row in rows)
+
+            best = user_best_subquery()
+            result = await db.stream(
+                select(*_score_columns(best), User.username)
+                .join(User, best.c.user_id == User.id)
+                .execution_options(yield_per=LOAD_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                for row in partition:
+                    bests.append(ScoreEntry.from_row(row))
+                    usernames[row.user_id] = row.username
+    except Exception:
+        leaderboard.cancel_reload()
+        raise
+
+    leaderboard.replace(top, bests, usernames, watermark)
+    logger.info(f"테트리스 리더보드 적재 완료: 플레이어 {len(bests)}명, 상위 기록 {len(top)}건")
+
+async def refresh():
+    """
+    마지막으로 반영한 id 이후의 행만 읽어 반영합니다.
+    """
+    HighScore = models.TetrisHighScore
+    since = max(leaderboard.watermark - _REFRESH_OVERLAP_IDS, 0)
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(*_score_columns(HighScore.__table__), models.User.username)
+            .join(models.User, HighScore.user_id == models.User.id)
+            .where(HighScore.id > since)
+            .order_by(HighScore.id)
+        )).all()
+    for row in rows:
+        leaderboard.add(ScoreEntry.from_row(row), row.username)
+    leaderboard.stats["refreshes"] += 1
+
+async def resync_loop():
+    """
+    시작 시 리더보드를 적재하고 주기적으로 증분 동기화하며, 재적재 주기마다 다시 전체 적재합니다.
+    """
+    last_rebuild = None
+    while True:
+        try:
+            if last_rebuild is None or time.monotonic() - last_rebuild >= TETRIS_LEADERBOARD_REBUILD_SECONDS:
+                await load()
+                last_rebuild = time.monotonic()
+            else:
+                await refresh()
+        except Exception as e:
+            logger.error(f"테트리스 리더보드 동기화 실패: {str(e)}")
+        await asyncio.sleep(TETRIS_LEADERBOARD_RESYNC_SECONDS)
+
+if TETRIS_LEADERBOARD_RESYNC_SECONDS > 0:
+    startup.register_background(resync_loop)
@@ -0,0 +1,136 @@
+# app/tetris/skiplist.py
+"""
+순위 조회가 가능한 스킵 리스트 (indexable skip list)
+
+각 링크에 건너뛰는 항목 수(width)를 함께 저장해, 키 순서를 유지하면서
+삽입 / 삭제 / 키의 순위 / n번째 항목 조회를 모두 평균 O(log n) 으로 처리합니다.
+키는 서로 달라야 합니다. (리더보드는 (점수 내림차순, 달성 시각, id) 를 사용)
+"""
+import random
+from typing import Any, Iterator, List, Optional
+
+MAX_LEVEL = 32
+
+class _Node:
+    __slots__ = ("key", "value", "next", "width")
+
+    def __init__(self, key, value, level: int):
+        self.key = key
+        self.value = value
+        self.next: List[Optional["_Node"]] = [None] * level
+        # next[i] 까지 맨 아래 단계에서 몇 칸 떨어져 있는지 (next[i] 가 None 이면 사용하지 않음)
+        self.width: List[int] = [0] * level
+
+class IndexableSkipList:
+    """
+    키 순서로 정렬된 (키, 값) 목록
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self._head = _Node(None, None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key, value: Any = None):
+        """키를 추가합니다. (이미 있는 키는 추가하지 않는다고 가정)"""
+        update: List[_Node] = [self._head] * MAX_LEVEL
+        positions = [0] * MAX_LEVEL
+        node, position = self._head, 0
+        for i in reversed(range(self._level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                position += node.width[i]
+                node = node.next[i]
+            update[i], positions[i] = node, position
+
+        level = self._random_level()
+        self._level = max(self._level, level)
+        new = _Node(key, value, level)
+        # 헤드를 0 으로 둔 새 항목의 위치
+        new_position = positions[0] + 1
+        for i in range(level):
+            prev = update[i]
+            new.next[i] = prev.next[i]
+            if prev.next[i] is not None:
+                new.width[i] = positions[i] + prev.width[i] + 1 - new_position
+            prev.next[i] = new
+            prev.width[i] = new_position - positions[i]
+        for i in range(level, self._level):
+            if update[i].next[i] is not None:
+                update[i].width[i] += 1
+        self._size += 1
+
+    def remove(self, key):
+        """
+        키를 제거합니다.
+
+        Raises:
+            KeyError: 키가 없는 경우
+        """
+        update: List[_Node] = [self._head] * MAX_LEVEL
+        node = self._head
+        for i in reversed(range(self._level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+            update[i] = node
+
+        target = node.next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for i in range(self._level):
+            prev = update[i]
+            if prev.next[i] is target:
+                if target.next[i] is not None:
+                    prev.width[i] += target.width[i] - 1
+                prev.next[i] = target.next[i]
+            elif prev.next[i] is not None:
+                prev.width[i] -= 1
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+    def index(self, key) -> int:
+        """
+        키의 위치 (0부터)
+
+        Raises:
+            KeyError: 키가 없는 경우
+        """
+        node, position = self._head, 0
+        for i in reversed(range(self._level)):
+            while node.next[i] is not None and node.next[i].key < key:
+                position += node.width[i]
+                node = node.next[i]
+        target = node.next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        return position
+
+    def _node_at(self, index: int) -> Optional[_Node]:
+        target = index + 1
+        node, position = self._head, 0
+        for i in reversed(range(self._level)):
+            while node.next[i] is not None and position + node.width[i] <= target:
+                position += node.width[i]
+                node = node.next[i]
+        return node if position == target else None
+
+    def values(self, start: int, stop: int) -> Iterator[Any]:
+        """start 이상 stop 미만 위치의 값 (키 순서)"""
+        node = self._node_at(max(start, 0))
+        for _ in range(max(start, 0), min(stop, self._size)):
+            yield node.value
+            node = node.next[0]
+
+    def __getitem__(self, index: int):
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return self._node_at(index).value
@@ -0,0 +1,199 @@
+# app/tetris/stats.py
+"""
+테트리스 점수/라인 분포 통계
+
+종료된 게임의 점수와 제거 라인 수를 고정 로그 버킷 히스토그램에 누적합니다.
+- 게임이 끝날 때 O(1) 로 한 건씩 추가
+- 백분위수는 버킷 경계로 근사 (상대 오차는 성장 비율 이내)
+- 버킷이 고정되어 있어 다른 워커/기간의 히스토그램과 개수를 더하기만 하면 병합됨
+시작 시 tetris_games 에서 한 번 적재하고, 다른 워커가 종료한 게임은 주기적 재동기화로 반영합니다.
+"""
+import asyncio
+import logging
+import math
+import os
+import threading
+from datetime import timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import select
+
+from .. import metrics, models, startup
+from ..database import AsyncSessionLocal, utcnow
+
+logger = logging.getLogger(__name__)
+
+# 재동기화 주기(초), 0 이면 시작 시에도 적재하지 않음
+TETRIS_STATS_RESYNC_SECONDS = float(os.getenv("TETRIS_STATS_RESYNC_SECONDS", "600"))
+# 버킷 상한의 성장 비율 (1.1 이면 백분위수 오차 약 10% 이내)
+HISTOGRAM_GROWTH = 1.1
+LOAD_BATCH_SIZE = 5000
+# 재동기화 시작 전 이 시간(초) 안에 종료된 게임까지 id 로 중복을 확인 (종료 시각 기록과 record() 사이의 지연 여유)
+RELOAD_OVERLAP_SECONDS = 60
+
+class LogHistogram:
+    """
+    0 과 [growth^i, growth^(i+1)) 구간으로 나눈 고정 로그 버킷 히스토그램
+    """
+    def __init__(self, growth: float = HISTOGRAM_GROWTH):
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.zero = 0
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        return int(math.floor(math.log(value) / self._log_growth))
+
+    def add(self, value: float, count: int = 1):
+        if value <= 0:
+            self.zero += count
+        else:
+            index = self._index(value)
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "LogHistogram"):
+        self.zero += other.zero
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+
+    def _bounds(self, index: int):
+        return self.growth ** index, self.growth ** (index + 1)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 근사값 (버킷의 기하 평균), 데이터가 없으면 None"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = self.zero
+        if rank <= seen:
+            return 0.0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if rank <= seen:
+                lower, upper = self._bounds(index)
+                return math.sqrt(lower * upper)
+        lower, upper = self._bounds(max(self.counts))
+        return math.sqrt(lower * upper)
+
+    def buckets(self) -> List[dict]:
+        """비어 있지 않은 버킷 목록 (lower 이상 upper 미만)"""
+        result = []
+        if self.zero:
+            result.append({"lower": 0.0, "upper": 1.0, "count": self.zero})
+        for index in sorted(self.counts):
+            lower, upper = self._bounds(index)
+            result.append({"lower": round(lower, 3), "upper": round(upper, 3), "count": self.counts[index]})
+        return result
+
+class GameStats:
+    """
+    종료된 테트리스 게임의 점수/라인 히스토그램
+    """
+    def __init__(self):
+        self.loaded = False
+        self.score = LogHistogram()
+        self.lines = LogHistogram()
+        # 재동기화 중에 기록된 게임 id -> (점수, 라인) (새 히스토그램으로 교체한 뒤 다시 반영)
+        self._pending: Optional[Dict[int, tuple]] = None
+        self._lock = threading.Lock()
+
+    def record(self, game_id: int, score: int, lines_cleared: int):
+        """종료된 게임 한 건을 추가합니다."""
+        with self._lock:
+            self.score.add(score)
+            self.lines.add(lines_cleared)
+            if self._pending is not None:
+                self._pending[game_id] = (score, lines_cleared)
+
+    def begin_reload(self):
+        with self._lock:
+            self._pending = {}
+
+    def cancel_reload(self):
+        with self._lock:
+            self._pending = None
+
+    def replace(self, score: LogHistogram, lines: LogHistogram, recent_ids: Set[int]):
+        """
+        새 히스토그램으로 교체합니다.
+        재동기화 중에 기록된 게임 중 조회 결과에 이미 포함된 게임(recent_ids)은 다시 더하지 않습니다.
+        """
+        with self._lock:
+            for game_id, (pending_score, pending_lines) in (self._pending or {}).items():
+                if game_id in recent_ids:
+                    continue
+                score.add(pending_score)
+                lines.add(pending_lines)
+            self._pending = None
+            self.score, self.lines = score, lines
+            self.loaded = True
+
+    def summary(self) -> dict:
+        """백분위수와 히스토그램"""
+        with self._lock:
+            return {
+                "games": self.score.count,
+                "score": _summarize(self.score),
+                "lines": _summarize(self.lines),
+            }
+
+def _summarize(histogram: LogHistogram) -> dict:
+    return {
+        "p50": histogram.quantile(0.50),
+        "p90": histogram.quantile(0.90),
+        "p99": histogram.quantile(0.99),
+        "histogram": histogram.buckets(),
+    }
+
+game_stats = GameStats()
+metrics.register("tetris_stats", lambda: {"loaded": game_stats.loaded, "games": game_stats.score.count})
+
+async def load():
+    """
+    종료된 게임 전체를 서버 측 커서로 읽어 히스토그램을 다시 만듭니다.
+
+    재동기화를 시작한 뒤 종료된 게임도 조회 시점에 따라 결과에 포함될 수 있으므로
+    시작 직전 이후에 종료된 게임의 id 만 모아 재동기화 중 기록된 게임과 중복되지 않게 합니다.
+    (그보다 먼저 종료된 게임은 재동기화 중에 기록될 수 없으므로 id 를 보관하지 않음)
+    """
+    score, lines = LogHistogram(), LogHistogram()
+    recent_ids: Set[int] = set()
+    recent_since = utcnow() - timedelta(seconds=RELOAD_OVERLAP_SECONDS)
+    game_stats.begin_reload()
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                select(models.TetrisGame.id, models.TetrisGame.score, models.TetrisGame.lines_cleared,
+                       models.TetrisGame.ended_at)
+                .where(models.TetrisGame.status == "game_over")
+                .execution_options(yield_per=LOAD_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                for game_id, game_score, game_lines, ended_at in partition:
+                    if ended_at is not None and ended_at >= recent_since:
+                        recent_ids.add(game_id)
+                    score.add(game_score or 0)
+                    lines.add(game_lines or 0)
+    except Exception:
+        game_stats.cancel_reload()
+        raise
+
+    game_stats.replace(score, lines, recent_ids)
+    logger.info(f"테트리스 점수 분포 적재 완료: {score.count}건")
+
+async def resync_loop():
+    """
+    시작 시 분포를 적재하고 주기적으로 다시 동기화합니다.
+    """
+    while True:
+        try:
+            await load()
+        except Exception as e:
+            logger.error(f"테트리스 점수 분포 동기화 실패: {str(e)}")
+        await asyncio.sleep(TETRIS_STATS_RESYNC_SECONDS)
+
+if TETRIS_STATS_RESYNC_SECONDS > 0:
+    startup.register_background(resync_loop)
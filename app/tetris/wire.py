@@ -0,0 +1,76 @@
+# app/tetris/wire.py
+"""
+테트리스 응답의 압축 바이너리 형식 (MessagePack)
+
+Accept 헤더에 application/msgpack 이 있으면 JSON 대신 MessagePack 으로 응답합니다.
+- board: 행 우선으로 셀 하나당 1바이트인 bytes (너비는 width 필드)
+  예) 10x20 보드는 JSON 약 600바이트 대신 200바이트
+- current_piece / next_piece / held_piece: (type, rotation, row, col) 튜플
+  모양과 색상은 type 과 rotation 으로 결정되므로 보내지 않음 (tetris_utils.SHAPES 를 시계방향으로 rotation 번 회전)
+그 밖의 필드는 JSON 과 같은 이름/값을 사용합니다. msgpack 이 설치되어 있지 않으면 항상 JSON 으로 응답합니다.
+"""
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from ..responses import FastJSONResponse, json_default
+
+try:
+    import msgpack
+except ImportError:  # 선택적 의존성
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+PIECE_FIELDS = ("current_piece", "next_piece", "held_piece")
+
+def accepts_msgpack(request: Request) -> bool:
+    """요청이 MessagePack 응답을 받을 수 있는지 확인합니다."""
+    if msgpack is None:
+        return False
+    accept = request.headers.get("Accept", "")
+    return any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES)
+
+def pack_board(board) -> bytes:
+    """2차원 보드를 행 우선 bytes 로 변환합니다. (셀 값 0~255)"""
+    return bytes(cell for row in board for cell in row)
+
+def pack_piece(piece: Optional[dict]) -> Optional[tuple]:
+    """블록 dict 를 (type, rotation, row, col) 튜플로 변환합니다."""
+    if not piece:
+        return None
+    row, col = piece["position"]
+    return (piece["type"], piece.get("rotation", 0), row, col)
+
+def to_packed(content: Any) -> Any:
+    """응답 모델/dict 의 보드와 블록을 압축 형식으로 바꿉니다."""
+    data = dict(content.__dict__) if isinstance(content, BaseModel) else content
+    if not isinstance(data, dict):
+        return data
+    if data.get("board") is not None:
+        board = data["board"]
+        data["width"] = len(board[0]) if board else 0
+        data["board"] = pack_board(board)
+    for field in PIECE_FIELDS:
+        if field in data:
+            data[field] = pack_piece(data[field])
+    return data
+
+class MsgpackResponse(Response):
+    """
+    보드/블록을 압축한 MessagePack 응답
+    """
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(to_packed(content), default=json_default, use_bin_type=True)
+
+def negotiate(request: Request, content: Any, headers: Optional[dict] = None) -> Response:
+    """
+    Accept 헤더에 따라 MessagePack 또는 JSON 응답을 만듭니다.
+    """
+    headers = dict(headers or {}, Vary="Accept")
+    if accepts_msgpack(request):
+        return MsgpackResponse(content, headers=headers)
+    return FastJSONResponse(content, headers=headers)
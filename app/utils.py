@@ -22,4 +22,33 @@ def calculate_strike_ball(answer: str, guess: str) -> tuple[int, int]:
             strike += 1
         elif guess[i] in answer:
             ball += 1
-    return strike, ball
\ No newline at end of file
+    return strike, ball
+
+# 종료된 게임처럼 더 이상 바뀌지 않는 응답의 캐시 정책
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# 진행 중인 게임: 캐시하되 매번 ETag 로 재검증
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+def make_etag(*parts) -> str:
+    """
+    버전 정보로 ETag 값을 만든다. 예) make_etag(3, "ongoing") -> '"3-ongoing"'
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    If-None-Match 헤더 값이 etag 와 일치하는지 확인한다. (약한 비교, "*" 허용)
+    """
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in (value.removeprefix("W/") for value in candidates)
+
+def cache_headers(etag: str, finished: bool) -> dict:
+    """
+    게임 상태 응답에 붙일 ETag / Cache-Control 헤더
+    """
+    return {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if finished else REVALIDATE_CACHE_CONTROL,
+    }
@@ -0,0 +1,82 @@
+# benchmarks/fast_json.py
+"""
+테트리스 응답 직렬화 비용 비교
+
+make_move / get_game_status 응답을 두 가지 방식으로 만들어 요청당 CPU 시간을 비교합니다.
+- 기존: 모델 생성 시 검증 + FastAPI response_model 재검증 + 표준 json 직렬화
+- 빠른 경로: model_construct (검증 없음) + FastJSONResponse (orjson)
+
+사용법:
+    python benchmarks/fast_json.py [--iterations 2000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app import schemas
+from app.responses import FastJSONResponse, orjson
+from app.tetris import tetris_utils
+
+BOARD_SIZES = [(10, 20), (20, 40), (40, 80)]
+
+def _move_payload(width: int, height: int) -> dict:
+    board = [[(x + y) % 8 for x in range(width)] for y in range(height)]
+    piece = tetris_utils.generate_piece()
+    return dict(
+        success=True, board=board, current_piece=piece, next_piece=tetris_utils.generate_piece(),
+        held_piece=None, score=1200, level=3, lines_cleared=24, line_clear_count=1,
+        status="ongoing", can_hold=True, message="이동이 성공적으로 처리되었습니다.",
+    )
+
+def _status_payload(width: int, height: int) -> dict:
+    payload = _move_payload(width, height)
+    for key in ("success", "line_clear_count", "message"):
+        payload.pop(key)
+    payload["game_id"] = 1
+    return payload
+
+def _measure(fn, iterations: int) -> float:
+    """반복 실행 후 1회당 평균 CPU 시간(마이크로초)"""
+    fn()
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1_000_000
+
+def _compare(name: str, model, payload: dict, iterations: int):
+    field = create_model_field(name=f"Response_{name}", type_=model, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def baseline():
+        content = model(**payload)
+        serialized = loop.run_until_complete(serialize_response(field=field, response_content=content))
+        return JSONResponse(serialized).body
+
+    def fast():
+        return FastJSONResponse(model.model_construct(**payload)).body
+
+    base_us = _measure(baseline, iterations)
+    fast_us = _measure(fast, iterations)
+    loop.close()
+    size = len(fast())
+    print(f"  {name:<16} 기존 {base_us:8.1f}us  빠른 경로 {fast_us:8.1f}us  "
+          f"절감 {base_us - fast_us:8.1f}us ({base_us / fast_us:4.1f}x)  {size} bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="테트리스 응답 직렬화 비용 비교")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"serializer: {'orjson ' + orjson.__version__ if orjson else 'json (orjson 미설치)'}")
+    for width, height in BOARD_SIZES:
+        print(f"board {width}x{height}")
+        _compare("make_move", schemas.TetrisMoveResponse, _move_payload(width, height), args.iterations)
+        _compare("get_game_status", schemas.TetrisGameStatusResponse, _status_payload(width, height), args.iterations)
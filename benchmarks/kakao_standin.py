@@ -0,0 +1,116 @@
+# benchmarks/kakao_standin.py
+"""
+로컬 카카오 OAuth 대역 서버로 카카오 로그인 비용 비교
+
+127.0.0.1 에 토큰/사용자 정보 엔드포인트를 흉내 내는 서버를 띄우고
+app.auth.oauth 의 get_kakao_token / get_kakao_user_info 로 로그인 N회를 실행합니다.
+
+- 호출마다 새 클라이언트(이전 방식) vs 애플리케이션 범위 클라이언트
+- 대역 서버가 받은 TCP 커넥션 수와 로그인 1회 평균 시간 비교
+- 실제 카카오 API 는 TLS 이므로 커넥션마다 핸드셰이크 왕복이 추가로 발생합니다.
+
+재시도, 서킷 브레이커, 커넥션 재사용 동작은 tests/test_kakao_client.py 에서 확인합니다.
+
+사용법:
+    python benchmarks/kakao_standin.py [--logins 50]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+PORT = _free_port()
+BASE_URL = f"http://127.0.0.1:{PORT}"
+os.environ.update(
+    KAKAO_CLIENT_ID="standin",
+    KAKAO_REDIRECT_URI="http://localhost/callback",
+    KAKAO_TOKEN_URL=f"{BASE_URL}/oauth/token",
+    KAKAO_USER_INFO_URL=f"{BASE_URL}/v2/user/me",
+    KAKAO_HTTP_BACKOFF_SECONDS="0.01",
+)
+
+import app.main  # noqa: F401  (app 패키지 import 순서)
+from app.auth import oauth
+from app.auth.kakao_client import kakao_http
+
+# 대역 서버가 받은 커넥션 (클라이언트 주소, 포트)
+standin_state = {"connections": set()}
+standin = FastAPI()
+
+@standin.middleware("http")
+async def count_connections(request: Request, call_next):
+    standin_state["connections"].add((request.client.host, request.client.port))
+    return await call_next(request)
+
+@standin.post("/oauth/token")
+async def token(request: Request):
+    form = await request.form()
+    return {"access_token": f"standin-{form.get('code')}", "token_type": "bearer"}
+
+@standin.get("/v2/user/me")
+async def user_me(request: Request):
+    if not request.headers.get("Authorization", "").startswith("Bearer standin-"):
+        raise HTTPException(status_code=401)
+    return {"id": 1234, "kakao_account": {"email": "standin@example.com", "profile": {"nickname": "standin"}}}
+
+def _start_standin() -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(standin, host="127.0.0.1", port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+def _reset():
+    standin_state["connections"] = set()
+
+async def _login_per_call_client(code: str):
+    """이전 방식: 요청마다 새 AsyncClient"""
+    async with httpx.AsyncClient() as client:
+        token = (await client.post(oauth.KAKAO_TOKEN_URL, data={"code": code})).json()
+    async with httpx.AsyncClient() as client:
+        await client.get(oauth.KAKAO_USER_INFO_URL, headers={"Authorization": f"Bearer {token['access_token']}"})
+
+async def _login_shared_client(code: str):
+    token = await oauth.get_kakao_token(code)
+    await oauth.get_kakao_user_info(token["access_token"])
+
+async def _measure(login, count: int):
+    _reset()
+    start = time.perf_counter()
+    for i in range(count):
+        await login(f"code-{i}")
+    return (time.perf_counter() - start) / count * 1000, len(standin_state["connections"])
+
+async def run(args):
+    await kakao_http.start()
+
+    per_call_ms, per_call_conns = await _measure(_login_per_call_client, args.logins)
+    shared_ms, shared_conns = await _measure(_login_shared_client, args.logins)
+    print(f"로그인 {args.logins}회 - 요청마다 새 클라이언트: 평균 {per_call_ms:.2f}ms, 커넥션 {per_call_conns}개")
+    print(f"로그인 {args.logins}회 - 공유 클라이언트:       평균 {shared_ms:.2f}ms, 커넥션 {shared_conns}개")
+
+    await kakao_http.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 카카오 OAuth 대역 서버로 카카오 로그인 비용 비교")
+    parser.add_argument("--logins", type=int, default=50)
+    args = parser.parse_args()
+    server = _start_standin()
+    try:
+        asyncio.run(run(args))
+    finally:
+        server.should_exit = True
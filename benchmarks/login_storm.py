@@ -0,0 +1,97 @@
+# benchmarks/login_storm.py
+"""
+로그인 폭주 중 다른 요청 지연 확인
+
+여러 작업자가 POST /auth/login 을 동시에 보내는 동안(bcrypt 검증),
+같은 이벤트 루프에서 처리되는 비동기 엔드포인트의 지연과 루프 지연을 측정합니다.
+bcrypt 가 이벤트 루프에서 실행되면 요청 하나당 해싱 시간만큼 루프가 멈춥니다.
+루프 지연 최대값이 예산(--budget-ms)을 넘으면 종료 코드 1 을 반환합니다.
+기본 예산은 해싱 1회 목표 시간(PASSWORD_HASH_TARGET_MS)보다 작게 잡아, 해싱이 루프에서 한 번이라도 실행되면 실패합니다.
+
+.env 의 DATABASE_URL 을 사용하며, 측정용 사용자를 없으면 만듭니다.
+
+사용법:
+    python benchmarks/login_storm.py [--logins 40] [--concurrency 20] [--budget-ms 200]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.main import app
+from app.auth import passwords
+from app.database import async_engine
+
+EMAIL = "login-storm@example.com"
+PASSWORD = "login-storm-password"
+# 이벤트 루프에서 처리되는 가벼운 비동기 엔드포인트 (응답 코드는 확인하지 않음)
+PROBE_PATH = "/tetris/stats/percentiles"
+
+async def _watch_loop(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """stop 될 때까지 타이머 지연의 최대값(ms)을 기록합니다."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, (time.perf_counter() - start - interval) * 1000)
+    return worst
+
+async def run(args) -> int:
+    await passwords.calibrate()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/signup", json={"email": EMAIL, "username": "login_storm", "password": PASSWORD})
+        statuses = []
+        latencies = []
+
+        async def login_worker(count: int):
+            for _ in range(count):
+                response = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                statuses.append(response.status_code)
+
+        async def prober(done: asyncio.Event):
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get(PROBE_PATH)
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.005)
+
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(_watch_loop(stop))
+        probing = asyncio.create_task(prober(stop))
+        start = time.perf_counter()
+        per_worker = max(args.logins // args.concurrency, 1)
+        await asyncio.gather(*(login_worker(per_worker) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probing
+        worst_lag = await watcher
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+    counts = {code: statuses.count(code) for code in sorted(set(statuses))}
+    print(f"로그인 {len(statuses)}개 (동시 {args.concurrency}), {elapsed:.2f}s, 응답 코드 {counts}")
+    print(f"bcrypt cost {passwords.pool_snapshot()['rounds']}, 작업자 {passwords.PASSWORD_HASH_WORKERS}")
+    if latencies:
+        print(f"{PROBE_PATH} {len(latencies)}개: p50 {statistics.median(latencies):.1f}ms  p99 {p99:.1f}ms  최대 {latencies[-1]:.1f}ms")
+    print(f"이벤트 루프 최대 지연 {worst_lag:.1f}ms (예산 {args.budget_ms}ms)")
+    return 0 if worst_lag <= args.budget_ms else 1
+
+async def main(args) -> int:
+    try:
+        return await run(args)
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 다른 요청 지연 확인")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=200.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,134 @@
+# benchmarks/middleware_overhead.py
+"""
+인증 미들웨어 방식별 처리량 비교
+
+같은 엔드포인트를 가진 두 앱을 만들어 ASGI 로 직접 호출하고 초당 요청 수를 비교합니다.
+(HTTP 클라이언트/서버 비용을 빼고 미들웨어 비용만 보기 위함)
+
+- 이전: @app.middleware("http") 두 개 (인증 + X-Process-Time), 요청마다 call_next 태스크와 응답 래핑
+- 현재: app.middleware.auth.AuthMiddleware 하나 (순수 ASGI)
+
+두 방식 모두 인증 판단은 같은 authenticate() 를 사용하므로 차이는 미들웨어 구조에서만 생깁니다.
+엔드포인트는 공개 경로(/ping)와 액세스 토큰이 필요한 경로(/private) 두 가지입니다.
+현재 방식이 이전보다 느리면 종료 코드 1 을 반환합니다.
+
+사용법:
+    python benchmarks/middleware_overhead.py [--requests 20000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+
+import app.main  # noqa: F401  (app 패키지 import 순서)
+from app.auth.utils import create_access_token
+from app.middleware.auth import AuthMiddleware, authenticate
+from app.middleware.routes import public
+
+def _add_routes(bench_app: FastAPI):
+    @bench_app.get("/ping")
+    @public
+    async def ping():
+        return {"ok": True}
+
+    @bench_app.get("/private")
+    async def private(request: Request):
+        return {"id": request.state.user["id"]}
+
+def build_before() -> FastAPI:
+    """이전 구조: BaseHTTPMiddleware 두 개"""
+    bench_app = FastAPI()
+
+    @bench_app.middleware("http")
+    async def auth_middleware(request: Request, call_next):
+        response_headers = []
+        rejection = await authenticate(request.scope, response_headers)
+        if rejection is not None:
+            return rejection
+        response = await call_next(request)
+        response.headers.raw.extend(response_headers)
+        return response
+
+    @bench_app.middleware("http")
+    async def token_refresh_middleware(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+    _add_routes(bench_app)
+    return bench_app
+
+def build_after() -> FastAPI:
+    """현재 구조: 순수 ASGI 미들웨어 하나"""
+    bench_app = FastAPI()
+    bench_app.add_middleware(AuthMiddleware)
+    _add_routes(bench_app)
+    return bench_app
+
+async def _call(bench_app: FastAPI, path: str, headers: list) -> int:
+    """HTTP 서버 없이 ASGI 앱을 한 번 호출하고 응답 코드를 반환합니다."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": headers,
+        "client": ("127.0.0.1", 12345), "server": ("bench", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    status_code = 0
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            assert any(name == b"x-process-time" for name, _ in message["headers"])
+
+    await bench_app(scope, receive, send)
+    return status_code
+
+async def _measure(bench_app: FastAPI, path: str, headers: list, requests: int, concurrency: int) -> float:
+    per_worker = max(requests // concurrency, 1)
+
+    async def worker():
+        for _ in range(per_worker):
+            status_code = await _call(bench_app, path, headers)
+            assert status_code == 200, status_code
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))  # 워밍업
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - start)
+
+async def run(args) -> int:
+    token = create_access_token(data={"sub": "bench@example.com", "id": 1})
+    cases = [
+        ("/ping", []),
+        ("/private", [(b"authorization", f"Bearer {token}".encode())]),
+    ]
+    before, after = build_before(), build_after()
+    ok = True
+    for path, headers in cases:
+        before_rps = await _measure(before, path, headers, args.requests, args.concurrency)
+        after_rps = await _measure(after, path, headers, args.requests, args.concurrency)
+        ok = ok and after_rps >= before_rps
+        print(f"GET {path:<9} 이전 {before_rps:8.0f} req/s  현재 {after_rps:8.0f} req/s  ({after_rps / before_rps:.2f}x)")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인증 미들웨어 방식별 처리량 비교")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    sys.exit(asyncio.run(run(parser.parse_args())))
@@ -0,0 +1,120 @@
+# benchmarks/refresh_concurrency.py
+"""
+토큰 갱신 중 이벤트 루프 지연 확인
+
+만료된 액세스 토큰 + 리프레시 토큰 요청(미들웨어의 갱신 경로)을 여러 작업자가 동시에 보내는 동안
+같은 이벤트 루프에서 다른 요청(GET /)이 계속 처리되는지 확인합니다.
+
+- 루프 지연: 1ms 간격 타이머가 예정보다 늦게 깨어난 최대 시간
+- 다른 요청 지연: 갱신 요청과 함께 순차로 보낸 GET / 의 p50 / p99 / 최대
+갱신 경로가 동기 DB 호출로 루프를 막으면 두 값이 DB 왕복 시간만큼 커집니다.
+루프 지연 최대값이 예산(--budget-ms)을 넘으면 종료 코드 1 을 반환합니다.
+
+.env 의 DATABASE_URL 을 사용하며, 사용자가 한 명 이상 있어야 합니다.
+
+사용법:
+    python benchmarks/refresh_concurrency.py [--refreshes 200] [--concurrency 10] [--cold] [--budget-ms 50]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import select
+
+from app import models
+from app.main import app
+from app.auth.identity import get_identity_async
+from app.auth.utils import create_access_token, create_refresh_token
+from app.database import AsyncSessionLocal, async_engine
+
+# 갱신 경로를 타는 선택적 인증 경로 (응답 코드는 확인하지 않음)
+REFRESH_PATH = "/tetris/stats/percentiles"
+
+async def _first_user():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(models.User.id, models.User.email).limit(1))
+        return result.first()
+
+async def _watch_loop(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """stop 될 때까지 타이머 지연의 최대값(ms)을 기록합니다."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, (time.perf_counter() - start - interval) * 1000)
+    return worst
+
+async def run(args) -> int:
+    user = await _first_user()
+    if user is None:
+        print("사용자가 없습니다. 회원가입 후 다시 실행하세요.")
+        return 1
+
+    data = {"sub": user.email, "id": user.id}
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data, expires_delta=timedelta(seconds=-60))}",
+        "Cookie": f"refresh_token={create_refresh_token(data)}",
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        refreshed = 0
+        latencies = []
+
+        async def refresher(count: int):
+            nonlocal refreshed
+            for _ in range(count):
+                if args.cold:
+                    get_identity_async.cache.invalidate()
+                response = await client.get(REFRESH_PATH, headers=headers)
+                refreshed += "Authorization" in response.headers
+
+        async def pinger(done: asyncio.Event):
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/")
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await client.get("/")  # 첫 요청의 초기화 비용 제외
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(_watch_loop(stop))
+        pinging = asyncio.create_task(pinger(stop))
+        start = time.perf_counter()
+        per_worker = max(args.refreshes // args.concurrency, 1)
+        await asyncio.gather(*(refresher(per_worker) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await pinging
+        worst_lag = await watcher
+        total = per_worker * args.concurrency
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+    print(f"갱신 요청 {total}개 (동시 {args.concurrency}) 중 새 토큰 발급 {refreshed}개 ({'콜드' if args.cold else '캐시 사용'}), {elapsed:.2f}s")
+    if latencies:
+        print(f"GET / 순차 {len(latencies)}개: p50 {statistics.median(latencies):.1f}ms  p99 {p99:.1f}ms  최대 {latencies[-1]:.1f}ms")
+    print(f"이벤트 루프 최대 지연 {worst_lag:.1f}ms (예산 {args.budget_ms}ms)")
+    if refreshed != total:
+        return 1
+    return 0 if worst_lag <= args.budget_ms else 1
+
+async def main(args) -> int:
+    try:
+        return await run(args)
+    finally:
+        await async_engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="토큰 갱신 중 이벤트 루프 지연 확인")
+    parser.add_argument("--refreshes", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--cold", action="store_true", help="매 갱신 요청마다 식별 정보 캐시를 비움 (항상 DB 조회)")
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,44 @@
+# tests/conftest.py
+"""
+테스트 공통 설정
+
+실제 PostgreSQL 없이 임시 SQLite 파일(동기: sqlite, 비동기: aiosqlite)로 앱을 띄웁니다.
+환경 변수는 app 을 import 하기 전에 설정해야 하므로 이 파일 맨 위에서 지정합니다.
+
+사용법:
+    pip install -r requirements-dev.txt
+    python -m pytest -q tests
+"""
+import os
+import tempfile
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="baseball-tests-"), "test.db")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_DB_PATH}",
+    ASYNC_DATABASE_URL=f"sqlite+aiosqlite:///{_DB_PATH}",
+    # 테스트에서는 해싱 cost 를 낮춤 (측정하지 않음)
+    PASSWORD_HASH_ROUNDS="4",
+    RUN_MIGRATIONS_ON_STARTUP="false",
+)
+
+import httpx
+import pytest
+
+import app.main  # noqa: F401  (app 패키지 import 순서)
+from app import migrations
+from app.database import Base, engine, async_engine
+
+Base.metadata.create_all(engine)
+migrations.upgrade(engine)
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def client():
+    """HTTP 서버 없이 앱을 호출하는 클라이언트 (테스트마다 이벤트 루프가 다르므로 끝나면 풀 정리)"""
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+        yield http_client
+    await async_engine.dispose()
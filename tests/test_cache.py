@@ -0,0 +1,61 @@
+# tests/test_cache.py
+"""
+single-flight 캐시 (app/cache.py)
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import crud
+from app.cache import cached
+from app.database import ASYNC_DATABASE_URL, AsyncSessionLocal, async_engine, read_router
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+async def dispose_engine():
+    yield
+    await async_engine.dispose()
+
+async def test_miss_loads_with_own_session():
+    sessions = []
+    release = asyncio.Event()
+
+    @cached("test_own_session", ttl=60)
+    async def load(db, value):
+        sessions.append(db)
+        await release.wait()
+        return (await db.execute(text("SELECT :v"), {"v": value})).scalar()
+
+    async with AsyncSessionLocal() as first_db, AsyncSessionLocal() as second_db:
+        first = asyncio.ensure_future(load(first_db, 7))
+        second = asyncio.ensure_future(load(second_db, 7))
+        await asyncio.sleep(0)
+        # 첫 요청이 먼저 끝나(취소되어) 세션을 닫아도 공유 조회는 계속됨
+        first.cancel()
+        await first_db.close()
+        release.set()
+        assert await second == 7
+
+    assert len(sessions) == 1
+    assert sessions[0] not in (first_db, second_db)
+    assert load.cache.stats["coalesced"] == 1
+
+async def test_cached_read_uses_replica(client, monkeypatch):
+    # 같은 파일을 가리키는 별도 엔진을 복제본으로 사용
+    replica = create_async_engine(ASYNC_DATABASE_URL)
+    monkeypatch.setattr(read_router, "session_makers", [async_sessionmaker(bind=replica, expire_on_commit=False)])
+    replica_queries = []
+    event.listen(replica.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: replica_queries.append(statement))
+    crud.tetris.get_leaderboard_async.cache.invalidate()
+
+    try:
+        response = await client.get("/tetris/leaderboard")
+    finally:
+        await replica.dispose()
+
+    assert response.status_code == 200
+    assert any("tetris_high_scores" in statement for statement in replica_queries)
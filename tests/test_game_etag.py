@@ -0,0 +1,39 @@
+# tests/test_game_etag.py
+"""
+게임 상태 조회의 ETag 처리 (GET /games/{id}, GET /tetris/{id})
+"""
+import pytest
+from sqlalchemy import event
+
+from app.database import async_engine
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def game_queries():
+    """비동기 엔진에서 실행된 게임 테이블 SELECT 목록"""
+    found = []
+
+    def check(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and ("FROM tetris_games" in statement or "FROM games" in statement):
+            found.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", check)
+    yield found
+    event.remove(async_engine.sync_engine, "before_cursor_execute", check)
+
+@pytest.mark.parametrize("create_path, status_path", [("/games", "/games/{}"), ("/tetris", "/tetris/{}")])
+async def test_status_reads_game_row_once(client, game_queries, create_path, status_path):
+    game_id = (await client.post(create_path, json={})).json()["game_id"]
+    path = status_path.format(game_id)
+
+    game_queries.clear()
+    response = await client.get(path)
+    assert response.status_code == 200
+    # If-None-Match 가 없으면 ETag 를 위한 별도 조회 없음
+    assert len(game_queries) == 1
+    etag = response.headers["ETag"]
+
+    assert (await client.get(path, headers={"If-None-Match": etag})).status_code == 304
+    response = await client.get(path, headers={"If-None-Match": '"stale"'})
+    assert (response.status_code, response.headers["ETag"]) == (200, etag)
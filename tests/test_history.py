@@ -0,0 +1,30 @@
+# tests/test_history.py
+"""
+게임 히스토리 페이지네이션 (crud.user)
+
+페이지 쿼리는 LATERAL JOIN 을 사용하므로 SQLite 에서는 사용자/전체 게임 수 쿼리만 확인합니다.
+"""
+import uuid
+
+from app import models
+from app.crud import user as crud_user
+from app.database import SessionLocal
+
+def _user_with_games(db, games: int) -> int:
+    name = uuid.uuid4().hex[:12]
+    user = models.User(username=name, email=f"{name}@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add_all(models.Game(random_number="123", user_id=user.id) for _ in range(games))
+    db.commit()
+    return user.id
+
+def test_total_is_counted_only_when_requested():
+    with SessionLocal() as db:
+        user_id = _user_with_games(db, 3)
+        assert db.execute(crud_user._history_user_query(user_id)).first().total_games == 3
+
+        # 다음 페이지용 쿼리는 게임 수를 세지 않음
+        query = crud_user._history_user_query(user_id, with_total=False)
+        assert "count(" not in str(query).lower()
+        assert db.execute(query).first().total_games is None
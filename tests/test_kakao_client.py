@@ -0,0 +1,119 @@
+# tests/test_kakao_client.py
+"""
+카카오 API 클라이언트의 재시도, 서킷 브레이커, 커넥션 재사용 (app/auth/kakao_client.py)
+
+실제 카카오 API 대신 httpx.MockTransport 와 로컬 HTTP 서버로 응답을 흉내 냅니다.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.auth import kakao_client, oauth
+
+pytestmark = pytest.mark.anyio
+
+TOKEN_URL = "http://kakao.test/oauth/token"
+USER_INFO_URL = "http://kakao.test/v2/user/me"
+USER_INFO = {"id": 1234, "kakao_account": {"email": "standin@example.com"}}
+
+@pytest.fixture(autouse=True)
+def kakao_urls(monkeypatch):
+    monkeypatch.setattr(oauth, "KAKAO_TOKEN_URL", TOKEN_URL)
+    monkeypatch.setattr(oauth, "KAKAO_USER_INFO_URL", USER_INFO_URL)
+    monkeypatch.setattr(oauth, "KAKAO_CLIENT_ID", "standin")
+    monkeypatch.setattr(oauth, "KAKAO_REDIRECT_URI", "http://localhost/callback")
+    monkeypatch.setattr(kakao_client, "KAKAO_HTTP_BACKOFF_SECONDS", 0)
+
+@pytest.fixture
+def standin(monkeypatch):
+    """
+    대역 카카오 서버 상태 (fail_token / fail_user_info: 남은 실패 응답 수, calls: 받은 요청 수)
+    """
+    state = {"fail_token": 0, "fail_user_info": 0, "calls": 0}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        state["calls"] += 1
+        if request.url.path == "/oauth/token":
+            if state["fail_token"]:
+                state["fail_token"] -= 1
+                return httpx.Response(500)
+            return httpx.Response(200, json={"access_token": "standin", "token_type": "bearer"})
+        if state["fail_user_info"]:
+            state["fail_user_info"] -= 1
+            return httpx.Response(503)
+        return httpx.Response(200, json=USER_INFO)
+
+    client = kakao_client.KakaoHTTPClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    monkeypatch.setattr(oauth, "kakao_http", client)
+    state["client"] = client
+    return state
+
+async def test_get_retries_after_5xx(standin):
+    standin["fail_user_info"] = 1
+    assert await oauth.get_kakao_user_info("token") == USER_INFO
+    assert standin["calls"] == 2
+    assert standin["client"].stats["retries"] == 1
+
+async def test_token_post_is_not_retried(standin):
+    standin["fail_token"] = 1
+    with pytest.raises(HTTPException) as error:
+        await oauth.get_kakao_token("code")
+    # 인가 코드는 한 번만 쓸 수 있으므로 다시 보내지 않음
+    assert error.value.status_code == 502
+    assert standin["calls"] == 1
+
+async def test_circuit_opens_after_consecutive_failures(standin):
+    client = standin["client"]
+    standin["fail_user_info"] = 10 ** 6
+    for _ in range(client.breaker.failure_threshold):
+        with pytest.raises(HTTPException) as error:
+            await oauth.get_kakao_user_info("token")
+        assert error.value.status_code == 502
+    assert client.breaker.state == kakao_client.CircuitBreaker.OPEN
+
+    calls = standin["calls"]
+    with pytest.raises(HTTPException) as error:
+        await oauth.get_kakao_user_info("token")
+    # 열린 뒤에는 요청을 보내지 않고 바로 503
+    assert error.value.status_code == 503
+    assert standin["calls"] == calls
+
+async def test_logins_reuse_one_connection(monkeypatch):
+    connections = []
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connections.append(writer)
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower()
+                length = next((int(line.split(":", 1)[1]) for line in head.split("\r\n")
+                               if line.startswith("content-length:")), 0)
+                await reader.readexactly(length)
+                body = json.dumps({"access_token": "standin", **USER_INFO}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    monkeypatch.setattr(oauth, "KAKAO_TOKEN_URL", f"{base_url}/oauth/token")
+    monkeypatch.setattr(oauth, "KAKAO_USER_INFO_URL", f"{base_url}/v2/user/me")
+    client = kakao_client.KakaoHTTPClient()
+    monkeypatch.setattr(oauth, "kakao_http", client)
+
+    async with server:
+        await client.start()
+        try:
+            for i in range(5):
+                token = await oauth.get_kakao_token(f"code-{i}")
+                assert (await oauth.get_kakao_user_info(token["access_token"]))["id"] == 1234
+        finally:
+            await client.close()
+
+    assert len(connections) == 1
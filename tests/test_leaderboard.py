@@ -0,0 +1,89 @@
+# tests/test_leaderboard.py
+"""
+인메모리 테트리스 리더보드 (app/tetris/leaderboard.py)
+"""
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app import crud, models
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+from app.tetris import leaderboard as leaderboard_module
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+async def dispose_engine():
+    yield
+    await async_engine.dispose()
+
+@pytest.fixture
+def board(monkeypatch):
+    board = leaderboard_module.Leaderboard(top_size=3)
+    monkeypatch.setattr(leaderboard_module, "leaderboard", board)
+    return board
+
+def _player(*scores: int) -> int:
+    """점수 기록 여러 개를 가진 사용자를 만들고 id 를 반환합니다."""
+    with SessionLocal() as db:
+        name = uuid.uuid4().hex[:12]
+        user = models.User(username=name, email=f"{name}@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add_all(models.TetrisHighScore(user_id=user.id, score=score) for score in scores)
+        db.commit()
+        return user.id
+
+def _players_with_scores() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count(func.distinct(models.TetrisHighScore.user_id))))
+
+def _top_scores(limit: int):
+    with SessionLocal() as db:
+        return list(db.scalars(select(models.TetrisHighScore.score).order_by(models.TetrisHighScore.score.desc()).limit(limit)))
+
+async def test_load_keeps_user_bests_and_bounded_top(board):
+    user_id = _player(10, 900_000_001, 20)
+    _player(900_000_000)
+
+    await leaderboard_module.load()
+
+    assert board.total_players == _players_with_scores()
+    assert board.user_best(user_id).score == 900_000_001
+    assert [entry.score for entry in board.top(3)] == _top_scores(3)
+    # 보관한 상위 기록보다 많이 요청하면 DB 에서 조회하도록 None
+    assert board.top(4) is None
+
+async def test_refresh_reads_only_new_rows(board):
+    await leaderboard_module.load()
+    watermark = board.watermark
+
+    # 다른 워커가 저장한 기록
+    user_id = _player(950_000_000)
+    await leaderboard_module.refresh()
+
+    assert board.watermark > watermark
+    assert board.user_best(user_id).score == 950_000_000
+    assert board.top(1)[0].user_id == user_id
+    assert board.rank(user_id) == 1
+
+    # 다시 읽어도 중복 반영되지 않음
+    players = board.total_players
+    await leaderboard_module.refresh()
+    assert board.total_players == players
+
+async def test_my_rank_matches_sql_fallback(board, monkeypatch):
+    monkeypatch.setattr(crud.tetris, "leaderboard", board)
+    _player(990_000_000)
+    user_id = _player(10, 985_000_000)
+    _player(980_000_000, 5)
+    await leaderboard_module.load()
+
+    async with AsyncSessionLocal() as db:
+        from_memory = await crud.tetris.get_my_rank_async(db, user_id, around=1)
+        from_db = await crud.tetris._get_my_rank_from_db(db, user_id, around=1)
+
+    assert from_memory.rank == 2
+    assert from_memory == from_db
+    assert [entry.score for entry in from_memory.entries] == [990_000_000, 985_000_000, 980_000_000]
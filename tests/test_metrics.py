@@ -0,0 +1,36 @@
+# tests/test_metrics.py
+"""
+/metrics 접근 제한
+"""
+import uuid
+
+import pytest
+
+import app.main
+from app import models
+from app.auth.utils import create_access_token
+from app.database import SessionLocal
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def headers():
+    with SessionLocal() as db:
+        name = uuid.uuid4().hex[:12]
+        user = models.User(username=name, email=f"{name}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        return {"Authorization": f"Bearer {create_access_token(data={'sub': user.email, 'id': user.id})}"}
+
+async def test_metrics_require_login(client, monkeypatch):
+    monkeypatch.setattr(app.main, "METRICS_ENABLED", True)
+    assert (await client.get("/metrics")).status_code == 401
+
+async def test_metrics_disabled_by_default(client, headers):
+    assert (await client.get("/metrics", headers=headers)).status_code == 404
+
+async def test_metrics_enabled(client, headers, monkeypatch):
+    monkeypatch.setattr(app.main, "METRICS_ENABLED", True)
+    response = await client.get("/metrics", headers=headers)
+    assert response.status_code == 200
+    assert "rate_limit" in response.json()
@@ -0,0 +1,46 @@
+# tests/test_migrations.py
+"""
+마이그레이션 적용 (app/migrations)
+"""
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app import migrations
+from app.migrations.versions import v0001_initial_schema
+
+@pytest.fixture
+def engine():
+    path = os.path.join(tempfile.mkdtemp(prefix="baseball-migrations-"), "migrations.db")
+    test_engine = create_engine(f"sqlite:///{path}")
+    yield test_engine
+    test_engine.dispose()
+
+def _add_user(conn, name: str, social_id: str):
+    conn.execute(
+        text("INSERT INTO users (username, email, social_type, social_id) VALUES (:n, :e, 'kakao', :s)"),
+        {"n": name, "e": f"{name}@example.com", "s": social_id},
+    )
+
+def test_duplicate_social_keys_stop_before_unique_index(engine):
+    with engine.begin() as conn:
+        v0001_initial_schema.upgrade(conn)
+        _add_user(conn, "first", "1234")
+        _add_user(conn, "second", "1234")
+
+    with pytest.raises(RuntimeError, match="kakao:1234"):
+        migrations.upgrade(engine)
+
+    # 인덱스도, 적용 기록도 남지 않아 정리 후 다시 실행됨
+    with engine.connect() as conn:
+        assert 2 not in migrations.applied_versions(conn)
+    assert "uq_users_social_type_social_id" not in {ix["name"] for ix in inspect(engine).get_indexes("users")}
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE username = 'second'"))
+    applied = migrations.upgrade(engine)
+
+    assert 2 in applied
+    assert "uq_users_social_type_social_id" in {ix["name"] for ix in inspect(engine).get_indexes("users")}
@@ -0,0 +1,79 @@
+# tests/test_naive_datetimes.py
+"""
+비동기 엔진으로 저장하는 시각이 모두 timezone 없는 값인지 확인
+
+컬럼은 timezone 없는 DateTime 이라 asyncpg 는 aware datetime 을 인코딩하지 못합니다. (DataError)
+SQLite 드라이버는 aware 값도 받아주므로, 비동기 엔진에서 실행되는 모든 쿼리의 파라미터를 검사해
+asyncpg 에서 실패할 쿼리를 찾습니다.
+"""
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app import crud, models, schemas
+from app.auth.utils import create_access_token
+from app.database import AsyncSessionLocal, SessionLocal, async_engine
+
+pytestmark = pytest.mark.anyio
+
+def _aware_values(parameters):
+    """쿼리 파라미터(단건/다건, dict/시퀀스)에서 aware datetime 을 찾습니다."""
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    for value in parameters:
+        if isinstance(value, (dict, list, tuple)):
+            yield from _aware_values(value)
+        elif isinstance(value, datetime) and value.tzinfo is not None:
+            yield value
+
+@pytest.fixture
+def aware_parameters():
+    """비동기 엔진에서 실행된 쿼리 중 aware datetime 을 넘긴 쿼리 목록"""
+    found = []
+
+    def check(conn, cursor, statement, parameters, context, executemany):
+        # SQLite 의 DateTime 은 커서에 문자열로 넘기므로 타입 변환 전 값(compiled_parameters)을 검사
+        if list(_aware_values(context.compiled_parameters or ())):
+            found.append(statement.split("\n")[0])
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", check)
+    yield found
+    event.remove(async_engine.sync_engine, "before_cursor_execute", check)
+
+def _user_token() -> str:
+    with SessionLocal() as db:
+        name = uuid.uuid4().hex[:12]
+        user = models.User(username=name, email=f"{name}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        assert user.created_at.tzinfo is None
+        return create_access_token(data={"sub": user.email, "id": user.id})
+
+async def test_game_writes_use_naive_datetimes(client, aware_parameters):
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+
+    game = (await client.post("/games", json={}, headers=headers)).json()
+    response = await client.post(f"/games/{game['game_id']}/guesses", json={"guess": "123"}, headers=headers)
+    assert response.status_code == 200
+
+    tetris = (await client.post("/tetris", json={}, headers=headers)).json()
+    for move_type in ("left", "rotate", "hard_drop"):
+        response = await client.post(f"/tetris/{tetris['game_id']}/moves", json={"move_type": move_type}, headers=headers)
+        assert response.status_code == 200
+    response = await client.delete(f"/tetris/{tetris['game_id']}", headers=headers)
+    assert response.status_code == 200
+
+    assert aware_parameters == []
+
+async def test_user_provisioning_uses_naive_datetimes(client, aware_parameters):
+    name = uuid.uuid4().hex[:12]
+    response = await client.post("/auth/signup", json={"email": f"{name}@example.com", "username": name, "password": "password123"})
+    assert response.status_code == 200
+
+    async with AsyncSessionLocal() as db:
+        social = schemas.SocialUserCreate(email=f"kakao_{name}@example.com", username=f"k_{name}", social_id=name)
+        await crud.upsert_social_user_async(db, social)
+
+    assert aware_parameters == []
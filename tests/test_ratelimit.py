@@ -0,0 +1,31 @@
+# tests/test_ratelimit.py
+"""
+요청 제한 키 (app/ratelimit.py)
+"""
+import ipaddress
+
+from starlette.requests import Request
+
+from app import ratelimit
+
+PROXIES = [ipaddress.ip_network("10.0.0.0/8")]
+
+def _request(host: str, forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "headers": headers, "client": (host, 1234), "state": {}})
+
+def test_direct_clients_use_connection_address():
+    # 프록시가 아닌 곳에서 온 X-Forwarded-For 는 무시
+    assert ratelimit.client_ip(_request("203.0.113.5", "1.2.3.4"), PROXIES) == "203.0.113.5"
+    assert ratelimit.client_ip(_request("10.0.0.2", "198.51.100.7"), []) == "10.0.0.2"
+
+def test_trusted_proxy_uses_forwarded_client():
+    assert ratelimit.client_ip(_request("10.0.0.2", "198.51.100.7"), PROXIES) == "198.51.100.7"
+    # 클라이언트가 앞에 붙인 값은 건너뛰고 프록시가 추가한 주소 사용
+    assert ratelimit.client_ip(_request("10.0.0.2", "1.2.3.4, 198.51.100.7, 10.0.0.9"), PROXIES) == "198.51.100.7"
+    assert ratelimit.client_ip(_request("10.0.0.2"), PROXIES) == "10.0.0.2"
+
+def test_anonymous_clients_behind_proxy_get_separate_keys(monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXIES", PROXIES)
+    keys = {ratelimit.client_key(_request("10.0.0.2", ip)) for ip in ("198.51.100.7", "198.51.100.8")}
+    assert keys == {"ip:198.51.100.7", "ip:198.51.100.8"}
@@ -0,0 +1,31 @@
+# tests/test_skiplist.py
+"""
+순위 조회 스킵 리스트 (app/tetris/skiplist.py)
+"""
+import bisect
+import random
+
+import pytest
+
+from app.tetris.skiplist import IndexableSkipList
+
+def test_skiplist_matches_sorted_list():
+    skiplist = IndexableSkipList(seed=1)
+    expected = []
+    rng = random.Random(2)
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if key in expected:
+            skiplist.remove(key)
+            expected.remove(key)
+        else:
+            skiplist.insert(key, str(key))
+            bisect.insort(expected, key)
+
+    assert len(skiplist) == len(expected)
+    for index, key in enumerate(expected):
+        assert skiplist.index(key) == index
+        assert skiplist[index] == str(key)
+    assert list(skiplist.values(10, 20)) == [str(key) for key in expected[10:20]]
+    with pytest.raises(KeyError):
+        skiplist.remove(1000)
@@ -0,0 +1,98 @@
+# tests/test_social_users.py
+"""
+소셜 로그인 사용자 생성/연결 (crud.user.upsert_social_user_async)
+"""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app import crud, models, schemas
+from app.database import AsyncSessionLocal, async_engine
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def db():
+    async with AsyncSessionLocal() as session:
+        yield session
+    await async_engine.dispose()
+
+def _social(email=None, username=None, social_id=None) -> schemas.SocialUserCreate:
+    suffix = uuid.uuid4().hex[:10]
+    return schemas.SocialUserCreate(
+        email=email or f"kakao_{suffix}@example.com",
+        username=username or f"nick_{suffix}",
+        social_id=social_id or suffix,
+        social_type="kakao",
+    )
+
+async def _local_user(db, **values) -> models.User:
+    suffix = uuid.uuid4().hex[:10]
+    user = models.User(
+        username=values.pop("username", f"local_{suffix}"),
+        email=values.pop("email", f"local_{suffix}@example.com"),
+        hashed_password="hashed",
+        **values,
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+async def test_creates_user_without_password(db):
+    social = _social()
+    user = await crud.upsert_social_user_async(db, social)
+    assert (user.social_id, user.hashed_password) == (social.social_id, None)
+    assert user.created_at.tzinfo is None
+
+async def test_returning_user_is_found_by_social_key(db):
+    social = _social()
+    first = await crud.upsert_social_user_async(db, social)
+    # 카카오 쪽 이메일/닉네임이 바뀌어도 같은 사용자
+    again = await crud.upsert_social_user_async(db, _social(social_id=social.social_id))
+    assert again.id == first.id
+
+async def test_concurrent_first_login_returns_winner(db, monkeypatch):
+    social = _social()
+    winner = await crud.upsert_social_user_async(db, social)
+    # 첫 조회 시점에는 아직 없었던 것처럼 (다른 요청이 그 사이에 생성)
+    lookups = []
+    original = crud.user.get_user_by_social_id_async
+
+    async def racing_lookup(*args):
+        lookups.append(args)
+        return None if len(lookups) == 1 else await original(*args)
+
+    monkeypatch.setattr(crud.user, "get_user_by_social_id_async", racing_lookup)
+    user = await crud.upsert_social_user_async(db, _social(social_id=social.social_id))
+    assert user.id == winner.id
+
+async def test_unverified_email_is_not_linked_to_existing_account(db):
+    local = await _local_user(db)
+    with pytest.raises(HTTPException) as error:
+        await crud.upsert_social_user_async(db, _social(email=local.email), email_verified=False)
+    assert error.value.status_code == 409
+    await db.refresh(local)
+    assert local.social_id is None
+
+async def test_verified_email_links_existing_account(db):
+    local = await _local_user(db)
+    social = _social(email=local.email)
+    user = await crud.upsert_social_user_async(db, social, email_verified=True)
+    assert (user.id, user.social_id, user.hashed_password) == (local.id, social.social_id, "hashed")
+
+async def test_existing_social_identity_is_not_rebound(db):
+    original_id = uuid.uuid4().hex[:10]
+    local = await _local_user(db, social_id=original_id, social_type="kakao")
+    with pytest.raises(HTTPException) as error:
+        await crud.upsert_social_user_async(db, _social(email=local.email), email_verified=True)
+    assert error.value.status_code == 409
+    await db.refresh(local)
+    assert local.social_id == original_id
+
+async def test_username_collision_uses_social_id_suffix(db):
+    local = await _local_user(db)
+    username = local.username
+    social = _social(username=username)
+    user = await crud.upsert_social_user_async(db, social)
+    assert user.username == f"{username}_{social.social_id}"
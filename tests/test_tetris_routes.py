@@ -0,0 +1,12 @@
+# tests/test_tetris_routes.py
+"""
+테트리스 라우트의 인증 정책
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+async def test_anonymous_user_high_scores_are_empty(client):
+    response = await client.get("/tetris/user/highscores")
+    assert response.status_code == 200
+    assert response.json()["scores"] == []
@@ -0,0 +1,67 @@
+# tests/test_tetris_stats.py
+"""
+테트리스 점수 분포 재동기화 (app/tetris/stats.py)
+"""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+from app.database import SessionLocal, async_engine, utcnow
+from app.tetris import stats
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+async def dispose_engine():
+    yield
+    await async_engine.dispose()
+
+def _finished_game(score: int, ended_ago: timedelta = timedelta()) -> int:
+    with SessionLocal() as db:
+        game = models.TetrisGame(status="game_over", score=score, lines_cleared=1, ended_at=utcnow() - ended_ago)
+        db.add(game)
+        db.commit()
+        return game.id
+
+def _finished_count() -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).where(models.TetrisGame.status == "game_over"))
+
+async def test_reload_does_not_double_count_games_in_snapshot(monkeypatch):
+    game_stats = stats.GameStats()
+    monkeypatch.setattr(stats, "game_stats", game_stats)
+    begin_reload = game_stats.begin_reload
+
+    def finish_games_during_reload():
+        begin_reload()
+        # 조회 전에 커밋된 게임 (조회 결과에도 포함됨)
+        game_stats.record(_finished_game(300), 300, 1)
+        # 조회 이후에 커밋될 게임 (조회 결과에 없으므로 다시 반영되어야 함)
+        game_stats.record(-1, 500, 2)
+
+    monkeypatch.setattr(game_stats, "begin_reload", finish_games_during_reload)
+    await stats.load()
+
+    assert game_stats.score.count == _finished_count() + 1
+    assert game_stats.lines.count == game_stats.score.count
+
+async def test_reload_keeps_only_recent_ids(monkeypatch):
+    game_stats = stats.GameStats()
+    monkeypatch.setattr(stats, "game_stats", game_stats)
+    old_game, recent_game = _finished_game(100, ended_ago=timedelta(hours=1)), _finished_game(200)
+    replaced = {}
+    replace = game_stats.replace
+
+    def capture(score, lines, recent_ids):
+        replaced["ids"] = set(recent_ids)
+        replace(score, lines, recent_ids)
+
+    monkeypatch.setattr(game_stats, "replace", capture)
+    await stats.load()
+
+    # 재동기화 직전 이후에 종료된 게임만 중복 확인용으로 보관
+    assert recent_game in replaced["ids"]
+    assert old_game not in replaced["ids"]
+    assert game_stats.score.count == _finished_count()
@@ -0,0 +1,110 @@
+# tests/test_token_refresh.py
+"""
+만료된 액세스 토큰의 자동 갱신 (미들웨어) 과 리프레시 토큰 교체 (/auth/refresh)
+
+benchmarks/refresh_concurrency.py 는 실제 DB 에서 루프 지연을 측정하고,
+여기서는 같은 경로의 동작만 테스트 DB 로 확인합니다.
+"""
+import asyncio
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import models
+from app.middleware import auth as auth_middleware
+from app.auth.identity import UserIdentity, get_identity_async
+from app.auth.utils import create_access_token, create_refresh_token, verify_token
+from app.database import SessionLocal, async_engine
+
+pytestmark = pytest.mark.anyio
+
+# 선택적 인증 경로 / 필수 인증 경로 (둘 다 미들웨어의 갱신 경로를 거침)
+OPTIONAL_PATH = "/tetris/user/highscores"
+REQUIRED_PATH = "/auth/history/0"
+
+@pytest.fixture
+def user_claims():
+    with SessionLocal() as db:
+        name = uuid.uuid4().hex[:12]
+        user = models.User(username=name, email=f"{name}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        return {"sub": user.email, "id": user.id}
+
+def _expired_with_refresh(claims, refresh_token: str) -> dict:
+    return {
+        "Authorization": f"Bearer {create_access_token(claims, expires_delta=timedelta(seconds=-60))}",
+        "Cookie": f"refresh_token={refresh_token}",
+    }
+
+@pytest.fixture
+def identity_queries():
+    """비동기 엔진에서 실행된 사용자 식별 정보 조회 (app/auth/identity.py) 목록"""
+    found = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT users.id, users.username, users.email, users.is_active, users.created_at"):
+            found.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    yield found
+    event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+async def test_concurrent_refreshes_share_one_user_lookup(client, user_claims, identity_queries):
+    get_identity_async.cache.invalidate()
+    headers = _expired_with_refresh(user_claims, create_refresh_token(user_claims))
+
+    responses = await asyncio.gather(*(client.get(OPTIONAL_PATH, headers=headers) for _ in range(20)))
+
+    assert [response.status_code for response in responses] == [200] * 20
+    for response in responses:
+        token = response.headers["Authorization"].removeprefix("Bearer ")
+        assert verify_token(token)["id"] == user_claims["id"]
+    # 동시에 들어온 갱신은 사용자 조회 한 번을 함께 기다림
+    assert len(identity_queries) == 1
+
+async def test_refresh_does_not_block_other_requests(client, user_claims, monkeypatch):
+    entered, release = asyncio.Event(), asyncio.Event()
+
+    async def held_identity(db, user_id):
+        entered.set()
+        await release.wait()
+        return UserIdentity(user_id, None, user_claims["sub"], True, None)
+
+    monkeypatch.setattr(auth_middleware, "get_identity_async", held_identity)
+    headers = _expired_with_refresh(user_claims, create_refresh_token(user_claims))
+    refresh = asyncio.ensure_future(client.get(OPTIONAL_PATH, headers=headers))
+    try:
+        await asyncio.wait_for(entered.wait(), timeout=5)
+
+        # 갱신이 사용자 조회에서 멈춰 있는 동안에도 다른 요청은 끝남
+        response = await asyncio.wait_for(client.get("/"), timeout=5)
+        assert response.status_code == 200
+        assert not refresh.done()
+    finally:
+        release.set()
+
+    response = await asyncio.wait_for(refresh, timeout=5)
+    assert response.status_code == 200
+    assert verify_token(response.headers["Authorization"].removeprefix("Bearer "))["id"] == user_claims["id"]
+
+async def test_rotated_refresh_token_is_rejected(client, user_claims):
+    old_refresh = create_refresh_token(user_claims)
+
+    response = await client.post("/auth/refresh", headers={"Cookie": f"refresh_token={old_refresh}"})
+    assert response.status_code == 200
+    new_refresh = response.cookies["refresh_token"]
+
+    # 교체된 토큰은 /auth/refresh 와 미들웨어 자동 갱신 모두에서 거부
+    response = await client.post("/auth/refresh", headers={"Cookie": f"refresh_token={old_refresh}"})
+    assert response.status_code == 401
+    response = await client.get(REQUIRED_PATH, headers=_expired_with_refresh(user_claims, old_refresh))
+    assert response.status_code == 401
+    assert "Authorization" not in response.headers
+
+    # 새 토큰으로는 갱신됨
+    response = await client.get(OPTIONAL_PATH, headers=_expired_with_refresh(user_claims, new_refresh))
+    assert response.status_code == 200
+    assert "Authorization" in response.headers